@@ -0,0 +1,8 @@
+"""
+benchmarks
+
+Purpose:
+    Standalone performance benchmarks for the PixiHR pipeline components.
+    Each module is runnable from the project root, e.g.
+    `python -m benchmarks.bench_qualification_vocabulary`.
+"""
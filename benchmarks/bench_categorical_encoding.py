@@ -0,0 +1,94 @@
+"""
+bench_categorical_encoding.py
+
+Purpose:
+    Compares the previous per-column sklearn LabelEncoder loop with the
+    Categorical-code based CategoricalEncoder on a high-cardinality
+    `company_name` column, both for a first fit and for encoding an
+    appended batch against existing dictionaries.
+
+Usage:
+    python -m benchmarks.bench_categorical_encoding [--rows N] [--companies N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from pixi_hr.components.categorical_encoder import CategoricalEncoder
+
+COLUMNS = ['title', 'job_location', 'company_name', 'job_type']
+
+
+def make_frame(rows, companies, seed):
+    """Builds a frame with the four categorical columns; company_name is high-cardinality."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'title': [f"Title {i}" for i in rng.integers(0, 2_000, rows)],
+        'job_location': [f"City {i}" for i in rng.integers(0, 300, rows)],
+        'company_name': [f"Company {i}" for i in rng.integers(0, companies, rows)],
+        # job_type has missing values, which LabelEncoder cannot sort alongside strings
+        'job_type': np.array(['Full-time', 'Part-time', 'Contract', None], dtype=object)[rng.integers(0, 4, rows)],
+    })
+
+
+def label_encoder_loop(df):
+    """The previous implementation; job_type is cast to str since LabelEncoder rejects NaN mixed with str."""
+    for col in COLUMNS:
+        values = df[col].astype(str) if col == 'job_type' else df[col]
+        df[col] = LabelEncoder().fit_transform(values)
+    return df
+
+
+def timed(func, *args):
+    """Returns the wall time of func(*args) in seconds."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run(rows, companies):
+    """
+    Times both encoders on an initial corpus and on an appended 1% batch.
+
+    Returns:
+    - pd.DataFrame: Timings per scenario.
+    """
+    initial = make_frame(rows, companies, seed=0)
+    delta = make_frame(max(rows // 100, 1), companies * 2, seed=1)
+
+    results = [{"scenario": f"LabelEncoder loop, {rows:,} rows",
+                "seconds": timed(label_encoder_loop, initial.copy())}]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "category_mappings.json"
+
+        def categorical_first_fit(df):
+            encoder = CategoricalEncoder.load(path, COLUMNS)
+            encoder.fit_transform(df)
+            encoder.save(path)
+
+        results.append({"scenario": f"CategoricalEncoder fit+save, {rows:,} rows",
+                        "seconds": timed(categorical_first_fit, initial.copy())})
+
+        # The LabelEncoder loop has to refit the whole corpus to absorb new data
+        results.append({"scenario": f"LabelEncoder loop, refit with +{len(delta):,} rows",
+                        "seconds": timed(label_encoder_loop, pd.concat([initial, delta], ignore_index=True))})
+        results.append({"scenario": f"CategoricalEncoder extend, +{len(delta):,} rows",
+                        "seconds": timed(categorical_first_fit, delta.copy())})
+
+    return pd.DataFrame(results).round(4)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of postings.")
+    parser.add_argument("--companies", type=int, default=200_000, help="Distinct company names.")
+    args = parser.parse_args()
+
+    print(run(args.rows, args.companies).to_string(index=False))
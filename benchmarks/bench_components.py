@@ -0,0 +1,210 @@
+"""
+bench_components.py
+
+Purpose:
+    Times each step of the DataValidation, DataTransformation and
+    ModelTrainer components, and ModelEvaluation.eval_metrics, on synthetic
+    corpora (benchmarks.corpus) of several sizes. Reports the time,
+    throughput and peak memory of every step.
+
+    Each size runs in its own subprocess, inside a scratch directory, with
+    the project's config/config.yaml, params.yaml and schema.yaml, so the
+    components run exactly as configured and write their artifacts there.
+    The steps run in pipeline order on the same objects. After the full
+    transformation, 1% new postings are validated and appended to measure
+    DataTransformation.update_incrementally. The transformation runs with the
+    hash split and incremental transformation, which are opt-in in the
+    configuration, so that step is always measured.
+
+    Peak memory is the highest resident memory sampled while a step ran,
+    minus the resident memory before it. It is sampled from /proc every few
+    milliseconds, and reported as None on platforms without /proc.
+
+Usage:
+    python -m benchmarks.bench_components [--rows 10000 100000] [--seed 0] [--skills 5000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+class PeakMemory:
+    """Context manager sampling this process's resident memory in a background thread."""
+
+    INTERVAL = 0.005
+
+    def __init__(self):
+        self.peak_mb = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def rss_mb():
+        """Current resident memory in MB, or None without /proc."""
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+        except (OSError, ValueError):
+            return None
+
+    def _sample(self):
+        while not self._stop.wait(self.INTERVAL):
+            self._peak = max(self._peak, self.rss_mb())
+
+    def __enter__(self):
+        self._start = self._peak = self.rss_mb()
+        if self._start is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._start is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak_mb = max(self._peak, self.rss_mb()) - self._start
+
+
+def measure(rows, seed, skills):
+    """Runs every step on a corpus of `rows` postings in the current directory and prints the results as JSON."""
+    from benchmarks.corpus import write_corpus
+    from pixi_hr.config.configuration import ConfigurationManager
+    from pixi_hr.components.data_validation import DataValidation
+    from pixi_hr.components.data_transformation import DataTransformation
+    from pixi_hr.components.transformed_store import TransformedStore
+    from pixi_hr.components.model_trainer import ModelTrainer
+    from pixi_hr.components.model_evaluation import ModelEvaluation
+
+    manager = ConfigurationManager(PROJECT_ROOT / "config" / "config.yaml", PROJECT_ROOT / "params.yaml",
+                                   PROJECT_ROOT / "schema.yaml")
+    validation_config = manager.get_data_validation_config()
+    transformation_config = replace(manager.get_data_transformation_config(), split_strategy="hash",
+                                    incremental=True)
+    trainer_config = manager.get_model_trainer_config()
+    results = []
+
+    def step(name, func, n_rows):
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            value = func()
+            seconds = time.perf_counter() - start
+        results.append({"rows": rows, "step": name, "seconds": round(seconds, 3),
+                        "rows_per_s": round(n_rows / seconds) if seconds > 0 else None,
+                        "peak_mb": round(memory.peak_mb, 1) if memory.peak_mb is not None else None})
+        return value
+
+    write_corpus(validation_config.unzip_data_dir, rows, seed=seed, n_skills=skills)
+
+    # Data validation
+    validation = step("DataValidation.__init__", lambda: DataValidation(validation_config), rows)
+    text_columns = ['title', 'company_name', 'job_location', 'job_summary', 'job_description']
+    for name, func in [
+            ("validate_columns", validation.validate_columns),
+            ("validate_date_of_job_post", validation.validate_date_of_job_post),
+            ("validate_text_fields", lambda: validation.validate_text_fields(columns=text_columns)),
+            ("validate_job_link", validation.validate_job_link),
+            ("validate_job_type", validation.validate_job_type),
+            ("validate_job_qualifications", validation.validate_job_qualifications),
+            ("add_content_hashes", validation.add_content_hashes),
+            ("handle_duplicates", validation.handle_duplicates),
+            ("handle_near_duplicates", validation.handle_near_duplicates),
+            ("save_validated_data", validation.save_validated_data)]:
+        step(f"DataValidation.{name}", func, len(validation.df))
+
+    # Full data transformation
+    store = TransformedStore.from_config(transformation_config)
+    transformation = step("DataTransformation.__init__", lambda: DataTransformation(transformation_config),
+                          len(validation.df))
+    for name, func in [
+            ("datetime_conversion_and_extraction", transformation.datetime_conversion_and_extraction),
+            ("categorical_encoding", transformation.categorical_encoding),
+            ("handle_missing_values", transformation.handle_missing_values),
+            ("one_hot_encode_qualifications", transformation.one_hot_encode_qualifications),
+            ("split_data", lambda: transformation.split_data(store)),
+            ("build_search_indexes", transformation.build_search_indexes),
+            ("extract_text_features", transformation.extract_text_features)]:
+        step(f"DataTransformation.{name}", func, len(transformation.df))
+
+    # Incremental transformation of 1% new postings
+    new_rows = max(1, rows // 100)
+    new_postings = os.path.join("artifacts", "new_postings.csv")
+    write_corpus(new_postings, new_rows, seed=seed + 1, n_skills=skills)
+    addition = DataValidation(replace(validation_config, unzip_data_dir=new_postings))
+    addition.validate_date_of_job_post()
+    addition.add_content_hashes()
+    addition.df = pd.concat([validation.df, addition.df], ignore_index=True)
+    addition.handle_duplicates()
+    addition.save_validated_data()
+
+    # Release the full transformation (the loop variable still holds one of its methods) before the next one
+    del transformation, func
+    transformation = DataTransformation(transformation_config)
+    changes = step("DataTransformation.update_incrementally", lambda: transformation.update_incrementally(store),
+                   new_rows)
+    step("DataTransformation.build_search_indexes (incremental)",
+         lambda: transformation.build_search_indexes(changes), new_rows)
+    step("DataTransformation.extract_text_features (incremental)", transformation.extract_text_features,
+         len(transformation.df))
+
+    # Training and evaluation
+    trainer = ModelTrainer(trainer_config)
+    step("ModelTrainer.load_data", trainer.load_data, rows)
+    step("ModelTrainer.preprocess_data", trainer.preprocess_data, len(trainer.train_data))
+    model = step("ModelTrainer.train_model", lambda: trainer.train_model(trainer.build_model()),
+                 len(trainer.train_data))
+    step("ModelTrainer.save_model", lambda: trainer.save_model(model), len(trainer.train_data))
+    predictions = model.predict(trainer.test_x)
+    step("ModelEvaluation.eval_metrics", lambda: ModelEvaluation.eval_metrics(trainer.test_y, predictions),
+         len(predictions))
+
+    print(json.dumps(results))
+
+
+def run(sizes, seed, skills):
+    """
+    Benchmarks every step at each corpus size, each size in a fresh subprocess and scratch directory.
+
+    Returns:
+    - pd.DataFrame: Time, throughput and peak memory per size and step.
+    """
+    results = []
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            env = {**os.environ, "PYTHONPATH": os.pathsep.join(
+                [str(PROJECT_ROOT / "src"), str(PROJECT_ROOT), os.environ.get("PYTHONPATH", "")])}
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_components", "--measure", "--rows", str(rows),
+                 "--seed", str(seed), "--skills", str(skills)],
+                cwd=workdir, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise RuntimeError(f"Benchmark at {rows} rows exited with status {completed.returncode}:\n"
+                                   f"{completed.stderr[-5000:]}")
+            results.extend(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000], help="Corpus sizes to benchmark.")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus generator seed.")
+    parser.add_argument("--skills", type=int, default=5000,
+                        help="Distinct skills in the corpus, which sets the number of qual_* columns.")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.rows[0], args.seed, args.skills)
+    else:
+        pd.set_option("display.width", 200)
+        print(run(args.rows, args.seed, args.skills).to_string(index=False))
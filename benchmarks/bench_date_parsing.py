@@ -0,0 +1,82 @@
+"""
+bench_date_parsing.py
+
+Purpose:
+    Times the previous handling of 'date_of_job_post' (parsed in validation,
+    parsed again with format inference in transformation, then six `.dt`
+    accessor passes) against parsing once with an explicit format and
+    extracting all calendar parts in one vectorized pass.
+
+Usage:
+    python -m benchmarks.bench_date_parsing [--rows N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr.components.data_transformation import DataTransformation
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+def make_dates(rows, seed=0):
+    """Builds SimplyHired style 'date_of_job_post' strings."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2023-01-01T00:00:00")
+    offsets = rng.integers(0, 365 * 24 * 3600, rows).astype("timedelta64[s]")
+    return pd.Series(np.datetime_as_string(start + offsets, unit="ms")).add("Z")
+
+
+def previous(dates):
+    """Validation parse, transformation re-parse and six accessor passes."""
+    df = pd.DataFrame({'date_of_job_post': dates})
+    df['date_of_job_post_temp'] = pd.to_datetime(df['date_of_job_post'], errors='raise')
+    df['date_of_job_post'] = pd.to_datetime(df['date_of_job_post'])
+    for part in ['month', 'day', 'year', 'hour', 'minute', 'second']:
+        df[f'{part}_of_job_post'] = getattr(df['date_of_job_post'].dt, part)
+    return df
+
+
+def current(dates):
+    """Single parse with an explicit format and one-pass extraction."""
+    df = pd.DataFrame({'date_of_job_post': pd.to_datetime(dates, format=DATE_FORMAT, utc=True)})
+    for name, part in DataTransformation.extract_calendar_parts(df['date_of_job_post']).items():
+        df[f'{name}_of_job_post'] = part
+    return df
+
+
+def run(rows, repeats=3):
+    """
+    Times both implementations and checks that they extract the same parts.
+
+    Returns:
+    - pd.DataFrame: Best-of-`repeats` timings.
+    """
+    dates = make_dates(rows)
+    results = []
+    outputs = {}
+    for label, func in [("parse twice + six .dt passes", previous),
+                        ("parse once + one-pass extraction", current)]:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            outputs[label] = func(dates)
+            timings.append(time.perf_counter() - start)
+        results.append({"implementation": label, "rows": rows, "best_s": round(min(timings), 4)})
+
+    parts = [f'{part}_of_job_post' for part in ['month', 'day', 'year', 'hour', 'minute', 'second']]
+    first, second = outputs.values()
+    assert (first[parts].to_numpy() == second[parts].to_numpy()).all(), "Calendar parts differ"
+
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of dates to parse.")
+    args = parser.parse_args()
+
+    print(run(args.rows).to_string(index=False))
@@ -0,0 +1,116 @@
+"""
+bench_forest_compaction.py
+
+Purpose:
+    Compares a RandomForestRegressor with its CompactForest variants:
+    float32 and float16 quantization, and float32 keeping only the best half
+    of the trees by out-of-bag error. Reports nodes, array and file size,
+    memory-mapped load time, prediction latency on a held-out set, and the
+    RMSE change against the original forest.
+
+Usage:
+    python -m benchmarks.bench_forest_compaction [--estimators 15 100] [--max-depth 13 0] [--rows 20000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr.components.compact_forest import CompactForest
+from pixi_hr.utils.common import load_bin, save_bin, model_nbytes
+
+VARIANTS = {
+    "float32": dict(threshold_dtype="float32", value_dtype="float32", keep=1.0),
+    "float16": dict(threshold_dtype="float16", value_dtype="float16", keep=1.0),
+    "float32, best half": dict(threshold_dtype="float32", value_dtype="float32", keep=0.5),
+}
+
+
+def make_data(rows, skills=500, seed=0):
+    """Sparse binary skill features and a target driven by a few of them, split in train and test halves."""
+    rng = np.random.default_rng(seed)
+    x = (rng.random((2 * rows, skills)) < 0.03).astype(np.float32)
+    y = rng.normal(0, 50, 2 * rows) + x[:, :50] @ rng.integers(0, 200, 50)
+    return x[:rows], y[:rows], x[rows:], y[rows:]
+
+
+def timed(func, repeat=3):
+    """Best latency of `func` in milliseconds, and its last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+
+def rmse(actual, predicted):
+    return float(np.sqrt(np.mean((actual - predicted) ** 2)))
+
+
+def run(estimators, depths, rows):
+    """
+    Fits a forest per size and depth, and compacts it in each variant.
+
+    Returns:
+    - pd.DataFrame: Size, latency and accuracy per forest and variant.
+    """
+    from sklearn.ensemble import RandomForestRegressor
+
+    train_x, train_y, test_x, test_y = make_data(rows)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_estimators in estimators:
+            for depth in depths:
+                model = RandomForestRegressor(n_estimators=n_estimators, max_depth=depth or None, min_samples_leaf=2,
+                                              max_features="log2", random_state=44).fit(train_x, train_y)
+                errors = CompactForest.oob_tree_errors(model, train_x, train_y)
+
+                path = os.path.join(tmp, "model.joblib")
+                save_bin(model, Path(path))
+                load_ms, model = timed(lambda: load_bin(Path(path), mmap_mode="r"))
+                predict_ms, predictions = timed(lambda: model.predict(test_x))
+                original_rmse = rmse(test_y, predictions)
+                results.append({
+                    "n_estimators": n_estimators, "max_depth": depth or None, "model": "sklearn",
+                    "nodes": sum(estimator.tree_.node_count for estimator in model.estimators_),
+                    "array_mb": round(model_nbytes(model) / 1024 / 1024, 2),
+                    "file_mb": round(os.path.getsize(path) / 1024 / 1024, 2),
+                    "load_ms": round(load_ms, 1), "predict_ms": round(predict_ms, 1),
+                    "rmse": round(original_rmse, 3), "rmse_delta": 0.0,
+                })
+
+                for name, variant in VARIANTS.items():
+                    keep = max(1, round(n_estimators * variant["keep"]))
+                    trees = np.sort(np.argsort(errors, kind="stable")[:keep]).tolist()
+                    compact = CompactForest.from_forest(model, trees=trees, threshold_dtype=variant["threshold_dtype"],
+                                                        value_dtype=variant["value_dtype"])
+                    path = os.path.join(tmp, "compact.joblib")
+                    save_bin(compact, Path(path))
+                    load_ms, compact = timed(lambda: load_bin(Path(path), mmap_mode="r"))
+                    predict_ms, predictions = timed(lambda: compact.predict(test_x))
+                    results.append({
+                        "n_estimators": n_estimators, "max_depth": depth or None, "model": name,
+                        "nodes": compact.n_nodes,
+                        "array_mb": round(compact.nbytes / 1024 / 1024, 2),
+                        "file_mb": round(os.path.getsize(path) / 1024 / 1024, 2),
+                        "load_ms": round(load_ms, 1), "predict_ms": round(predict_ms, 1),
+                        "rmse": round(rmse(test_y, predictions), 3),
+                        "rmse_delta": round(rmse(test_y, predictions) - original_rmse, 4),
+                    })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estimators", type=int, nargs="+", default=[15, 100], help="Forest sizes to compare.")
+    parser.add_argument("--max-depth", type=int, nargs="+", default=[13, 0], help="Tree depths (0 for unlimited).")
+    parser.add_argument("--rows", type=int, default=20_000, help="Training rows (and as many test rows).")
+    args = parser.parse_args()
+
+    print(run(args.estimators, args.max_depth, args.rows).to_string(index=False))
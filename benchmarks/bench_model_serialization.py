@@ -0,0 +1,116 @@
+"""
+bench_model_serialization.py
+
+Purpose:
+    Measures the size on disk, save time, load time and load memory of a
+    RandomForestRegressor at several n_estimators, in the layouts
+    ModelTrainer.save_model chooses between: a zlib-compressed joblib file,
+    and an uncompressed one loaded either onto the heap or memory-mapped.
+    Each load runs in a fresh subprocess with scikit-learn already imported,
+    so the reported memory is what loading the model itself adds: resident
+    memory, and the anonymous (heap) part of it, which unlike memory-mapped
+    file pages cannot be shared between processes or dropped by the kernel.
+    Memory is read from /proc and reported as None on other platforms.
+
+Usage:
+    python -m benchmarks.bench_model_serialization [--estimators 15 50 200] [--rows 20000]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+LAYOUTS = {
+    "compressed": dict(compress=3, mmap_mode=None),
+    "uncompressed": dict(compress=0, mmap_mode=None),
+    "uncompressed+mmap": dict(compress=0, mmap_mode="r"),
+}
+
+
+def make_model(n_estimators, rows, skills=500, seed=0):
+    """Fits a forest on a sparse binary skill matrix like the qual_* columns."""
+    from sklearn.ensemble import RandomForestRegressor
+
+    rng = np.random.default_rng(seed)
+    x = (rng.random((rows, skills)) < 0.03).astype(np.float32)
+    y = rng.integers(0, 1000, rows) + x[:, :50] @ rng.integers(0, 200, 50)
+    return RandomForestRegressor(n_estimators=n_estimators, min_samples_leaf=2, max_features="log2",
+                                 random_state=44).fit(x, y)
+
+
+def measure(path, mmap_mode):
+    """Loads the model once and prints the measurements as JSON."""
+    from pixi_hr.utils.common import load_bin, memory_mb
+
+    # Import the model classes before the baseline, so only the load itself is measured
+    importlib.import_module("sklearn.ensemble")
+    rss, anon = memory_mb("VmRSS", "RssAnon")
+    start = time.perf_counter()
+    model = load_bin(Path(path), mmap_mode=mmap_mode)
+    seconds = time.perf_counter() - start
+    loaded_rss, loaded_anon = memory_mb("VmRSS", "RssAnon")
+    print(json.dumps({
+        "load_ms": round(seconds * 1000, 1),
+        "rss_mb": round(loaded_rss - rss, 1) if rss is not None else None,
+        "heap_mb": round(loaded_anon - anon, 1) if anon is not None else None,
+        "trees": len(model.estimators_),
+    }))
+
+
+def run(estimators, rows):
+    """
+    Saves the model in each layout and loads it back in a subprocess.
+
+    Returns:
+    - pd.DataFrame: Size and timings per n_estimators and layout.
+    """
+    from pixi_hr.utils.common import save_bin, model_nbytes
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_estimators in estimators:
+            model = make_model(n_estimators, rows)
+            tree_mb = model_nbytes(model) / 1024 / 1024
+            for layout, options in LAYOUTS.items():
+                path = os.path.join(tmp, f"model_{n_estimators}_{options['compress']}.joblib")
+                start = time.perf_counter()
+                if not os.path.exists(path):
+                    save_bin(model, Path(path), compress=options["compress"])
+                save_seconds = time.perf_counter() - start
+
+                command = [sys.executable, "-m", "benchmarks.bench_model_serialization", "--measure", path]
+                if options["mmap_mode"]:
+                    command += ["--mmap-mode", options["mmap_mode"]]
+                output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+                results.append({
+                    "n_estimators": n_estimators,
+                    "layout": layout,
+                    "tree_mb": round(tree_mb, 1),
+                    "file_mb": round(os.path.getsize(path) / 1024 / 1024, 1),
+                    "save_s": round(save_seconds, 2) if save_seconds > 1e-3 else None,
+                    **json.loads(output.strip().splitlines()[-1]),
+                })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estimators", type=int, nargs="+", default=[15, 50, 200], help="Forest sizes to compare.")
+    parser.add_argument("--rows", type=int, default=20_000, help="Training rows of each forest.")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    parser.add_argument("--mmap-mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.mmap_mode)
+    else:
+        print(run(args.estimators, args.rows).to_string(index=False))
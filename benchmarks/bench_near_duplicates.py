@@ -0,0 +1,91 @@
+"""
+bench_near_duplicates.py
+
+Purpose:
+    Measures how NearDuplicateDetector scales with the number of postings.
+    A share of the synthetic postings are planted near duplicates (a copy of
+    another posting with a few words changed); the benchmark reports the
+    time spent in MinHash signatures and in LSH candidate generation and
+    verification, the number of candidate pairs, and the recall of the
+    planted duplicates.
+
+Usage:
+    python -m benchmarks.bench_near_duplicates [--rows 10000 100000 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr.components.near_duplicates import NearDuplicateDetector
+
+
+def make_texts(rows, duplicate_share=0.05, words_per_text=80, vocabulary=20_000, seed=0):
+    """
+    Builds random postings with planted near duplicates.
+
+    Returns:
+    - tuple: (list of texts, array of (original, duplicate) index pairs)
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{i}" for i in range(vocabulary)])
+    tokens = words[rng.zipf(1.3, size=(rows, words_per_text)) % vocabulary]
+
+    n_duplicates = int(rows * duplicate_share)
+    duplicates = rng.choice(rows, size=n_duplicates, replace=False)
+    originals = (duplicates + rng.integers(1, rows, n_duplicates)) % rows
+    tokens[duplicates] = tokens[originals]
+    # Change two words of each copy
+    for _ in range(2):
+        tokens[duplicates, rng.integers(0, words_per_text, n_duplicates)] = words[rng.integers(0, vocabulary, n_duplicates)]
+
+    return [" ".join(row) for row in tokens], np.column_stack((originals, duplicates))
+
+
+def run(sizes):
+    """
+    Runs the detector at each size.
+
+    Returns:
+    - pd.DataFrame: Timings and recall per size.
+    """
+    results = []
+    for rows in sizes:
+        texts, planted = make_texts(rows)
+        detector = NearDuplicateDetector()
+
+        start = time.perf_counter()
+        signatures = detector.signatures(texts)
+        signature_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        candidates = detector.candidate_pairs(signatures)
+        lsh_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        labels, _ = NearDuplicateDetector().find_clusters(texts)
+        total_seconds = time.perf_counter() - start
+
+        # A planted duplicate is found if it ends up in its original's cluster
+        found = labels[planted[:, 0]] == labels[planted[:, 1]]
+        results.append({
+            "rows": rows,
+            "signatures_s": round(signature_seconds, 2),
+            "lsh_s": round(lsh_seconds, 2),
+            "end_to_end_s": round(total_seconds, 2),
+            "postings_per_s": round(rows / total_seconds),
+            "candidate_pairs": len(candidates),
+            "planted_recall": round(found.mean(), 4),
+        })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Corpus sizes to benchmark.")
+    args = parser.parse_args()
+
+    print(run(args.rows).to_string(index=False))
@@ -0,0 +1,109 @@
+"""
+bench_posting_index.py
+
+Purpose:
+    Compares the query latency of PostingIndex with a pandas scan over the
+    `qual_*` columns, for AND, OR and NOT skill queries with a location filter.
+    Skill frequencies follow a Zipf distribution, so queries mix frequent and
+    rare skills. Both approaches are checked to return the same postings. The
+    scan runs on columns already in memory, which is its best case; in the
+    pipeline it would first have to read train_data.csv.
+
+Usage:
+    python -m benchmarks.bench_posting_index [--rows 100000 500000] [--skills 500]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr.components.posting_index import PostingIndex
+
+
+def make_postings(rows, skills, skills_per_posting=8, locations=50, seed=0):
+    """Builds a DataFrame shaped like the transformed data, with category strings for location and job type."""
+    rng = np.random.default_rng(seed)
+    matrix = np.zeros((rows, skills), dtype=np.uint8)
+    picks = rng.zipf(1.2, size=(rows, skills_per_posting)) % skills
+    matrix[np.repeat(np.arange(rows), skills_per_posting), picks.ravel()] = 1
+
+    df = pd.DataFrame(matrix, columns=[f"qual_skill{i}" for i in range(skills)])
+    df.insert(0, "job_link", [f"https://example.com/job/{i}" for i in range(rows)])
+    df.insert(1, "job_location", np.array([f"City {i}" for i in range(locations)])[rng.integers(0, locations, rows)])
+    df.insert(2, "job_type", np.array(["Full-time", "Contract", "Part-time"])[rng.integers(0, 3, rows)])
+    return df
+
+
+QUERIES = {
+    "AND frequent": dict(all_skills=["skill1", "skill2"]),
+    "AND rare + location": dict(all_skills=["skill1", "skill40"], job_location="City 3"),
+    "OR + location": dict(any_skills=["skill5", "skill6", "skill7"], job_location="City 3"),
+    "AND NOT": dict(all_skills=["skill1"], no_skills=["skill2", "skill3"]),
+}
+
+
+def scan(df, all_skills=(), any_skills=(), no_skills=(), job_location=None, job_type=None):
+    """The same query as PostingIndex.search, as a pandas scan."""
+    mask = np.ones(len(df), dtype=bool)
+    for skill in all_skills:
+        mask &= df[f"qual_{skill}"].to_numpy() == 1
+    if any_skills:
+        mask &= (df[[f"qual_{skill}" for skill in any_skills]].to_numpy() == 1).any(axis=1)
+    for skill in no_skills:
+        mask &= df[f"qual_{skill}"].to_numpy() == 0
+    if job_location is not None:
+        mask &= (df["job_location"] == job_location).to_numpy()
+    if job_type is not None:
+        mask &= (df["job_type"] == job_type).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def timed(func, repeat=20):
+    """Median latency of `func` in milliseconds, and its last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1000, result
+
+
+def run(sizes, skills):
+    """
+    Runs every query at each size.
+
+    Returns:
+    - pd.DataFrame: Latency of the index and of the scan per query and size.
+    """
+    results = []
+    for rows in sizes:
+        df = make_postings(rows, skills)
+        start = time.perf_counter()
+        index = PostingIndex.build(df)
+        build_seconds = time.perf_counter() - start
+
+        for name, query in QUERIES.items():
+            index_ms, found = timed(lambda: index.search(**query))
+            scan_ms, expected = timed(lambda: scan(df, **query))
+            assert np.array_equal(found, expected), name
+            results.append({
+                "rows": rows,
+                "build_s": round(build_seconds, 2),
+                "query": name,
+                "matches": len(found),
+                "index_ms": round(index_ms, 3),
+                "scan_ms": round(scan_ms, 3),
+                "speedup": round(scan_ms / index_ms, 1),
+            })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 500_000], help="Corpus sizes to benchmark.")
+    parser.add_argument("--skills", type=int, default=500, help="Number of qual_* columns.")
+    args = parser.parse_args()
+
+    print(run(args.rows, args.skills).to_string(index=False))
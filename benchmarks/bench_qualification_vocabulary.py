@@ -0,0 +1,94 @@
+"""
+bench_qualification_vocabulary.py
+
+Purpose:
+    Compares qualification vocabulary settings (full one-hot, min_df pruning,
+    top-k and feature hashing) by vocabulary fit time, number of feature
+    columns, serialized RandomForest size and test RMSE.
+
+Usage:
+    python -m benchmarks.bench_qualification_vocabulary [--data PATH]
+"""
+
+import argparse
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import train_test_split
+
+from pixi_hr.components.data_transformation import DataTransformation
+from pixi_hr.components.qualification_vocabulary import QualificationVocabulary
+from pixi_hr.constants import PARAMS_FILE_PATH
+from pixi_hr.utils.common import read_yaml
+
+# Settings compared by the benchmark: (label, vocabulary parameters)
+SETTINGS = [
+    ("onehot (all skills)", {"mode": "onehot"}),
+    ("onehot min_df=2", {"mode": "onehot", "min_df": 2}),
+    ("onehot min_df=5", {"mode": "onehot", "min_df": 5}),
+    ("onehot top_k=100", {"mode": "onehot", "top_k": 100}),
+    ("onehot top_k=250", {"mode": "onehot", "top_k": 250}),
+    ("hashing n_buckets=64", {"mode": "hashing", "n_buckets": 64}),
+    ("hashing n_buckets=256", {"mode": "hashing", "n_buckets": 256}),
+    ("hashing n_buckets=1024", {"mode": "hashing", "n_buckets": 1024}),
+]
+
+
+def run(data_path):
+    """
+    Runs every vocabulary setting against the same train/test split.
+
+    Args:
+    - data_path (Path): Validated jobs CSV.
+
+    Returns:
+    - pd.DataFrame: One row of measurements per setting.
+    """
+    df = pd.read_csv(data_path)
+    skills = df['job_qualifications'].apply(DataTransformation.clean_skills)
+    target = pd.Series(pd.factorize(df['title'])[0], index=df.index)
+
+    forest_params = dict(read_yaml(PARAMS_FILE_PATH).RandomForest)
+    train_idx, test_idx = train_test_split(df.index, test_size=0.2, random_state=44)
+
+    results = []
+    for label, params in SETTINGS:
+        vocabulary = QualificationVocabulary.from_params(params)
+
+        start = time.perf_counter()
+        vocabulary.fit(skills[train_idx])
+        fit_seconds = time.perf_counter() - start
+
+        train_x = vocabulary.transform(skills[train_idx], index=train_idx)
+        test_x = vocabulary.transform(skills[test_idx], index=test_idx)
+
+        model = RandomForestRegressor(**forest_params)
+        start = time.perf_counter()
+        model.fit(train_x, target[train_idx])
+        train_seconds = time.perf_counter() - start
+
+        rmse = np.sqrt(mean_squared_error(target[test_idx], model.predict(test_x)))
+        results.append({
+            "setting": label,
+            "columns": train_x.shape[1],
+            "vocab_fit_s": round(fit_seconds, 4),
+            "model_fit_s": round(train_seconds, 4),
+            "model_kb": round(len(pickle.dumps(model)) / 1024, 1),
+            "rmse": round(rmse, 4),
+        })
+
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", type=Path, default=Path("artifacts/data_validation/validated_jobs_data.csv"),
+                        help="Validated jobs CSV to benchmark on.")
+    args = parser.parse_args()
+
+    print(run(args.data).to_string(index=False))
@@ -0,0 +1,111 @@
+"""
+bench_similarity_index.py
+
+Purpose:
+    Measures SimilarityIndex against brute-force search over the skill sets:
+    build time, memory-mapped load time, query latency of both, and
+    recall@k of the index. Recall counts an approximate result as correct
+    when its similarity reaches the k-th exact similarity, so ties in the
+    exact ranking do not count as misses.
+
+    Synthetic postings are drawn from role templates (a Zipf sample of
+    skills each), keeping a random subset of the template's skills plus a
+    few unrelated ones, so postings form clusters like real job families.
+
+Usage:
+    python -m benchmarks.bench_similarity_index [--rows 100000 1000000] [--k 10]
+        [--num-perm 64] [--bands 16]
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from pixi_hr.components.similarity_index import SimilarityIndex
+
+
+def make_matrix(rows, skills=1000, templates=300, template_size=12, noise=2, seed=0):
+    """Builds a binary posting x skill matrix of templated postings."""
+    rng = np.random.default_rng(seed)
+    template_skills = rng.zipf(1.3, size=(templates, template_size)) % skills
+    template = rng.integers(0, templates, rows)
+    keep = rng.random((rows, template_size)) < 0.7
+    row_ids = np.repeat(np.arange(rows), template_size)[keep.ravel()]
+    col_ids = template_skills[template].ravel()[keep.ravel()]
+    row_ids = np.concatenate((row_ids, np.repeat(np.arange(rows), noise)))
+    col_ids = np.concatenate((col_ids, rng.integers(0, skills, rows * noise)))
+    matrix = sparse.csr_matrix((np.ones(len(row_ids), dtype=np.uint8), (row_ids, col_ids)), shape=(rows, skills))
+    matrix.data[:] = 1
+    return matrix
+
+
+def run(sizes, k, num_perm, bands, n_queries=200):
+    """
+    Builds the index at each size and queries it with postings from the corpus.
+
+    Returns:
+    - pd.DataFrame: Timings and recall per size.
+    """
+    results = []
+    for rows in sizes:
+        matrix = make_matrix(rows)
+        links = [f"https://example.com/job/{i}" for i in range(rows)]
+        feature_names = [f"qual_skill{i}" for i in range(matrix.shape[1])]
+
+        start = time.perf_counter()
+        index = SimilarityIndex(feature_names, num_perm=num_perm, bands=bands).build(links, matrix)
+        build_seconds = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index.save(tmp)
+            start = time.perf_counter()
+            index = SimilarityIndex.load(tmp)
+            load_seconds = time.perf_counter() - start
+
+            queries = np.random.default_rng(1).choice(rows, n_queries, replace=False)
+            ann_seconds = exact_seconds = 0.0
+            hits = candidates = 0
+            for posting in queries.tolist():
+                skill_ids = matrix.indices[matrix.indptr[posting]:matrix.indptr[posting + 1]]
+                skill_ids = np.sort(skill_ids).astype(np.int32)
+
+                start = time.perf_counter()
+                found = index.query_ids(skill_ids, k=k, exclude=posting)
+                ann_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                exact = index.brute_force(skill_ids, k=k, exclude=posting)
+                exact_seconds += time.perf_counter() - start
+
+                candidates += len(index.candidates(skill_ids))
+                if exact:
+                    kth = exact[-1][1]
+                    hits += sum(score >= kth - 1e-9 for _, score in found) / len(exact)
+
+        results.append({
+            "rows": rows,
+            "num_perm": num_perm,
+            "bands": bands,
+            "build_s": round(build_seconds, 2),
+            "mmap_load_ms": round(load_seconds * 1000, 2),
+            "ann_query_ms": round(ann_seconds / n_queries * 1000, 3),
+            "exact_query_ms": round(exact_seconds / n_queries * 1000, 3),
+            "avg_candidates": round(candidates / n_queries),
+            f"recall@{k}": round(hits / n_queries, 4),
+        })
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="Corpus sizes to benchmark.")
+    parser.add_argument("--k", type=int, default=10, help="Number of neighbours per query.")
+    parser.add_argument("--num-perm", type=int, default=64, help="MinHash signature length.")
+    parser.add_argument("--bands", type=int, default=16, help="Number of LSH bands.")
+    args = parser.parse_args()
+
+    print(run(args.rows, args.k, args.num_perm, args.bands).to_string(index=False))
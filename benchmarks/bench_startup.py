@@ -0,0 +1,104 @@
+"""
+bench_startup.py
+
+Purpose:
+    Startup budget of the pipeline CLI. Imports `main` in fresh interpreters
+    under `python -X importtime`, and reports the median import time and the
+    slowest modules. Fails (exit status 1) when:
+    - the median import time of `main` exceeds the budget,
+    - importing it loads a heavy library (pandas, NumPy, scikit-learn, mlflow...),
+      which should only load when a stage runs,
+    - importing it writes anything to the working directory (e.g. logs/).
+
+    Importing the standard library dominates the budget, so it holds on any
+    reasonable machine; raise it with --budget-ms on very slow ones.
+
+Usage:
+    python -m benchmarks.bench_startup [--budget-ms 150] [--repeats 5] [--module main]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries that must not be imported until a stage runs
+HEAVY_MODULES = ["pandas", "numpy", "scipy", "sklearn", "mlflow", "joblib", "aiohttp", "box", "ensure", "yaml"]
+
+
+def import_times(module, cwd):
+    """
+    Imports `module` in a fresh interpreter under -X importtime.
+
+    Returns:
+    - tuple: Cumulative import time per module in ms (pd.Series), and the heavy modules loaded.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(
+        [str(PROJECT_ROOT / "src"), str(PROJECT_ROOT), os.environ.get("PYTHONPATH", "")])}
+    script = f"import sys, json; import {module}; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=cwd, env=env,
+                               capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            # Nested imports are indented; keep the first (outermost) time of each module
+            times.setdefault(name.strip(), int(cumulative) / 1000)
+    return pd.Series(times), json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run(module, repeats):
+    """
+    Measures the import of `module` `repeats` times.
+
+    Returns:
+    - dict: Median import time, slowest modules, heavy modules loaded and files created.
+    """
+    totals, heavy = [], set()
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(repeats):
+            times, loaded = import_times(module, cwd)
+            totals.append(times[module])
+            heavy.update(loaded)
+        created = sorted(os.listdir(cwd))
+    return {"module": module, "median_ms": round(statistics.median(totals), 1), "min_ms": round(min(totals), 1),
+            "slowest": times.drop(module).sort_values(ascending=False).head(10).round(1),
+            "heavy_modules": sorted(heavy), "created_files": created}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Module whose import is measured.")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Largest median import time allowed.")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters to measure.")
+    args = parser.parse_args(argv)
+
+    result = run(args.module, args.repeats)
+    print(f"import {result['module']}: median {result['median_ms']} ms, best {result['min_ms']} ms "
+          f"(budget {args.budget_ms:g} ms)")
+    print("\nSlowest imports (cumulative ms):")
+    print(result["slowest"].to_string())
+
+    failures = []
+    if result["median_ms"] > args.budget_ms:
+        failures.append(f"median import time {result['median_ms']} ms exceeds the {args.budget_ms:g} ms budget")
+    if result["heavy_modules"]:
+        failures.append(f"heavy modules imported at startup: {', '.join(result['heavy_modules'])}")
+    if result["created_files"]:
+        failures.append(f"import created files in the working directory: {', '.join(result['created_files'])}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+bench_text_features.py
+
+Purpose:
+    Measures the throughput of TextFeatureExtractor on a synthetic CSV of
+    postings for different numbers of worker processes. Each configuration
+    runs in a fresh subprocess so its peak memory is measured on its own.
+
+Usage:
+    python -m benchmarks.bench_text_features [--rows 200000] [--jobs 1 2 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def make_csv(path, rows, words_per_text=120, vocabulary=20_000, seed=0):
+    """Writes a CSV of random job_summary / job_description texts."""
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{i}" for i in range(vocabulary)])
+    for start in range(0, rows, 50_000):
+        n = min(50_000, rows - start)
+        summary = words[rng.zipf(1.3, size=(n, words_per_text // 4)) % vocabulary]
+        description = words[rng.zipf(1.3, size=(n, words_per_text)) % vocabulary]
+        pd.DataFrame({
+            "job_summary": [" ".join(row) for row in summary],
+            "job_description": [" ".join(row) for row in description],
+        }).to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def measure(csv_path, n_jobs, chunk_size):
+    """Vectorizes the CSV once and prints the measurements as JSON."""
+    from pixi_hr.components.text_features import TextFeatureExtractor
+    from pixi_hr.utils.common import peak_rss_mb
+
+    extractor = TextFeatureExtractor(n_jobs=n_jobs, chunk_size=chunk_size)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        matrix = extractor.transform_csv(csv_path, os.path.join(tmp, "features.npz"))
+        seconds = time.perf_counter() - start
+    print(json.dumps({
+        "n_jobs": n_jobs,
+        "chunk_size": chunk_size,
+        "rows": matrix.shape[0],
+        "seconds": round(seconds, 2),
+        "postings_per_s": round(matrix.shape[0] / seconds),
+        "peak_rss_mb": round(peak_rss_mb()),
+    }))
+
+
+def run(rows, jobs, chunk_size):
+    """
+    Runs the extractor for each number of workers.
+
+    Returns:
+    - pd.DataFrame: Throughput and peak memory per configuration.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "postings.csv")
+        make_csv(csv_path, rows)
+        for n_jobs in jobs:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_text_features", "--measure", csv_path,
+                 "--jobs", str(n_jobs), "--chunk-size", str(chunk_size)],
+                check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of synthetic postings.")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4], help="Worker process counts to compare.")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Postings per chunk.")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.jobs[0], args.chunk_size)
+    else:
+        print(run(args.rows, args.jobs, args.chunk_size).to_string(index=False))
@@ -0,0 +1,180 @@
+"""
+corpus.py
+
+Purpose:
+    Seeded generator of synthetic job postings shaped like the scraped
+    SimplyHired data: the `schema.yaml` columns, ISO 8601 post dates,
+    SimplyHired job URLs, and stringified qualification lists whose skills
+    follow a Zipf distribution. Titles and companies are Zipf distributed
+    too, descriptions are built from a shared pool of boilerplate sentences,
+    and a small share of rows are exact duplicates (same link) or reposts
+    (same text under a new link), so the duplicate and near-duplicate
+    handling has something to do.
+
+    Rows are generated in chunks, each with its own seed, so memory stays
+    bounded at any corpus size (10M rows and beyond) and the first N rows
+    are the same whatever the total size.
+
+Usage:
+    python -m benchmarks.corpus --rows 1000000 --output postings.csv [--seed 0] [--chunk-size 100000]
+
+    An output ending in .zip is written as a zip archive holding one CSV, like
+    the ingested data.
+"""
+
+import argparse
+import io
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+SKILLS = ["Python", "SQL", "Machine learning", "C++", "Node.js", "R", "Tableau", "Power BI", "AWS", "Azure",
+          "Spark", "Hadoop", "Excel", "Java", "Scala", "Statistics", "Deep learning", "NLP", "Git", "Docker"]
+ROLES = ["Data Scientist", "Data Analyst", "Data Engineer", "Machine Learning Engineer", "Business Analyst",
+         "Software Engineer", "Research Scientist", "BI Developer", "Analytics Manager", "Database Administrator"]
+SENIORITY = ["", "Junior ", "Senior ", "Lead ", "Principal ", "Staff "]
+CITIES = ["Toronto, ON", "Vancouver, BC", "Montréal, QC", "Calgary, AB", "Ottawa, ON", "Edmonton, AB",
+          "Winnipeg, MB", "Halifax, NS", "Waterloo, ON", "Victoria, BC", "Remote"]
+JOB_TYPES = np.array(["Full-time", "Contract", "Part-time", "Temporary", "Internship", None], dtype=object)
+JOB_TYPE_WEIGHTS = [0.55, 0.15, 0.08, 0.05, 0.02, 0.15]
+
+
+class PostingGenerator:
+    """
+    Generates synthetic postings in seeded chunks.
+
+    Attributes:
+    - seed (int): Base seed; chunk i uses the seed (seed, i).
+    - n_skills (int): Number of distinct skills.
+    - zipf_a (float): Exponent of the Zipf distribution of skills, titles and companies.
+    - duplicate_rate (float): Share of rows repeating an earlier row of their chunk (same link).
+    - repost_rate (float): Share of rows reusing an earlier row's text under a new link.
+    """
+
+    def __init__(self, seed=0, n_skills=5000, n_companies=20_000, n_sentences=5000, zipf_a=1.1,
+                 duplicate_rate=0.01, repost_rate=0.02):
+        self.seed = seed
+        self.n_skills = n_skills
+        self.zipf_a = zipf_a
+        self.duplicate_rate = duplicate_rate
+        self.repost_rate = repost_rate
+
+        rng = np.random.default_rng([seed, 2**32 - 1])
+        skills = SKILLS + [f"Skill {i}" for i in range(n_skills - len(SKILLS))]
+        self.quoted_skills = np.array([repr(skill) for skill in skills[:n_skills]], dtype=object)
+        self.titles = np.array([level + role for role in ROLES for level in SENIORITY], dtype=object)
+        self.companies = np.array([f"Company {i} Inc." for i in range(n_companies)], dtype=object)
+        words = np.array([f"word{i}" for i in range(20_000)], dtype=object)
+        self.sentences = np.array([" ".join(words[self._zipf(rng, 20_000, 12)]) + "." for _ in range(n_sentences)],
+                                  dtype=object)
+
+    def _zipf(self, rng, n, size):
+        """Draws `size` ranks in [0, n) with probability proportional to 1 / (rank + 1) ** zipf_a."""
+        weights = 1.0 / np.arange(1, n + 1) ** self.zipf_a
+        return rng.choice(n, size=size, p=weights / weights.sum())
+
+    def _join(self, rng, pool, counts, separator):
+        """Joins `counts[i]` Zipf-drawn entries of `pool` for each row."""
+        picks = pool[self._zipf(rng, len(pool), int(counts.sum()))]
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        return [separator.join(picks[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def chunk(self, number, rows):
+        """
+        Generates one chunk of postings.
+
+        Args:
+        - number (int): Index of the chunk, which sets its seed.
+        - rows (int): Number of postings.
+
+        Returns:
+        - pd.DataFrame: Postings with the schema.yaml columns.
+        """
+        # One random stream per draw, so the first rows of a chunk do not depend on its length
+        streams = iter([np.random.default_rng(seed) for seed in np.random.SeedSequence([self.seed, number]).spawn(16)])
+
+        start = np.datetime64("2023-01-01T00:00:00")
+        offsets = next(streams).integers(0, 365 * 24 * 3600, rows).astype("timedelta64[s]")
+        dates = np.char.add(np.datetime_as_string(start + offsets, unit="ms").astype(str), "Z")
+
+        qualifications = self._join(next(streams), self.quoted_skills, np.minimum(next(streams).poisson(5, rows), 20),
+                                    ", ")
+        links = next(streams).integers(0, 2**63, rows)
+
+        df = pd.DataFrame({
+            "date_of_job_post": dates,
+            "title": self.titles[self._zipf(next(streams), len(self.titles), rows)],
+            "job_location": np.array(CITIES, dtype=object)[next(streams).integers(0, len(CITIES), rows)],
+            "company_name": self.companies[self._zipf(next(streams), len(self.companies), rows)],
+            "job_link": [f"https://www.simplyhired.ca/job/{link:016x}" for link in links.tolist()],
+            "job_summary": self._join(next(streams), self.sentences, next(streams).integers(1, 3, rows), " "),
+            "job_type": JOB_TYPES[next(streams).choice(len(JOB_TYPES), rows, p=JOB_TYPE_WEIGHTS)],
+            "job_qualifications": ["[" + skills + "]" for skills in qualifications],
+            "job_description": self._join(next(streams), self.sentences, next(streams).integers(4, 9, rows), " "),
+        })
+
+        # Reposts copy an earlier posting's text under their own link; duplicates copy the whole row
+        reposts = np.flatnonzero(next(streams).random(rows)[1:] < self.repost_rate) + 1
+        duplicates = np.flatnonzero(next(streams).random(rows)[1:] < self.duplicate_rate) + 1
+        sources = (next(streams).random(rows) * np.arange(rows)).astype(np.int64)
+        for col in ("job_summary", "job_description", "job_qualifications"):
+            df.loc[reposts, col] = df[col].to_numpy()[sources[reposts]]
+        df.iloc[duplicates] = df.iloc[sources[duplicates]].to_numpy()
+        return df
+
+    def generate(self, rows, chunk_size=100_000):
+        """
+        Generates `rows` postings chunk by chunk.
+
+        Yields:
+        - pd.DataFrame: Up to chunk_size postings.
+        """
+        for number, start in enumerate(range(0, rows, chunk_size)):
+            yield self.chunk(number, min(chunk_size, rows - start))
+
+
+def write_corpus(path, rows, seed=0, chunk_size=100_000, **generator_params):
+    """
+    Writes a synthetic corpus as CSV, or as a zip holding a CSV when `path` ends in .zip.
+
+    Args:
+    - path (str): Output file.
+    - rows (int): Number of postings.
+    - seed (int): Generator seed.
+    - chunk_size (int): Postings generated and written at a time.
+    - generator_params: Further PostingGenerator settings.
+
+    Returns:
+    - str: The output path.
+    """
+    generator = PostingGenerator(seed=seed, **generator_params)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def write(f):
+        for number, chunk in enumerate(generator.generate(rows, chunk_size)):
+            chunk.to_csv(f, header=number == 0, index=False)
+
+    if str(path).endswith(".zip"):
+        name = os.path.splitext(os.path.basename(path))[0] + ".csv"
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+                archive.open(name, "w", force_zip64=True) as raw:
+            with io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+                write(f)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            write(f)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, required=True, help="Number of postings.")
+    parser.add_argument("--output", required=True, help="Output .csv or .zip file.")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed.")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Postings generated at a time.")
+    parser.add_argument("--skills", type=int, default=5000, help="Number of distinct skills.")
+    args = parser.parse_args()
+
+    write_corpus(args.output, args.rows, seed=args.seed, chunk_size=args.chunk_size, n_skills=args.skills)
@@ -0,0 +1,225 @@
+"""
+regression.py
+
+Purpose:
+    Performance regression gate over the component benchmarks
+    (benchmarks.bench_components). `record` runs them several times and
+    stores the samples as a JSON baseline under benchmarks/baselines/, to be
+    committed with the code it measures. `check` reruns them with the
+    baseline's settings (or reads a saved run) and compares each step, and
+    each stage total (e.g. `DataTransformation.*`), per corpus size.
+
+    Timings are noisy, so every step is summarized by its median and its
+    median absolute deviation (MAD) over the repeats. A step regresses when
+    its median grows by more than `--threshold` (relative), by more than
+    `--noise` scaled MADs of either run, and by more than an absolute floor
+    (`--min-seconds`, `--min-mb`) that keeps millisecond steps from flapping.
+    The same rule applies to peak memory. `check` prints a table and exits
+    with status 1 on any regression. Nothing needs network access.
+
+    Baselines record the machine and Python they were measured on: compare
+    only runs from comparable machines, and re-record after an intended
+    slowdown or a hardware change.
+
+Usage:
+    python -m benchmarks.regression record [--rows 10000] [--repeats 5] [--baseline benchmarks/baselines/default.json]
+    python -m benchmarks.regression check [--baseline ...] [--threshold 0.25] [--results run.json] [--save run.json]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks import bench_components
+
+FORMAT_VERSION = 1
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_BASELINE = BASELINE_DIR / "default.json"
+METRICS = {"seconds": "s", "peak_mb": "mb"}
+MAD_SCALE = 1.4826  # Makes the MAD a consistent estimate of the standard deviation for normal noise
+
+
+def collect(sizes, repeats, seed, skills):
+    """
+    Runs the component benchmarks `repeats` times and adds a total per stage.
+
+    Returns:
+    - pd.DataFrame: One row per repeat, size and step, with seconds and peak_mb.
+    """
+    runs = []
+    for repeat in range(repeats):
+        samples = bench_components.run(sizes, seed, skills)
+        samples["repeat"] = repeat
+        runs.append(samples)
+    samples = pd.concat(runs, ignore_index=True)
+
+    samples["stage"] = samples["step"].str.split(".").str[0]
+    stages = (samples.groupby(["rows", "repeat", "stage"], as_index=False, sort=False)
+              .agg(seconds=("seconds", "sum"), peak_mb=("peak_mb", "max")))
+    stages["step"] = stages["stage"] + ".*"
+    stages["seconds"] = stages["seconds"].round(3)
+
+    # Each stage total ahead of its steps, in pipeline order
+    samples = pd.concat([stages, samples], ignore_index=True)
+    samples["stage"] = pd.Categorical(samples["stage"], categories=samples["stage"].unique())
+    samples = samples.sort_values(["rows", "repeat", "stage"], kind="stable")
+    return samples[["rows", "repeat", "step", *METRICS]].reset_index(drop=True)
+
+
+def summarize(samples):
+    """
+    Median and MAD of each metric per size and step.
+
+    Returns:
+    - pd.DataFrame: Indexed by (rows, step), with <metric>_median and <metric>_mad columns.
+    """
+    def mad(values):
+        return (values - values.median()).abs().median()
+
+    summary = samples.groupby(["rows", "step"], sort=False)[list(METRICS)].agg(["median", mad])
+    summary.columns = [f"{metric}_{stat}" for metric, stat in summary.columns]
+    return summary
+
+
+def compare(baseline, current, threshold, noise, floors):
+    """
+    Compares two runs step by step.
+
+    Args:
+    - baseline (pd.DataFrame): Baseline samples.
+    - current (pd.DataFrame): Samples of the run under test.
+    - threshold (float): Relative growth of a median tolerated, e.g. 0.25 for 25%.
+    - noise (float): Scaled MADs a difference must exceed to count.
+    - floors (dict): Absolute difference each metric must exceed to count.
+
+    Returns:
+    - pd.DataFrame: Baseline and current medians, relative change and status per size and step.
+    """
+    base, new = summarize(baseline), summarize(current)
+    table = base.join(new, how="outer", lsuffix="_base", rsuffix="_new")
+    table = table.reindex(base.index.append(new.index.difference(base.index, sort=False)))
+    rows = []
+    for (size, step), row in table.iterrows():
+        result = {"rows": size, "step": step}
+        statuses = []
+        for metric, unit in METRICS.items():
+            old, value = row[f"{metric}_median_base"], row[f"{metric}_median_new"]
+            result[f"base_{unit}"], result[f"new_{unit}"] = old, value
+            result[f"change_{unit}"] = f"{(value - old) / old:+.0%}" if old > 0 else ""
+            if pd.isna(old) or pd.isna(value):
+                continue
+            spread = noise * MAD_SCALE * max(row[f"{metric}_mad_base"], row[f"{metric}_mad_new"])
+            margin = max(threshold * old, spread, floors[metric])
+            if value - old > margin:
+                statuses.append("slower" if metric == "seconds" else "more memory")
+            elif old - value > margin:
+                statuses.append("faster" if metric == "seconds" else "less memory")
+        if pd.isna(row["seconds_median_base"]):
+            result["status"] = "new"
+        elif pd.isna(row["seconds_median_new"]):
+            result["status"] = "missing"
+        else:
+            result["status"] = ", ".join(statuses) or "ok"
+        result["regression"] = any(status in ("slower", "more memory") for status in statuses)
+        rows.append(result)
+    return pd.DataFrame(rows)
+
+
+def machine():
+    """Describes where a run was measured."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=bench_components.PROJECT_ROOT).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+            "cpus": os.cpu_count(), "commit": commit}
+
+
+def save_run(path, samples, settings):
+    """Writes samples and the settings and machine they were measured with as JSON."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"format_version": FORMAT_VERSION,
+                   "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                   "settings": settings, "machine": machine(),
+                   "samples": samples.to_dict(orient="records")}, f, indent=1)
+
+
+def load_run(path):
+    """
+    Reads a run saved by save_run.
+
+    Returns:
+    - tuple: The run's metadata (dict) and its samples (pd.DataFrame).
+    """
+    with open(path) as f:
+        run = json.load(f)
+    if run.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {run.get('format_version')}, expected {FORMAT_VERSION}; "
+                         f"re-record it")
+    return run, pd.DataFrame(run.pop("samples"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["record", "check"])
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file.")
+    parser.add_argument("--rows", type=int, nargs="+",
+                        help="Corpus sizes (record: default 10000; check: the baseline's).")
+    parser.add_argument("--repeats", type=int, help="Runs per size (record: default 5; check: the baseline's).")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus generator seed.")
+    parser.add_argument("--skills", type=int, default=1000, help="Distinct skills in the corpus.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Relative slowdown tolerated.")
+    parser.add_argument("--noise", type=float, default=3.0, help="Scaled MADs a change must exceed.")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Smallest slowdown reported, in seconds.")
+    parser.add_argument("--min-mb", type=float, default=32.0, help="Smallest memory growth reported, in MB.")
+    parser.add_argument("--results", help="check: compare this saved run instead of running the benchmarks.")
+    parser.add_argument("--save", help="check: also save the new run to this file.")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        settings = {"rows": args.rows or [10_000], "repeats": args.repeats or 5, "seed": args.seed,
+                    "skills": args.skills}
+        samples = collect(settings["rows"], settings["repeats"], settings["seed"], settings["skills"])
+        save_run(args.baseline, samples, settings)
+        print(f"Recorded {len(samples)} samples to {args.baseline}")
+        return 0
+
+    baseline, baseline_samples = load_run(args.baseline)
+    if args.results:
+        _, samples = load_run(args.results)
+    else:
+        settings = {**baseline["settings"], **{key: getattr(args, key) for key in ("rows", "repeats")
+                                                if getattr(args, key)}}
+        samples = collect(settings["rows"], settings["repeats"], settings["seed"], settings["skills"])
+        if args.save:
+            save_run(args.save, samples, settings)
+
+    table = compare(baseline_samples, samples, args.threshold, args.noise,
+                    {"seconds": args.min_seconds, "peak_mb": args.min_mb})
+    pd.set_option("display.width", 200)
+    print(f"Baseline {args.baseline} ({baseline['created']}, commit {baseline['machine']['commit']}, "
+          f"{baseline['machine']['platform']})")
+    for size, group in table.groupby("rows", sort=False):
+        print(f"\n{size} rows")
+        print(group.drop(columns=["rows", "regression"]).round(3).to_string(index=False))
+
+    regressions = table[table["regression"]]
+    if len(regressions):
+        print(f"\n{len(regressions)} regression(s): " + ", ".join(
+            f"{step} at {size} rows" for size, step in zip(regressions["rows"], regressions["step"])))
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
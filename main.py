@@ -1,18 +1,90 @@
 """
-Main execution script for the entire ML workflow, starting from data ingestion 
-to data transformation. Each stage in the workflow is represented as a pipeline 
+Main execution script for the entire ML workflow, starting from data ingestion
+to data transformation. Each stage in the workflow is represented as a pipeline
 and is executed sequentially.
+
+Stage modules, and the libraries they use (pandas, scikit-learn, mlflow...),
+are imported only when their stage runs, so `--help` or a single cheap stage
+starts quickly (see benchmarks/bench_startup.py).
+
+With --sample, a stratified sample of the ingested postings (see
+pixi_hr.components.stratified_sampler) runs through the stages instead of the
+full corpus, with every artifact under artifacts/sample/, and the evaluation
+metrics are compared with those of the last full run.
+
+Usage:
+    python main.py [--stage validation --stage transformation ...] [--sample 0.05]
 """
 
+import sys
+import argparse
+import importlib
+import dataclasses
+
 from pixi_hr import logger
-from pixi_hr.pipeline.stage_01_data_ingestion import DataIngestionTrainingPipeline
-from pixi_hr.pipeline.stage_02_data_validation import DataValidationTrainingPipeline
-from pixi_hr.pipeline.stage_03_data_transformation import DataTransformationPipeline
-from pixi_hr.pipeline.stage_04_model_trainer import ModelTrainerPipeline
-from pixi_hr.pipeline.stage_05_model_evaluation import ModelEvaluationPipeline
+
+# Pipeline stages in execution order: CLI name -> "module:class"
+STAGES = {
+    "ingestion": "pixi_hr.pipeline.stage_01_data_ingestion:DataIngestionTrainingPipeline",
+    "validation": "pixi_hr.pipeline.stage_02_data_validation:DataValidationTrainingPipeline",
+    "transformation": "pixi_hr.pipeline.stage_03_data_transformation:DataTransformationPipeline",
+    "training": "pixi_hr.pipeline.stage_04_model_trainer:ModelTrainerPipeline",
+    "evaluation": "pixi_hr.pipeline.stage_05_model_evaluation:ModelEvaluationPipeline",
+    "compaction": "pixi_hr.pipeline.stage_06_forest_compaction:ForestCompactionPipeline",
+    "cross_validation": "pixi_hr.pipeline.stage_07_cross_validation:CrossValidationPipeline",
+    "feature_importance": "pixi_hr.pipeline.stage_08_feature_importance:FeatureImportancePipeline",
+}
+
+# Stages that only run when selected with --stage, as they fit or score the model many times
+OPTIONAL_STAGES = {"cross_validation", "feature_importance"}
+
+# Components whose methods are timed by the instrumentation, once a stage has imported them
+INSTRUMENTED_COMPONENTS = [
+    "pixi_hr.components.data_ingestion:DataIngestion",
+    "pixi_hr.components.data_validation:DataValidation",
+    "pixi_hr.components.data_transformation:DataTransformation",
+    "pixi_hr.components.model_trainer:ModelTrainer",
+    "pixi_hr.components.model_evaluation:ModelEvaluation",
+    "pixi_hr.components.forest_compaction:ForestCompaction",
+    "pixi_hr.components.stratified_sampler:StratifiedSampler",
+    "pixi_hr.components.cross_validation:CrossValidation",
+    "pixi_hr.components.feature_importance:FeatureImportance",
+]
+
+
+def load(path):
+    """Imports and returns the object at "module:name"."""
+    module, name = path.split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the PixiHR training pipeline.")
+    parser.add_argument("--stage", dest="stages", action="append", choices=list(STAGES),
+                        help="Stage to run; repeat to run several (in pipeline order). "
+                             f"Default: every stage except {', '.join(sorted(OPTIONAL_STAGES))}.")
+    parser.add_argument("--sample", type=float, metavar="SIZE",
+                        help="Run on a stratified sample of the ingested postings: a fraction (below 1) or a "
+                             "number of postings. Artifacts go to artifacts/sample/.")
+    return parser.parse_args(argv)
 
 
-def main():
+def run_stage(instrumentation, pipeline):
+    """Runs a pipeline stage; logs the error and terminates the program if it fails."""
+    try:
+        # Start and log the current pipeline stage
+        logger.info(f">>>>>> Stage: {pipeline.STAGE_NAME} started <<<<<<")
+        with instrumentation.stage(pipeline.STAGE_NAME):
+            pipeline.main()  # consistent method name across pipelines for execution
+        logger.info(f">>>>>> Stage {pipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+    except Exception as e:
+        # Log any errors encountered during the pipeline's execution
+        logger.exception(f"Error encountered during the {pipeline.STAGE_NAME}: {e}")
+        logger.error("Program terminated due to an error.")
+        sys.exit(1)
+
+
+def main(stages=None, sample=None):
     """
     Main execution method for the data processing and training pipelines.
 
@@ -20,29 +92,61 @@ def main():
     1. Executes the data ingestion pipeline.
     2. Executes the data validation pipeline.
     3. Executes the data transformation pipeline.
+    4. Executes the model training, evaluation and forest compaction pipelines.
+    5. Cross-validates the model, when selected with --stage cross_validation.
+    6. Ranks the qual_* features by permutation importance, when selected with --stage feature_importance.
 
     Each pipeline has its own logging and error handling. If any pipeline fails,
     the error will be logged, and the entire program will terminate.
+
+    Every stage and component method is instrumented (see
+    pixi_hr.utils.instrumentation); the run summary is written to
+    artifacts/instrumentation/run_summary.json, also when a stage fails.
+
+    In a sample run, the sample is drawn after ingestion, which still reads
+    and writes the artifacts of full runs; the following stages use the
+    artifacts under the sample root.
+
+    Args:
+    - stages (list): Names of the stages to run (keys of STAGES), None for all but OPTIONAL_STAGES.
+    - sample (float): Fraction or number of postings of a sample run, None for a full run.
     """
+    from pixi_hr.config.configuration import ConfigurationManager
+    from pixi_hr.config.snapshot import reroot
+    from pixi_hr.utils.instrumentation import Instrumentation
 
-    # List of pipeline stages to be executed in sequence
-    execution_sequence = [DataIngestionTrainingPipeline(), 
-                          DataValidationTrainingPipeline(), 
-                          DataTransformationPipeline(), 
-                          ModelTrainerPipeline(),
-                          ModelEvaluationPipeline()]
-
-    for pipeline in execution_sequence:
-        try:
-            # Start and log the current pipeline stage
-            logger.info(f">>>>>> Stage: {pipeline.STAGE_NAME} started <<<<<<")
-            pipeline.main()  # consistent method name across pipelines for execution
-            logger.info(f">>>>>> Stage {pipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
-        except Exception as e:
-            # Log any errors encountered during the pipeline's execution
-            logger.exception(f"Error encountered during the {pipeline.STAGE_NAME}: {e}")
-            logger.error("Program terminated due to an error.")
-            exit(1)
+    config_manager = ConfigurationManager()
+    instrumentation_config = config_manager.get_instrumentation_config()
+    sampling = None
+    if sample is not None:
+        from pixi_hr.pipeline.sampling import StratifiedSamplingPipeline
+        sampling = StratifiedSamplingPipeline(size=sample)
+        # The summary of a sample run must not replace the one of the last full run
+        instrumentation_config = dataclasses.replace(instrumentation_config, **{
+            field: reroot(getattr(instrumentation_config, field), config_manager.config.artifacts_root,
+                          sampling.config.root_dir)
+            for field in ("root_dir", "summary_file")})
+    instrumentation = Instrumentation(instrumentation_config)
+
+    # Stages to be executed in sequence
+    execution_sequence = [name for name in STAGES
+                          if (name in stages if stages is not None else name not in OPTIONAL_STAGES)]
+
+    with instrumentation.run():
+        for name in execution_sequence:
+            pipeline_class = load(STAGES[name])
+            for component in INSTRUMENTED_COMPONENTS:
+                if component.split(":")[0] in sys.modules:
+                    instrumentation.instrument(load(component))
+
+            # The sample is drawn once, before the first stage reading the ingested postings
+            if sampling is not None and name != "ingestion" and sampling.sample_rows is None:
+                run_stage(instrumentation, sampling)
+            run_stage(instrumentation, pipeline_class())
+
+    if sampling is not None and sampling.sample_rows is not None:
+        sampling.report()
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(args.stages, args.sample)
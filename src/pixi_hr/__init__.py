@@ -2,33 +2,108 @@
 logger.py
 
 Purpose:
-    Configures and provides a logger for the PixiHR project. 
+    Configures and provides a logger for the PixiHR project.
     The logger logs messages to both the console (stdout) and a specified log file.
+
+    Records are handed to a queue and written by a background listener
+    thread, so logging never blocks the pipeline on file or console I/O. The
+    log file holds one JSON object per line and is rotated by size; it is
+    created with its directory by the first record, so importing the package
+    has no side effect on disk. The console keeps the human-readable format.
+    Forked workers (process pools) append to the same file without rotating
+    it; only the parent's listener rotates.
+    Settings come from environment variables, as logging starts before any
+    configuration is read:
+    - PIXI_HR_LOG_DIR: log directory (default: logs)
+    - PIXI_HR_LOG_LEVEL: minimum level (default: INFO)
+    - PIXI_HR_LOG_MAX_BYTES: size at which the log file is rotated (default: 10 MB, 0 never rotates)
+    - PIXI_HR_LOG_BACKUP_COUNT: rotated files kept (default: 5)
 """
 
 import os
 import sys
+import json
+import atexit
 import logging
+import logging.handlers
+import queue
 
 # Logger format string
 logging_str = "[%(asctime)s: %(lineno)d: %(name)s: %(levelname)s: %(module)s:  %(message)s]"
 
 # Define log directory and log file path
-log_dir = "logs"
+log_dir = os.environ.get("PIXI_HR_LOG_DIR", "logs")
 log_file_path = os.path.join(log_dir, "running_logs.log")
 
-# Check and create log directory if not exists
-os.makedirs(log_dir, exist_ok=True)
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one line of JSON."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry, default=str)
+
+
+class LazyFileHandler(logging.FileHandler):
+    """File handler that creates the log directory and file on the first record, not on import."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class LazyRotatingFileHandler(LazyFileHandler, logging.handlers.RotatingFileHandler):
+    """Rotating file handler that creates the log directory and file on the first record, not on import."""
+
+
+file_handler = LazyRotatingFileHandler(
+    log_file_path,
+    maxBytes=int(os.environ.get("PIXI_HR_LOG_MAX_BYTES", 10 * 1024 * 1024)),
+    backupCount=int(os.environ.get("PIXI_HR_LOG_BACKUP_COUNT", 5)),
+    encoding="utf-8",
+    delay=True)
+file_handler.setFormatter(JsonFormatter())
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setFormatter(logging.Formatter(logging_str))
+
+# The caller only enqueues records; the listener thread formats and writes them
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
 
 # Basic logging configuration
 logging.basicConfig(
-    level=logging.INFO,
-    format=logging_str,
-    handlers=[
-        logging.FileHandler(log_file_path),
-        logging.StreamHandler(sys.stdout)
-    ]
+    level=os.environ.get("PIXI_HR_LOG_LEVEL", "INFO").upper(),
+    handlers=[queue_handler]
 )
 
+
+def _log_without_listener():
+    """
+    Makes a forked worker, which has no listener thread, write its records itself.
+
+    Workers append to the log file without rotating it: only the parent's
+    listener rotates, so concurrent workers cannot each rename the file and
+    lose or split records between the rotated files.
+    """
+    child_file_handler = LazyFileHandler(log_file_path, encoding="utf-8", delay=True)
+    child_file_handler.setFormatter(JsonFormatter())
+    logging.getLogger().handlers = [child_file_handler, console_handler]
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_log_without_listener)
+
 # Create and provide logger instance
 logger = logging.getLogger("pixi_hr_project_logger")
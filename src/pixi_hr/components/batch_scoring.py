@@ -0,0 +1,205 @@
+import json
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr import logger
+from pixi_hr.utils.common import load_bin
+from pixi_hr.entity.config_entity import BatchScoringConfig
+from pixi_hr.components.categorical_encoder import CategoricalEncoder
+from pixi_hr.components.data_transformation import DataTransformation
+from pixi_hr.components.model_trainer import ModelTrainer
+from pixi_hr.components.qualification_vocabulary import QualificationVocabulary
+from pixi_hr.components.text_features import TextFeatureExtractor
+
+# Artifacts loaded once per worker process by _init_worker
+_worker = {}
+
+
+def _init_worker(model_path, vocabulary_file, text_feature_params):
+    """Loads the model and the preprocessing artifacts into a worker process."""
+    # Uncompressed models are memory-mapped, so workers read them from the shared page cache
+    _worker['model'] = load_bin(Path(model_path), mmap_mode='r')
+    _worker['vocabulary'] = QualificationVocabulary.load(vocabulary_file)
+    _worker['text_features'] = (TextFeatureExtractor.from_params({**text_feature_params, 'n_jobs': 1})
+                                if text_feature_params else None)
+
+
+def _score_chunk(chunk):
+    """
+    Preprocesses a chunk of raw postings like the training pipeline and predicts it.
+
+    Runs in a worker process set up by _init_worker.
+
+    Args:
+    - chunk (pd.DataFrame): Raw postings.
+
+    Returns:
+    - np.ndarray: Prediction of each posting.
+    """
+    skills = chunk['job_qualifications'].apply(DataTransformation.clean_skills)
+    features = _worker['vocabulary'].transform(skills, index=chunk.index)
+    if _worker['text_features'] is not None:
+        features = ModelTrainer.stack_features(features, _worker['text_features'].transform(chunk))
+    return _worker['model'].predict(features)
+
+
+class BatchScorer:
+    """
+    Scores large files of raw postings with the trained model.
+
+    The input (CSV, Parquet, or a zip holding a CSV) is streamed in chunks of
+    `chunk_size` postings. Chunks are preprocessed with the saved qualification
+    vocabulary (and text feature settings) and predicted on a process pool;
+    at most `max_pending_chunks` chunks are in flight, so reading never runs
+    far ahead of scoring. Predictions are appended to the output CSV in input
+    order, and a checkpoint records how many chunks and bytes were written, so
+    an interrupted run resumes after the last completed chunk.
+
+    Attributes:
+    - config (BatchScoringConfig): Batch scoring configuration.
+    - encoder (CategoricalEncoder): Category dictionary of the target, used to label predictions.
+    """
+
+    # Progress is logged every LOG_EVERY_CHUNKS chunks
+    LOG_EVERY_CHUNKS = 10
+
+    def __init__(self, config: BatchScoringConfig):
+        """
+        Initializes the BatchScorer.
+
+        Args:
+        - config (BatchScoringConfig): Batch scoring configuration.
+        """
+        self.config = config
+        self.encoder = CategoricalEncoder.load(Path(config.category_mappings_file), columns=[config.target_column])
+
+    def _columns(self):
+        columns = ['job_link', 'job_qualifications']
+        if self.config.text_feature_params:
+            columns += [col for col in self.config.text_feature_params.get('columns', []) if col not in columns]
+        return columns
+
+    def read_chunks(self):
+        """
+        Streams the input file in chunks of raw postings.
+
+        Yields:
+        - pd.DataFrame: Up to chunk_size postings with the columns the model needs.
+        """
+        path, columns, chunk_size = str(self.config.input_file), self._columns(), self.config.chunk_size
+
+        if path.endswith('.parquet'):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Scoring Parquet files requires pyarrow (pip install pyarrow)") from e
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+                yield batch.to_pandas()
+        elif path.endswith('.zip'):
+            with zipfile.ZipFile(path) as archive:
+                members = [name for name in archive.namelist() if name.endswith('.csv')]
+                if not members:
+                    raise ValueError(f"No CSV file found in {path}")
+                with archive.open(members[0]) as f:
+                    yield from pd.read_csv(f, usecols=columns, dtype=str, chunksize=chunk_size)
+        else:
+            yield from pd.read_csv(path, usecols=columns, dtype=str, chunksize=chunk_size)
+
+    def _load_checkpoint(self):
+        """Returns the checkpoint of an interrupted run over the same input, or None."""
+        if not os.path.exists(self.config.checkpoint_file) or not os.path.exists(self.config.output_file):
+            return None
+        with open(self.config.checkpoint_file) as f:
+            checkpoint = json.load(f)
+        if (checkpoint['input_file'], checkpoint['output_file'], checkpoint['chunk_size']) != \
+                (str(self.config.input_file), str(self.config.output_file), self.config.chunk_size):
+            logger.warning("Checkpoint belongs to another input, output or chunk size; starting over.")
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint):
+        """Writes the checkpoint atomically."""
+        tmp_path = f"{self.config.checkpoint_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.config.checkpoint_file)
+
+    def _format(self, chunk, predictions):
+        """Builds the output rows of a scored chunk."""
+        output = pd.DataFrame({'job_link': chunk['job_link'].to_numpy(),
+                               f'predicted_{self.config.target_column}': predictions})
+        # The target is category-coded; decode the nearest code back to its category
+        categories = self.encoder.categories[self.config.target_column]
+        if categories:
+            codes = np.clip(np.rint(predictions), 0, len(categories)).astype(int)
+            output[f'predicted_{self.config.target_column}_label'] = self.encoder.inverse_transform(
+                self.config.target_column, codes).to_numpy()
+        return output
+
+    def main(self, restart=False):
+        """
+        Scores the input file, resuming an interrupted run unless `restart` is set.
+
+        Args:
+        - restart (bool): Ignore any checkpoint and score the whole input again.
+        """
+        os.makedirs(self.config.root_dir, exist_ok=True)
+
+        checkpoint = None if restart else self._load_checkpoint()
+        if checkpoint and checkpoint.get('complete'):
+            logger.info(f"{self.config.output_file} is already complete ({checkpoint['rows_done']} rows).")
+            return
+        if checkpoint:
+            # Drop anything written after the last checkpointed chunk
+            os.truncate(self.config.output_file, checkpoint['output_bytes'])
+            logger.info(f"Resuming after chunk {checkpoint['chunks_done']} ({checkpoint['rows_done']} rows done).")
+        else:
+            checkpoint = {'input_file': str(self.config.input_file), 'output_file': str(self.config.output_file),
+                          'chunk_size': self.config.chunk_size,
+                          'chunks_done': 0, 'rows_done': 0, 'output_bytes': 0}
+            open(self.config.output_file, 'w').close()
+
+        start, rows_scored = time.perf_counter(), 0
+
+        def write(f, chunk, predictions):
+            nonlocal rows_scored
+            self._format(chunk, predictions).to_csv(f, header=checkpoint['output_bytes'] == 0, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+            rows_scored += len(chunk)
+            checkpoint.update(chunks_done=checkpoint['chunks_done'] + 1,
+                              rows_done=checkpoint['rows_done'] + len(chunk), output_bytes=f.tell())
+            self._save_checkpoint(checkpoint)
+            if checkpoint['chunks_done'] % self.LOG_EVERY_CHUNKS == 0:
+                logger.info(f"Scored {checkpoint['rows_done']} rows "
+                            f"({rows_scored / (time.perf_counter() - start):.0f} rows/sec)")
+
+        initargs = (self.config.model_path, self.config.vocabulary_file, self.config.text_feature_params)
+        with open(self.config.output_file, 'a', newline='', encoding='utf-8') as f, \
+                ProcessPoolExecutor(max_workers=self.config.workers, initializer=_init_worker,
+                                    initargs=initargs) as pool:
+            pending = deque()
+            for number, chunk in enumerate(self.read_chunks()):
+                if number < checkpoint['chunks_done']:
+                    continue
+                pending.append((chunk, pool.submit(_score_chunk, chunk)))
+                # Backpressure: wait for the oldest chunk before reading further ahead
+                if len(pending) >= self.config.max_pending_chunks:
+                    chunk, future = pending.popleft()
+                    write(f, chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                write(f, chunk, future.result())
+
+        checkpoint['complete'] = True
+        self._save_checkpoint(checkpoint)
+        seconds = time.perf_counter() - start
+        logger.info(f"Scored {rows_scored} rows into {self.config.output_file} in {seconds:.1f}s "
+                    f"({rows_scored / max(seconds, 1e-9):.0f} rows/sec, {checkpoint['rows_done']} rows in total)")
@@ -0,0 +1,159 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr import logger
+
+
+class CategoricalEncoder:
+    """
+    Encodes categorical columns as integer codes using pandas `Categorical`.
+
+    Category dictionaries are append-only: categories seen in earlier runs keep
+    their code when new data arrives, and new categories are appended at the
+    end. Code 0 is reserved for unknown and missing values. Every change to a
+    dictionary bumps `version`, and the dictionary size at each version is
+    recorded so the codes of any earlier version can be reconstructed.
+
+    Attributes:
+    - columns (list): Names of the columns to encode.
+    - categories (dict): Mapping of column name to its ordered list of categories.
+    - version (int): Version of the category dictionaries.
+    - history (dict): Mapping of version to the number of categories per column.
+    """
+
+    UNKNOWN_CODE = 0
+
+    def __init__(self, columns, categories=None, version=0, history=None):
+        """
+        Initializes the CategoricalEncoder.
+
+        Args:
+        - columns (list): Names of the columns to encode.
+        - categories (dict, optional): Existing category dictionaries to extend.
+        - version (int): Version of the existing category dictionaries.
+        - history (dict, optional): Dictionary sizes of earlier versions.
+        """
+        self.columns = list(columns)
+        self.categories = {col: list((categories or {}).get(col, [])) for col in self.columns}
+        self.version = int(version)
+        self.history = dict(history or {})
+
+    @staticmethod
+    def _as_strings(series):
+        """Cast non-null values to str so the dictionaries are JSON serializable."""
+        if pd.api.types.is_string_dtype(series):
+            return series
+        return series.where(series.isna(), series.astype(str))
+
+    def fit(self, df):
+        """
+        Appends categories not seen before to each column's dictionary.
+
+        Args:
+        - df (pd.DataFrame): Data containing the categorical columns.
+
+        Returns:
+        - CategoricalEncoder: The updated encoder.
+        """
+        changed = False
+        for col in self.columns:
+            known = pd.Index(self.categories[col])
+            new = pd.Index(self._as_strings(df[col]).dropna().unique()).difference(known)
+            if len(new):
+                # Sorted so that the codes do not depend on row order
+                self.categories[col].extend(sorted(new))
+                changed = True
+                logger.info(f"Added {len(new)} new categories to '{col}' ({len(self.categories[col])} total).")
+
+        if changed or not self.history:
+            self.version += 1
+            self.history[str(self.version)] = {col: len(cats) for col, cats in self.categories.items()}
+        return self
+
+    def transform(self, df):
+        """
+        Replaces the categorical columns with their integer codes.
+
+        Unknown and missing values are mapped to `UNKNOWN_CODE`.
+
+        Args:
+        - df (pd.DataFrame): Data containing the categorical columns.
+
+        Returns:
+        - pd.DataFrame: The same DataFrame with encoded columns.
+        """
+        for col in self.columns:
+            codes = pd.Categorical(self._as_strings(df[col]), categories=self.categories[col]).codes
+            # Categorical marks unknown/missing values as -1, shift everything so they land on 0
+            df[col] = codes.astype(np.int32) + 1
+        return df
+
+    def fit_transform(self, df):
+        """
+        Extends the dictionaries with `df` and encodes it.
+
+        Args:
+        - df (pd.DataFrame): Data containing the categorical columns.
+
+        Returns:
+        - pd.DataFrame: The same DataFrame with encoded columns.
+        """
+        return self.fit(df).transform(df)
+
+    def inverse_transform(self, col, codes):
+        """
+        Maps codes of a column back to their categories.
+
+        Args:
+        - col (str): Column name.
+        - codes (array-like): Integer codes produced by `transform`.
+
+        Returns:
+        - pd.Series: Categories, with NaN for `UNKNOWN_CODE`.
+        """
+        categories = pd.Series([np.nan] + self.categories[col], dtype=object)
+        return categories.iloc[np.asarray(codes)].reset_index(drop=True)
+
+    def save(self, path):
+        """
+        Persists the category dictionaries as JSON.
+
+        Args:
+        - path (Path): Destination file.
+        """
+        content = {
+            "version": self.version,
+            "unknown_code": self.UNKNOWN_CODE,
+            "history": self.history,
+            "categories": self.categories
+        }
+        with open(path, "w") as f:
+            json.dump(content, f)
+        logger.info(f"Category dictionaries (version {self.version}) saved at {path}")
+
+    @classmethod
+    def load(cls, path, columns):
+        """
+        Loads the category dictionaries saved with `save`.
+
+        Returns an empty encoder if the file does not exist yet.
+
+        Args:
+        - path (Path): Category dictionary file.
+        - columns (list): Names of the columns to encode.
+
+        Returns:
+        - CategoricalEncoder: The restored encoder.
+        """
+        if not os.path.exists(path):
+            return cls(columns)
+
+        with open(path, "r") as f:
+            content = json.load(f)
+        return cls(columns,
+                   categories=content["categories"],
+                   version=content["version"],
+                   history=content.get("history"))
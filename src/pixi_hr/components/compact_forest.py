@@ -0,0 +1,221 @@
+from numbers import Integral
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class CompactForest:
+    """
+    A fitted random forest regressor stored as a few flat NumPy arrays.
+
+    Splits of every tree share one set of arrays, and leaves another.
+    Identical subtrees, within a tree or across trees, are stored once,
+    splits whose two children are identical are replaced by that child, and
+    identical trees are stored once with a weight. Thresholds and leaf values
+    are quantized to a smaller float type. Thresholds are rounded down, so
+    with float32 every split sends float32 inputs the same way as the
+    original tree.
+
+    Child and root references are split indices, or `~leaf` (a negative
+    number) for leaves, so prediction can tell it reached a leaf without
+    another lookup. Saved uncompressed with save_bin, the arrays are
+    memory-mapped by load_bin(mmap_mode='r').
+
+    Attributes:
+    - features (np.ndarray): Input columns used by any split; `feature` indexes into it.
+    - feature (np.ndarray): Per split, position in `features` of the split column.
+    - threshold (np.ndarray): Per split, threshold (inputs <= threshold go left).
+    - children (np.ndarray): Per split, the left and right child references.
+    - value (np.ndarray): Per leaf, its prediction.
+    - roots (np.ndarray): Root reference of each distinct tree.
+    - weights (np.ndarray): Number of original trees each root stands for.
+    """
+
+    ARRAY_NAMES = ('features', 'feature', 'threshold', 'children', 'value', 'roots', 'weights')
+
+    # Rows predicted at a time; small chunks keep the gathered input columns in cache
+    CHUNK_ROWS = 256
+
+    def __init__(self, features, feature, threshold, children, value, roots, weights):
+        self.features = features
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.weights = weights
+
+    @staticmethod
+    def _round_down(values, dtype):
+        """Casts to `dtype`, rounding each value down to the nearest representable one."""
+        rounded = values.astype(dtype)
+        too_high = rounded.astype(np.float64) > values
+        rounded[too_high] = np.nextafter(rounded[too_high], dtype.type(-np.inf))
+        return rounded
+
+    @staticmethod
+    def oob_masks(model, n_samples):
+        """
+        Rows left out of each tree's bootstrap sample.
+
+        Redraws each tree's bootstrap sample the way RandomForestRegressor.fit does
+        (without sample weights), with the arithmetic of sklearn's private
+        _get_n_samples_bootstrap and _generate_unsampled_indices, whose
+        signatures change between releases: a float max_samples is truncated,
+        not rounded.
+
+        Args:
+        - model (RandomForestRegressor): Forest fitted with bootstrap=True on `n_samples` rows.
+        - n_samples (int): Number of training rows.
+
+        Yields:
+        - np.ndarray: Boolean mask of the out-of-bag rows of each tree, in tree order.
+        """
+        if not model.bootstrap:
+            raise ValueError("Out-of-bag rows require a forest fitted with bootstrap=True")
+
+        max_samples = model.max_samples
+        if max_samples is None:
+            n_bootstrap = n_samples
+        elif isinstance(max_samples, Integral):
+            n_bootstrap = max_samples
+        else:
+            n_bootstrap = max(int(max_samples * n_samples), 1)
+
+        for estimator in model.estimators_:
+            sampled = np.random.RandomState(estimator.random_state).randint(0, n_samples, n_bootstrap)
+            yield np.bincount(sampled, minlength=n_samples) == 0
+
+    @staticmethod
+    def oob_tree_errors(model, x, y):
+        """
+        Mean squared error of each tree on the training rows left out of its bootstrap sample.
+
+        Args:
+        - model (RandomForestRegressor): Forest fitted with bootstrap=True on `x`.
+        - x (scipy.sparse.spmatrix | np.ndarray): Training features.
+        - y (np.ndarray): Training target.
+
+        Returns:
+        - np.ndarray: OOB error of each tree.
+        """
+        if not model.bootstrap:
+            raise ValueError("Ranking trees by out-of-bag error requires a forest fitted with bootstrap=True")
+
+        x = x.to_numpy(dtype=np.float32) if isinstance(x, pd.DataFrame) else x
+        errors = np.empty(len(model.estimators_))
+        for i, (estimator, mask) in enumerate(zip(model.estimators_, CompactForest.oob_masks(model, x.shape[0]))):
+            oob = np.flatnonzero(mask)
+            errors[i] = np.mean((estimator.predict(x[oob]) - y[oob]) ** 2) if len(oob) else np.inf
+        return errors
+
+    @classmethod
+    def from_forest(cls, model, trees=None, threshold_dtype='float32', value_dtype='float32'):
+        """
+        Compacts a fitted RandomForestRegressor.
+
+        Args:
+        - model (RandomForestRegressor): Fitted single-output forest.
+        - trees (list, optional): Indices of the trees to keep; all trees by default.
+        - threshold_dtype (str): Float type of the split thresholds.
+        - value_dtype (str): Float type of the leaf values.
+
+        Returns:
+        - CompactForest: The compacted forest.
+        """
+        threshold_dtype, value_dtype = np.dtype(threshold_dtype), np.dtype(value_dtype)
+        estimators = [model.estimators_[i] for i in (range(len(model.estimators_)) if trees is None else trees)]
+
+        # Hash-consing: each distinct leaf value and (feature, threshold, left, right) split is stored once
+        leaves, splits = {}, {}
+        roots = []
+        for estimator in estimators:
+            tree = estimator.tree_
+            children_left, children_right = tree.children_left.tolist(), tree.children_right.tolist()
+            features = tree.feature.tolist()
+            thresholds = cls._round_down(tree.threshold, threshold_dtype).tolist()
+            values = tree.value[:, 0, 0].astype(value_dtype).tolist()
+
+            # Children are numbered after their parent, so reverse order visits children first
+            refs = [0] * tree.node_count
+            for node in range(tree.node_count - 1, -1, -1):
+                if children_left[node] == -1:
+                    refs[node] = ~leaves.setdefault(values[node], len(leaves))
+                    continue
+                left, right = refs[children_left[node]], refs[children_right[node]]
+                if left == right:
+                    refs[node] = left
+                else:
+                    refs[node] = splits.setdefault((features[node], thresholds[node], left, right), len(splits))
+            roots.append(refs[0])
+
+        split_keys = np.array(list(splits), dtype=np.float64).reshape(-1, 4)
+        split_features = split_keys[:, 0].astype(np.int64)
+        used = np.unique(split_features)
+
+        roots, weights = np.unique(np.array(roots, dtype=np.int32), return_counts=True)
+        return cls(
+            features=used.astype(np.int32),
+            feature=np.searchsorted(used, split_features).astype(np.int32),
+            threshold=split_keys[:, 1].astype(threshold_dtype),
+            children=split_keys[:, 2:].astype(np.int32),
+            value=np.array(list(leaves), dtype=value_dtype),
+            roots=roots,
+            weights=weights.astype(np.int32),
+        )
+
+    @property
+    def n_nodes(self):
+        return len(self.feature) + len(self.value)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.ARRAY_NAMES)
+
+    def _used_columns(self, x):
+        """Dense float32 matrix of the input columns the splits use."""
+        if sparse.issparse(x):
+            return sparse.csr_matrix(x)[:, self.features].toarray().astype(np.float32, copy=False)
+        if isinstance(x, pd.DataFrame):
+            return x.iloc[:, self.features].to_numpy(dtype=np.float32)
+        return np.asarray(x, dtype=np.float32)[:, self.features]
+
+    def _leaves(self, columns):
+        """Leaf reached by each (tree, row) pair, as a (trees, rows) array."""
+        n_rows = len(columns)
+        refs = np.repeat(self.roots, n_rows)
+        leaves = ~refs
+
+        # Walk the pairs that have not reached a leaf yet, one level per step
+        pairs = np.flatnonzero(refs >= 0)
+        node = refs[pairs]
+        offsets = pairs % n_rows * columns.shape[1]
+        values = columns.ravel()
+        children = self.children.ravel()
+        while len(pairs):
+            go_right = values[offsets + self.feature[node]] > self.threshold[node]
+            node = children[2 * node + go_right]
+            done = node < 0
+            if done.any():
+                leaves[pairs[done]] = ~node[done]
+                pending = np.flatnonzero(~done)
+                pairs, node, offsets = pairs[pending], node[pending], offsets[pending]
+        return leaves.reshape(len(self.roots), n_rows)
+
+    def predict(self, x):
+        """
+        Predicts like the original forest: the weighted mean of the leaf values reached in every tree.
+
+        Args:
+        - x (pd.DataFrame | np.ndarray | scipy.sparse.spmatrix): Features in the training column order.
+
+        Returns:
+        - np.ndarray: Predictions.
+        """
+        weights = self.weights / self.weights.sum()
+        predictions = np.empty(x.shape[0])
+        for start in range(0, x.shape[0], self.CHUNK_ROWS):
+            leaves = self._leaves(self._used_columns(x[start:start + self.CHUNK_ROWS]))
+            predictions[start:start + leaves.shape[1]] = weights @ self.value[leaves].astype(np.float64)
+        return predictions
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.model_selection import KFold
+
+from pixi_hr import logger
+from pixi_hr.entity.config_entity import CrossValidationConfig
+from pixi_hr.components.model_trainer import ModelTrainer
+from pixi_hr.components.model_evaluation import ModelEvaluation
+from pixi_hr.utils.common import save_json, save_matrix, load_matrix
+
+# Metrics reported per fold and summarized over the folds
+METRICS = ('rmse', 'mae', 'r2', 'fit_s')
+
+# Layout of the saved features; features saved with another layout are rebuilt
+FEATURES_VERSION = 2
+
+# Features and target loaded once per worker process by _init_worker
+_worker = {}
+
+
+def _init_worker(features_dir, model_trainer_config):
+    """Memory-maps the features and target saved by CrossValidation.prepare_features into a worker process."""
+    _worker['x'], _worker['y'] = load_matrix(features_dir, 'x'), load_matrix(features_dir, 'y')
+    _worker['trainer'] = ModelTrainer(config=model_trainer_config)
+
+
+def _fit_fold(fold, train_index, test_index):
+    """
+    Fits the configured model on the training rows of a fold and scores it on the held-out rows.
+
+    Runs in a worker process set up by _init_worker.
+
+    Args:
+    - fold (int): Fold number.
+    - train_index, test_index (np.ndarray): Rows used for fitting and for scoring.
+
+    Returns:
+    - dict: Fold number, row counts, metrics and fit time in seconds.
+    """
+    x, y = _worker['x'], _worker['y']
+    model = _worker['trainer'].build_model()
+    start = time.perf_counter()
+    model.fit(x[train_index], y[train_index])
+    fit_s = time.perf_counter() - start
+    rmse, mae, r2 = ModelEvaluation.eval_metrics(y[test_index], model.predict(x[test_index]))
+    return {'fold': fold, 'train_rows': len(train_index), 'test_rows': len(test_index),
+            'rmse': float(rmse), 'mae': float(mae), 'r2': float(r2), 'fit_s': round(fit_s, 4)}
+
+
+class CrossValidation:
+    """
+    K-fold cross-validation of the configured model on the training split.
+
+    The features are built once, exactly as ModelTrainer builds them, and
+    saved as .npy files (a dense float32 matrix, or the arrays of a CSR
+    matrix when text features are enabled) that every fold worker
+    memory-maps, so no worker repeats the preprocessing or receives a pickled
+    copy of the matrix. The saved features, and the fold of every row, are
+    reused by later runs while their inputs are unchanged. Folds are fitted
+    in parallel on a process pool, and the report gives the RMSE, MAE, R²
+    and fit time of every fold with their mean and spread.
+
+    Attributes:
+    - config (CrossValidationConfig): Cross-validation configuration.
+    """
+
+    def __init__(self, config: CrossValidationConfig):
+        """
+        Initializes the CrossValidation component.
+
+        Args:
+        - config (CrossValidationConfig): Cross-validation configuration.
+        """
+        self.config = config
+
+    def _inputs(self):
+        """Size and modification time of the files the features are built from."""
+        trainer = self.config.model_trainer
+        paths = [trainer.train_data_path] + ([trainer.train_text_features_path]
+                                             if trainer.train_text_features_path else [])
+        return {str(path): [os.stat(path).st_size, os.stat(path).st_mtime_ns] for path in paths}
+
+    def prepare_features(self):
+        """
+        Saves the features and target of the training rows for the fold workers, unless already saved.
+
+        Returns:
+        - dict: Metadata of the saved features: format, shape and fingerprint of the rows.
+        """
+        meta_file = Path(self.config.features_dir, 'meta.json')
+        inputs = self._inputs()
+        if meta_file.exists():
+            with open(meta_file) as f:
+                meta = json.load(f)
+            if meta.get('inputs') == inputs and meta.get('version') == FEATURES_VERSION:
+                logger.info(f"Reusing the features saved in {self.config.features_dir}")
+                meta['cached'] = True
+                return meta
+
+        trainer = ModelTrainer(config=self.config.model_trainer)
+        train_data = pd.read_csv(self.config.model_trainer.train_data_path)
+        qualifications = train_data[[col for col in train_data.columns if col.startswith('qual_')]]
+        if self.config.model_trainer.train_text_features_path:
+            x = trainer.stack_text_features(qualifications, self.config.model_trainer.train_text_features_path)
+        else:
+            x = qualifications.to_numpy(dtype=np.float32)
+        for stale in Path(self.config.features_dir).glob('*.npy'):
+            stale.unlink()
+        save_matrix(x, self.config.features_dir, 'x')
+        save_matrix(train_data[self.config.model_trainer.target_column].to_numpy(dtype=np.float64),
+                    self.config.features_dir, 'y')
+
+        # Rows are identified by job_link, so reordered or replaced rows get new folds
+        keys = train_data['job_link'] if 'job_link' in train_data.columns else train_data.index
+        fingerprint = hashlib.sha256('\n'.join(keys.astype(str)).encode()).hexdigest()
+        meta = {'version': FEATURES_VERSION, 'inputs': inputs, 'format': 'csr' if sparse.issparse(x) else 'dense',
+                'n_rows': int(x.shape[0]), 'n_features': int(x.shape[1]), 'rows_fingerprint': fingerprint}
+        save_json(path=meta_file, data=meta)
+        meta['cached'] = False
+        return meta
+
+    def fold_assignment(self, meta):
+        """
+        The fold of every training row, computed once and reused while the rows, n_splits and seed are unchanged.
+
+        Args:
+        - meta (dict): Metadata returned by prepare_features.
+
+        Returns:
+        - tuple: Fold number of each row (np.ndarray), and whether it was read from folds_file.
+        """
+        key = {'rows_fingerprint': meta['rows_fingerprint'], 'n_splits': self.config.n_splits,
+               'seed': self.config.seed}
+        if os.path.exists(self.config.folds_file):
+            with np.load(self.config.folds_file) as cached:
+                if json.loads(str(cached['key'])) == key:
+                    return cached['folds'], True
+
+        folds = np.empty(meta['n_rows'], dtype=np.int32)
+        splitter = KFold(n_splits=self.config.n_splits, shuffle=True, random_state=self.config.seed)
+        for fold, (_, test_index) in enumerate(splitter.split(np.zeros(meta['n_rows']))):
+            folds[test_index] = fold
+        np.savez(self.config.folds_file, folds=folds, key=json.dumps(key, sort_keys=True))
+        logger.info(f"Fold assignment of {meta['n_rows']} rows saved at {self.config.folds_file}")
+        return folds, False
+
+    @staticmethod
+    def summarize(results):
+        """Mean, standard deviation, minimum and maximum of each metric over the folds."""
+        summary = {}
+        for metric in METRICS:
+            values = np.array([result[metric] for result in results])
+            summary[metric] = {'mean': float(values.mean()),
+                               'std': float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+                               'min': float(values.min()), 'max': float(values.max())}
+        return summary
+
+    def main(self):
+        """
+        Cross-validates the model and writes the report.
+
+        Returns:
+        - dict: The report.
+        """
+        start = time.perf_counter()
+        meta = self.prepare_features()
+        preprocess_s = time.perf_counter() - start
+        folds, folds_cached = self.fold_assignment(meta)
+
+        tasks = [(fold, np.flatnonzero(folds != fold), np.flatnonzero(folds == fold))
+                 for fold in range(self.config.n_splits)]
+        n_jobs = min(self.config.n_jobs or os.cpu_count() or 1, self.config.n_splits)
+        initargs = (self.config.features_dir, self.config.model_trainer)
+        if n_jobs == 1:
+            _init_worker(*initargs)
+            try:
+                results = [_fit_fold(*task) for task in tasks]
+            finally:
+                _worker.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=initargs) as pool:
+                results = list(pool.map(_fit_fold, *zip(*tasks)))
+
+        report = {'model_type': self.config.model_trainer.model_type, 'n_splits': self.config.n_splits,
+                  'seed': self.config.seed, 'n_jobs': n_jobs, 'n_rows': meta['n_rows'],
+                  'n_features': meta['n_features'], 'features_cached': meta['cached'],
+                  'folds_cached': folds_cached, 'preprocess_s': round(preprocess_s, 4),
+                  'wall_s': round(time.perf_counter() - start, 4),
+                  'summary': self.summarize(results), 'folds': results}
+        save_json(path=Path(self.config.report_file), data=report)
+        logger.info(f"{self.config.n_splits}-fold cross-validation of {report['model_type']}: " + ", ".join(
+            f"{metric} {stats['mean']:.4g} ± {stats['std']:.2g}" for metric, stats in report['summary'].items()))
+        return report
@@ -0,0 +1,350 @@
+import asyncio
+import csv
+import math
+import os
+import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import quote_plus, urlparse, ParseResult
+
+from bs4 import BeautifulSoup
+
+from pixi_hr import logger
+from pixi_hr.entity.config_entity import DataSourcingConfig
+from pixi_hr.components.http_cache import HttpCache, JobLinkIndex
+
+# Columns of the ingestion artifact, in schema.yaml order
+OUTPUT_COLUMNS = ['date_of_job_post', 'title', 'job_location', 'company_name', 'job_link',
+                  'job_summary', 'job_type', 'job_qualifications', 'job_description']
+
+# A list of popular user-agents to mimic real browser requests.
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/89.0.4389.82 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3",
+    "Mozilla/5.0 (Windows NT 6.1; WOW64; rv:54.0) Gecko/20100101 Firefox/54.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_2) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/79.0.3945.88 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:72.0) Gecko/20100101 Firefox/72.0"
+]
+
+
+def parse_search_page(html, base_url):
+    """
+    Parses a SimplyHired search result page.
+
+    Runs in a worker process, so it only takes and returns plain data.
+
+    Args:
+    - html (str): Page content.
+    - base_url (str): Base URL the relative job links are resolved against.
+
+    Returns:
+    - tuple: (total number of postings for the search or None, list of job dicts)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    total_tag = soup.find('span', {'class': 'posting-total'})
+    total_job_count = int(total_tag.text.replace(',', '')) if total_tag else None
+
+    jobs = []
+    job_list = soup.find('ul', {'class': 'jobs'})
+    for job in (job_list.findAll('div', {'class': 'SerpJob-jobCard'}) if job_list else []):
+        title_tag = job.find('h3', {'class': 'jobposting-title'})
+        link = urlparse(title_tag.find('a').attrs['data-mdref'])
+        # Drop the tracking query string so the same posting always has the same link
+        link = ParseResult(scheme=link.scheme, netloc=link.netloc, path=link.path,
+                           params=link.params, query='', fragment=link.fragment).geturl()
+
+        jobs.append({
+            'date_of_job_post': job.find('time').attrs['datetime'],
+            'title': title_tag.text,
+            'job_location': job.find('span', {'class': 'jobposting-location'}).text,
+            'company_name': job.find('span', {'class': 'jobposting-company'}).text,
+            'job_link': f"{base_url}{link}",
+            'job_summary': job.find('p', {'class': 'jobposting-snippet'}).text
+        })
+
+    return total_job_count, jobs
+
+
+def parse_job_details(html):
+    """
+    Parses a SimplyHired job posting page.
+
+    Args:
+    - html (str): Page content.
+
+    Returns:
+    - dict: job_type, job_qualifications and job_description (None when missing).
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    job_details = soup.find('div', {'class': 'viewjob-content'})
+    if job_details is None:
+        return {'job_type': None, 'job_qualifications': None, 'job_description': None}
+
+    job_type_tag = job_details.find('span', {'class': 'viewjob-jobType'})
+    qualifications_tags = job_details.findAll('li', {'class': 'viewjob-qualification'})
+    job_description_tag = job_details.find('div', {'data-testid': 'VJ-section-content-jobDescription'})
+
+    return {
+        'job_type': job_type_tag.text if job_type_tag else None,
+        'job_qualifications': [tag.text for tag in qualifications_tags] if qualifications_tags else None,
+        'job_description': job_description_tag.text if job_description_tag else None
+    }
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to the same host to at most `rate` per second.
+
+    Each host gets its own schedule, so a slow host does not hold back requests to other hosts.
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+        - rate (float): Maximum requests per second per host.
+        """
+        self.interval = 1.0 / rate
+        self._next_slot = {}
+        self._locks = defaultdict(asyncio.Lock)
+
+    async def wait(self, host):
+        """Sleeps until the next request slot for `host`."""
+        loop = asyncio.get_running_loop()
+        async with self._locks[host]:
+            now = loop.time()
+            slot = max(self._next_slot.get(host, now), now)
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class DataSourcing:
+    """
+    Scrapes job postings from SimplyHired into the ingestion artifact.
+
+    Search and posting pages are fetched concurrently with asyncio over a
+    pooled, keep-alive aiohttp connector with per-host rate limiting. HTML is
+    parsed on a process pool while further pages are being fetched, and each
+    completed posting is appended to the output CSV as soon as it is ready.
+
+    Pages are kept in an on-disk HTTP cache and revalidated with conditional
+    GETs, so unchanged pages cost a 304 instead of a full download. Postings
+    whose job_link is in the persistent job link index are skipped. The
+    SQLite cache and index are only used from one worker thread, so their
+    blocking calls never run on the event loop; the links of a search page
+    enter the index after its postings are flushed to the output CSV.
+
+    Attributes:
+    - config (DataSourcingConfig): Scraping configuration.
+    - link_index (JobLinkIndex): Job links already present in the output file.
+    - http_cache (HttpCache): Cached responses, or None when caching is disabled.
+    """
+
+    def __init__(self, config: DataSourcingConfig):
+        """
+        Initializes the DataSourcing class.
+
+        Args:
+        - config (DataSourcingConfig): Scraping configuration.
+        """
+        self.config = config
+        self.link_index = JobLinkIndex(self.config.link_index_file, check_same_thread=False)
+        self.link_index.seed_from_csv(self.config.output_file)
+        self.http_cache = (HttpCache(self.config.cache_file, check_same_thread=False)
+                           if self.config.cache_file else None)
+
+        # Links scheduled during this run, so a posting listed on several pages is fetched once
+        self.scheduled = set()
+        self.scraped = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def _get_headers():
+        """Generate random headers for web requests to mimic real browser requests."""
+        return {
+            "Cache-Control": "max-age=0",
+            "Upgrade-Insecure-Requests": "1",
+            "User-Agent": random.choice(USER_AGENTS),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
+        }
+
+    def _construct_url(self, job_search, location, page=1):
+        """Construct the search URL for a job title, location and page number."""
+        return f"{self.config.base_url}/search?q={quote_plus(job_search)}&l={quote_plus(location)}&pn={page}"
+
+    async def _fetch(self, session, url):
+        """
+        Fetches a page, retrying connection errors and 5xx responses with backoff.
+
+        Cached pages are revalidated with a conditional GET and their cached
+        body is returned on 304 Not Modified. A 304 for a page that is not
+        cached has no body to reuse, so the page is requested again without
+        validators.
+
+        Args:
+        - session (aiohttp.ClientSession): Shared session.
+        - url (str): Page to fetch.
+
+        Returns:
+        - str or None: Page content, or None if every attempt failed.
+        """
+        import aiohttp
+
+        host = urlparse(url).netloc
+        cached = await self._db(self.http_cache.get, url) if self.http_cache is not None else None
+        headers = {**self._get_headers(), **HttpCache.conditional_headers(cached)}
+
+        for attempt in range(self.config.max_retries + 1):
+            await self.rate_limiter.wait(host)
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        if cached is not None:
+                            self.not_modified += 1
+                            return cached['body']
+                        logger.warning(f"HTTP 304 for uncached {url} (attempt {attempt + 1}), "
+                                       f"requesting it again without validators")
+                        headers = self._get_headers()
+                        continue
+                    if response.status < 500:
+                        response.raise_for_status()
+                        body = await response.text()
+                        if self.http_cache is not None:
+                            await self._db(self.http_cache.store, url, body, response.headers.get('ETag'),
+                                           response.headers.get('Last-Modified'))
+                        return body
+                    logger.warning(f"HTTP {response.status} for {url} (attempt {attempt + 1})")
+            except aiohttp.ClientResponseError as e:
+                logger.warning(f"HTTP {e.status} for {url}, skipping")
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Error fetching {url} (attempt {attempt + 1}): {e}")
+            await asyncio.sleep(2 ** attempt * 0.5)
+
+        logger.error(f"Giving up on {url}")
+        return None
+
+    async def _parse(self, func, *args):
+        """Runs a parse function on the process pool."""
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    async def _db(self, func, *args):
+        """Runs a blocking call of the HTTP cache or the job link index on the database thread."""
+        return await asyncio.get_running_loop().run_in_executor(self.db_executor, func, *args)
+
+    async def _scrape_posting(self, session, job):
+        """
+        Fetches and parses a posting's details, then appends the complete posting to the output.
+
+        A posting whose page could not be fetched is neither written nor
+        added to the job link index, so a later run scrapes it again.
+
+        Returns:
+        - str or None: The job link of the written posting, None when it was skipped.
+        """
+        html = await self._fetch(session, job['job_link'])
+        if html is None:
+            logger.warning(f"Skipping {job['job_link']}: its details could not be fetched")
+            return None
+        details = await self._parse(parse_job_details, html)
+        return self._write({**job, **details})
+
+    async def _scrape_page(self, session, job_search, location, page):
+        """
+        Scrapes one search result page and the postings on it.
+
+        Returns:
+        - int or None: Total number of postings reported by the page.
+        """
+        html = await self._fetch(session, self._construct_url(job_search, location, page))
+        if html is None:
+            return None
+
+        total_job_count, jobs = await self._parse(parse_search_page, html, self.config.base_url)
+        # Skip the jobs scheduled in this run, then those already in the existing dataset
+        jobs = [job for job in jobs if job['job_link'] not in self.scheduled]
+        self.scheduled.update(job['job_link'] for job in jobs)
+        new_links = set(await self._db(self.link_index.missing, [job['job_link'] for job in jobs]))
+        new_jobs = [job for job in jobs if job['job_link'] in new_links]
+
+        written = await asyncio.gather(*(self._scrape_posting(session, job) for job in new_jobs))
+        written = [link for link in written if link is not None]
+        if written:
+            # The rows reach the file before their links enter the index, so a crash cannot skip them
+            self.output.flush()
+            await self._db(self._index_links, written)
+        return total_job_count
+
+    async def _scrape_search(self, session, job_search, location):
+        """Scrapes every result page of a job title and location."""
+        total_job_count = await self._scrape_page(session, job_search, location, 1)
+        if not total_job_count:
+            return
+
+        job_pages = math.ceil(total_job_count / self.config.page_size)
+        if self.config.max_pages:
+            job_pages = min(job_pages, self.config.max_pages)
+        logger.info(f"Scraping {job_pages} pages for '{job_search}' in '{location}'...")
+
+        await asyncio.gather(*(self._scrape_page(session, job_search, location, page)
+                               for page in range(2, job_pages + 1)))
+
+    def _write(self, job):
+        """
+        Appends a posting to the output CSV. Its link is indexed once the rows of its search page are flushed.
+
+        Returns:
+        - str: The job link of the posting.
+        """
+        row = {column: job.get(column) for column in OUTPUT_COLUMNS}
+        if row['job_qualifications'] is not None:
+            row['job_qualifications'] = str(row['job_qualifications'])
+        self.writer.writerow(row)
+        self.scraped += 1
+        return row['job_link']
+
+    def _index_links(self, job_links):
+        """Syncs the flushed output CSV to disk, then adds the links of its new rows to the job link index."""
+        os.fsync(self.output.fileno())
+        self.link_index.add_many(job_links)
+
+    async def run(self):
+        """Scrapes every configured job title and location concurrently."""
+        import aiohttp
+
+        self.rate_limiter = HostRateLimiter(self.config.requests_per_second)
+        connector = aiohttp.TCPConnector(limit=self.config.max_connections,
+                                         limit_per_host=self.config.max_connections_per_host,
+                                         keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.config.request_timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*(self._scrape_search(session, job_search, location)
+                                   for job_search in self.config.job_searches
+                                   for location in self.config.locations))
+
+    def main(self):
+        """
+        Scrape new postings and append them to the output CSV.
+        """
+        os.makedirs(os.path.dirname(self.config.output_file) or ".", exist_ok=True)
+        write_header = not os.path.exists(self.config.output_file) or os.path.getsize(self.config.output_file) == 0
+
+        with open(self.config.output_file, 'a', newline='', encoding='utf-8') as f, \
+                ProcessPoolExecutor(max_workers=self.config.parse_workers) as pool, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite") as db_executor:
+            self.pool, self.db_executor, self.output = pool, db_executor, f
+            self.writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS)
+            if write_header:
+                self.writer.writeheader()
+            try:
+                asyncio.run(self.run())
+            finally:
+                self.link_index.close()
+                if self.http_cache is not None:
+                    self.http_cache.close()
+
+        logger.info(f"Scraped {self.scraped} new postings into {self.config.output_file} "
+                    f"({self.not_modified} pages served from cache after revalidation)")
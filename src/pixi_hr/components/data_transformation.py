@@ -1,14 +1,22 @@
 import os
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from pixi_hr import logger
-from sklearn.preprocessing import LabelEncoder
 import re
-from sklearn.preprocessing import MultiLabelBinarizer
 import ast
+from pathlib import Path
 
 
 from pixi_hr.config.configuration import DataTransformationConfig
+from pixi_hr.components.qualification_vocabulary import QualificationVocabulary
+from pixi_hr.components.categorical_encoder import CategoricalEncoder
+from pixi_hr.components.transformed_store import TransformedStore
+from pixi_hr.components.feature_store import FeatureStore
+from pixi_hr.components.text_features import TextFeatureExtractor
+from pixi_hr.components.posting_index import PostingIndex
+from pixi_hr.components.similarity_index import SimilarityIndex
+from pixi_hr.utils.hashing import hash_split_mask
 
 class DataTransformation:
     """
@@ -18,6 +26,9 @@ class DataTransformation:
     - config (DataTransformationConfig): Configuration object containing paths.
     - df (DataFrame): Pandas DataFrame loaded from the specified data file.
     """
+
+    # Columns converted to integer codes by categorical_encoding
+    CATEGORICAL_COLUMNS = ['title', 'job_location', 'company_name', 'job_type']
     
     def __init__(self, config: DataTransformationConfig):
         """
@@ -30,7 +41,7 @@ class DataTransformation:
 
         try:
             # Load the data into a DataFrame
-            self.df = pd.read_csv(self.config.data_path)
+            self.df = pd.read_csv(self.config.data_path, parse_dates=['date_of_job_post'], date_format='ISO8601')
         except FileNotFoundError:
             logger.error(f"File not found: {self.config.data_path}")
             raise
@@ -39,7 +50,8 @@ class DataTransformation:
             raise
 
 
-    def clean_skills(self, skill_list_str):
+    @staticmethod
+    def clean_skills(skill_list_str):
         """Clean the skills from the job_qualifications column."""
         try:
             # Safely evaluate the string as a Python expression
@@ -60,57 +72,105 @@ class DataTransformation:
             # Handle invalid input gracefully
             return []
     
-    def one_hot_encode_qualifications(self):
-        """One-hot encodes the job qualifications."""
-        # Clean the skills
-        self.df['job_qualifications'] = self.df['job_qualifications'].apply(self.clean_skills)
-
-        # Initialize the MultiLabelBinarizer
-        mlb = MultiLabelBinarizer()
+    def one_hot_encode_qualifications(self, vocabulary=None):
+        """
+        One-hot encodes the job qualifications.
 
-        # One-hot encode the cleaned skills
-        encoded_qualifications = mlb.fit_transform(self.df['job_qualifications'])
+        The width of the encoding is bounded by the qualification vocabulary
+        settings (min_df, top_k or hashing), and the fitted vocabulary is
+        saved so the same columns can be reproduced for new postings.
 
-        # Add a prefix to the encoded column names
-        encoded_columns = [f"qual_{col}" for col in mlb.classes_]
+        Args:
+        - vocabulary (QualificationVocabulary, optional): A previously fitted
+          vocabulary to encode with. When omitted, a new one is fitted and saved.
+        """
+        # Clean the skills
+        self.df['job_qualifications'] = self.df['job_qualifications'].apply(self.clean_skills)
 
-        # Convert the one-hot encoded skills into a DataFrame
-        encoded_df = pd.DataFrame(encoded_qualifications, columns=encoded_columns)
+        if vocabulary is None:
+            # Fit the vocabulary and encode the cleaned skills
+            vocabulary = QualificationVocabulary.from_params(self.config.vocabulary_params)
+            encoded_df = vocabulary.fit_transform(self.df['job_qualifications'], index=self.df.index)
+            vocabulary.save(Path(self.config.vocabulary_file))
+        else:
+            encoded_df = vocabulary.transform(self.df['job_qualifications'], index=self.df.index)
 
         # Drop the original job_qualifications column and concat the encoded DataFrame
         self.df = pd.concat([self.df.drop('job_qualifications', axis=1), encoded_df], axis=1)
 
-        logger.info("One-hot encoding of job qualifications completed.")
+        logger.info(f"One-hot encoding of job qualifications completed with {encoded_df.shape[1]} columns.")
 
 
     
+    @staticmethod
+    def extract_calendar_parts(dates):
+        """
+        Extracts month, day, year, hour, minute and second from datetimes in a
+        single vectorized pass over the underlying datetime64 values.
+
+        Timezone-aware values are converted to UTC first. Missing dates give NaN parts.
+
+        Args:
+        - dates (pd.Series): datetime64 values.
+
+        Returns:
+        - dict: Mapping of part name ('month', 'day', ...) to a NumPy array.
+        """
+        if getattr(dates.dt, 'tz', None) is not None:
+            dates = dates.dt.tz_convert(None)
+
+        values = dates.to_numpy(dtype='datetime64[s]')
+        years = values.astype('datetime64[Y]')
+        months = values.astype('datetime64[M]')
+        days = values.astype('datetime64[D]')
+        seconds = (values - days).astype(np.int64)
+
+        parts = {
+            'month': (months - years).astype(np.int64) + 1,
+            'day': (days - months).astype(np.int64) + 1,
+            'year': years.astype(np.int64) + 1970,
+            'hour': seconds // 3600,
+            'minute': seconds // 60 % 60,
+            'second': seconds % 60,
+        }
+
+        missing = np.isnat(values)
+        if missing.any():
+            for name, part in parts.items():
+                part = part.astype(np.float64)
+                part[missing] = np.nan
+                parts[name] = part
+        return parts
+
     def datetime_conversion_and_extraction(self):
         """
         Convert the date_of_job_post column into a datetime format and extract
         year, month, day, hour, minute, and second as separate columns.
+
+        The column is parsed by the validation stage and persisted in ISO 8601,
+        so reading it back here needs no format inference.
         """
-        self.df['date_of_job_post'] = pd.to_datetime(self.df['date_of_job_post'])
-        
+        if not pd.api.types.is_datetime64_any_dtype(self.df['date_of_job_post']):
+            self.df['date_of_job_post'] = pd.to_datetime(self.df['date_of_job_post'], format='ISO8601', utc=True)
+
         # Extracting different datetime features
-        self.df['month_of_job_post'] = self.df['date_of_job_post'].dt.month
-        self.df['day_of_job_post'] = self.df['date_of_job_post'].dt.day
-        self.df['year_of_job_post'] = self.df['date_of_job_post'].dt.year
-        self.df['hour_of_job_post'] = self.df['date_of_job_post'].dt.hour
-        self.df['minute_of_job_post'] = self.df['date_of_job_post'].dt.minute
-        self.df['second_of_job_post'] = self.df['date_of_job_post'].dt.second
+        for name, part in self.extract_calendar_parts(self.df['date_of_job_post']).items():
+            self.df[f'{name}_of_job_post'] = part
 
         logger.info("Datetime conversion and feature extraction completed.")
     
    
     def categorical_encoding(self):
         """
-        Convert categorical columns to numerical format using label encoding.
+        Convert categorical columns to numerical format using categorical codes.
+
+        Codes come from the persisted category dictionaries, so categories keep
+        their code across runs; new categories are appended and unknown or
+        missing values map to CategoricalEncoder.UNKNOWN_CODE.
         """
-        label_encoders = {}  # Store the encoders for potential use later
-        for col in ['title', 'job_location', 'company_name', 'job_type']:
-            le = LabelEncoder()
-            self.df[col] = le.fit_transform(self.df[col])
-            label_encoders[col] = le
+        encoder = CategoricalEncoder.load(Path(self.config.category_mappings_file), columns=self.CATEGORICAL_COLUMNS)
+        self.df = encoder.fit_transform(self.df)
+        encoder.save(Path(self.config.category_mappings_file))
         logger.info("Categorical encoding completed.")
 
     
@@ -123,16 +183,45 @@ class DataTransformation:
         logger.info("Handling of missing values completed.")
 
     
-    def split_data(self):
+    def split_mask(self):
+        """
+        Assign each row to the train or test set.
+
+        With the 'hash' strategy each row's membership depends only on a stable
+        hash of its job_link, so appending postings never moves existing rows
+        between the sets. The 'random' strategy reshuffles every row.
+
+        Returns:
+        - np.ndarray: Boolean mask, True for test set rows.
+        """
+        if self.config.split_strategy == "hash":
+            return hash_split_mask(self.df['job_link'], self.config.test_size)
+        elif self.config.split_strategy == "random":
+            _, test_rows = train_test_split(np.arange(len(self.df)), test_size=self.config.test_size, random_state=44)
+            is_test = np.zeros(len(self.df), dtype=bool)
+            is_test[test_rows] = True
+            return is_test
+        else:
+            raise ValueError(f"Unsupported split strategy: {self.config.split_strategy}")
+
+    def split_data(self, store=None):
         """
         Split the data into train and test sets and save them to respective paths.
+
+        Args:
+        - store (TransformedStore, optional): Store to rebuild from the transformed data.
         """
-        train, test = train_test_split(self.df, test_size=0.2, random_state=44)
+        is_test = self.split_mask()
+        train, test = self.df[~is_test], self.df[is_test]
 
         train.to_csv(os.path.join(self.config.root_dir, 'train_data.csv'), index=False)
         test.to_csv(os.path.join(self.config.root_dir, 'test_data.csv'), index=False)
 
-        logger.info("Data split into train and test sets and saved to respective paths.")
+        if store is not None:
+            store.rebuild(self.df, is_test)
+        self.write_feature_store(is_test, rebuild=True)
+
+        logger.info(f"Data split ({self.config.split_strategy}) into train and test sets and saved to respective paths.")
         logger.info(f"Train shape: {train.shape}")
         logger.info(f"Test shape: {test.shape}")
 
@@ -140,11 +229,185 @@ class DataTransformation:
         print(f"Test shape: {test.shape}")
 
     
+    def write_feature_store(self, is_test, retired=(), rebuild=False):
+        """
+        Write the transformed feature vectors to the feature store, keyed by job_link.
+
+        Args:
+        - is_test (np.ndarray): Boolean mask, True for test set rows.
+        - retired (list): Job links to remove from the store.
+        - rebuild (bool): Discard the stored vectors before writing.
+        """
+        if not self.config.feature_store_file:
+            return
+
+        with FeatureStore(self.config.feature_store_file) as feature_store:
+            if rebuild:
+                feature_store.clear()
+            feature_store.write(self.df, is_test)
+            feature_store.delete(retired)
+
+    
+    def extract_text_features(self):
+        """
+        Hash the text columns of the train and test sets into sparse feature matrices.
+
+        The matrices are row-aligned with train_data.csv and test_data.csv.
+        A matrix that is newer than its CSV is left as it is.
+        """
+        params = self.config.text_feature_params
+        if not params or not params.get('enabled', False):
+            return
+
+        extractor = TextFeatureExtractor.from_params(params)
+        for split, output_path in (('train', self.config.train_text_features_file),
+                                   ('test', self.config.test_text_features_file)):
+            csv_path = os.path.join(self.config.root_dir, f'{split}_data.csv')
+            if os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(csv_path):
+                logger.info(f"Text features in {output_path} are up to date.")
+                continue
+            extractor.transform_csv(csv_path, output_path)
+
+    
+    def read_transformed_postings(self):
+        """
+        Read the job links, locations, job types and `qual_*` columns of the train and test sets.
+
+        Rows follow train_data.csv then test_data.csv. Location and job type
+        codes are decoded with the category dictionaries.
+
+        Returns:
+        - pd.DataFrame: The postings.
+        """
+        csv_paths = [os.path.join(self.config.root_dir, f'{split}_data.csv') for split in ('train', 'test')]
+        usecols = lambda col: col in ('job_link', 'job_location', 'job_type') or col.startswith(QualificationVocabulary.PREFIX)
+        df = pd.concat([pd.read_csv(path, usecols=usecols) for path in csv_paths], ignore_index=True)
+
+        encoder = CategoricalEncoder.load(Path(self.config.category_mappings_file), columns=self.CATEGORICAL_COLUMNS)
+        for col in ('job_location', 'job_type'):
+            df[col] = encoder.inverse_transform(col, df[col].fillna(CategoricalEncoder.UNKNOWN_CODE).astype(int))
+        return df
+
+    
+    def build_search_indexes(self, changes=None):
+        """
+        Build the posting index (skill / location / job type search) and the
+        similarity index (similar postings by qualification profile).
+
+        After an incremental run that only added postings, the new postings
+        are inserted into the existing similarity index; changed or retired
+        postings rebuild it.
+
+        Args:
+        - changes (tuple, optional): (new or changed job links, retired job links)
+          of an incremental run; None after a full run.
+        """
+        posting_index_file, similarity_index_dir = self.config.posting_index_file, self.config.similarity_index_dir
+        posting_index_missing = posting_index_file and not os.path.exists(posting_index_file)
+        similarity_index_missing = similarity_index_dir and not os.path.exists(os.path.join(similarity_index_dir, 'meta.json'))
+        if changes is not None and not any(changes) and not posting_index_missing and not similarity_index_missing:
+            return
+
+        postings = self.read_transformed_postings()
+        vocabulary = QualificationVocabulary.load(Path(self.config.vocabulary_file))
+        skill_buckets = vocabulary.n_buckets if vocabulary.mode == "hashing" else 0
+
+        if posting_index_file:
+            PostingIndex.build(postings, skill_buckets=skill_buckets).save(posting_index_file)
+
+        if similarity_index_dir:
+            if changes is not None and not similarity_index_missing and not changes[1]:
+                index = SimilarityIndex.load(similarity_index_dir)
+                if not np.isin(changes[0], index.job_links).any():
+                    added = postings[postings['job_link'].isin(changes[0])]
+                    index.insert(added['job_link'], added[index.feature_names].to_numpy(dtype=np.uint8))
+                    logger.info(f"Inserted {len(added)} new postings into the similarity index.")
+                    index.save(similarity_index_dir)
+                    return
+
+            feature_names = [col for col in postings.columns if col.startswith(QualificationVocabulary.PREFIX)]
+            index = SimilarityIndex.from_params(feature_names, self.config.similarity_index_params, skill_buckets)
+            index.build(postings['job_link'], postings[feature_names].to_numpy(dtype=np.uint8))
+            index.save(similarity_index_dir)
+
+    
+    def update_incrementally(self, store):
+        """
+        Transforms only postings that are new or changed since the last run.
+
+        Unchanged postings are taken from the store as they are. New and changed
+        postings are transformed against the persisted category dictionaries
+        and qualification vocabulary, appended to the store, and postings that
+        are no longer in the validated data are tombstoned. Skills outside the
+        persisted vocabulary are ignored until the next full run.
+
+        train_data.csv and test_data.csv are then rewritten from the live
+        postings of the store; this reads the shards but transforms nothing.
+
+        Args:
+        - store (TransformedStore): The populated store from earlier runs.
+
+        Returns:
+        - tuple: (new or changed job links, retired job links), both empty when nothing changed.
+        """
+        train_path = os.path.join(self.config.root_dir, 'train_data.csv')
+        test_path = os.path.join(self.config.root_dir, 'test_data.csv')
+        delta, retired = store.diff(self.df)
+        if not delta.any() and not retired:
+            if os.path.exists(train_path) and os.path.exists(test_path):
+                logger.info("No new, changed or retired postings; transformed data is up to date.")
+            else:
+                logger.info("No new, changed or retired postings; rewriting the train and test sets from the store.")
+                store.materialize(train_path, test_path)
+            return [], []
+
+        self.df = self.df[delta].reset_index(drop=True)
+
+        logger.info("Datetime Conversion and Feature Extraction...")
+        self.datetime_conversion_and_extraction()
+
+        logger.info("Categorical Encoding...")
+        self.categorical_encoding()
+
+        logger.info("Handling Missing Values...")
+        self.handle_missing_values()
+
+        logger.info("One-Hot Encoding of Job Qualifications...")
+        self.one_hot_encode_qualifications(vocabulary=QualificationVocabulary.load(Path(self.config.vocabulary_file)))
+
+        logger.info("Appending to the transformed store...")
+        is_test = self.split_mask()
+        store.append(self.df, is_test, retired)
+        self.write_feature_store(is_test, retired=retired)
+
+        train, test = store.materialize(train_path, test_path)
+        logger.info(f"Train shape: {train.shape}")
+        logger.info(f"Test shape: {test.shape}")
+        return self.df['job_link'].tolist(), list(retired)
+
+    
     def main(self):
         """
         Orchestrates the sequence of data transformations.
+
+        When incremental transformation is enabled and an earlier run populated
+        the store with the same split and vocabulary settings, and no full run
+        refitted the vocabulary since, only the delta is processed (see
+        update_incrementally).
         """
         logger.info("Starting Data Transformation...")
+
+        store = None
+        if self.config.incremental:
+            if self.config.split_strategy != "hash":
+                raise ValueError("Incremental transformation requires the 'hash' split strategy")
+            store = TransformedStore.from_config(self.config)
+            if store.exists():
+                changes = self.update_incrementally(store)
+                self.build_search_indexes(changes)
+                self.extract_text_features()
+                logger.info("Data Transformation completed successfully.")
+                return
         
         # Step 1: Datetime Conversion and Feature Extraction
         logger.info("Datetime Conversion and Feature Extraction...")
@@ -164,6 +427,14 @@ class DataTransformation:
 
         # Step 5: Split Data into Train and Test sets
         logger.info("Splitting Data...")
-        self.split_data()
+        self.split_data(store)
+
+        # Step 6: Posting search and similar-posting indexes
+        logger.info("Building Search Indexes...")
+        self.build_search_indexes()
+
+        # Step 7: Hashed text features of the train and test sets
+        logger.info("Extracting Text Features...")
+        self.extract_text_features()
 
-        logger.info("Data Transformation completed successfully.")
\ No newline at end of file
+        logger.info("Data Transformation completed successfully.")
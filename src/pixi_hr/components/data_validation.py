@@ -1,8 +1,11 @@
 import os
 import pandas as pd
 import ast  # Required for the validate_job_qualifications method
+from pandas.tseries.api import guess_datetime_format
 from pixi_hr import logger
 from pixi_hr.entity.config_entity import DataValidationConfig
+from pixi_hr.utils.hashing import row_content_hash
+from pixi_hr.components.near_duplicates import NearDuplicateDetector
 
 class DataValidation:
     """
@@ -21,6 +24,11 @@ class DataValidation:
         - config (DataValidationConfig): Configuration object containing paths and schema information.
         """
         self.config = config
+        self.date_format = config.date_format
+        # Violations of an earlier run are cleared, so the file only lists this run's
+        self._violations_written = False
+        if config.violations_file and os.path.exists(config.violations_file):
+            os.remove(config.violations_file)
         try:
             # Load the data into a DataFrame
             self.df = pd.read_csv(self.config.unzip_data_dir)
@@ -82,21 +90,85 @@ class DataValidation:
             logger.error(f"Error writing to status file: {e}")
             raise
 
+    def _report_violations(self, check, rows, column):
+        """
+        Logs a capped sample of the rows failing a check, and writes all of them to the violations file.
+
+        Rendering every invalid row into the log is slow on large inputs and
+        buries the rest of the log, so only `max_logged_rows` are logged. The
+        full list goes to `violations_file` (check, row index, column, value).
+
+        Args:
+        - check (str): Name of the failed check.
+        - rows (DataFrame): Rows failing the check.
+        - column (str): Column checked.
+        """
+        sample = rows[[column]].head(self.config.max_logged_rows)
+        more = len(rows) - len(sample)
+        logger.warning(f"{check} sample:\n{sample.to_string()}"
+                       + (f"\n... {more} more rows in {self.config.violations_file}" if more and
+                          self.config.violations_file else ""))
+        if self.config.violations_file:
+            violations = pd.DataFrame({'check': check, 'row': rows.index, 'column': column,
+                                       'value': rows[column].astype(str).to_numpy()})
+            violations.to_csv(self.config.violations_file, mode='a' if self._violations_written else 'w',
+                              header=not self._violations_written, index=False)
+            self._violations_written = True
+
     
+    def _date_format(self, dates):
+        """
+        Returns the strftime format of 'date_of_job_post'.
+
+        Uses the configured format if there is one, otherwise infers it once
+        from the first non-null value and caches it for later calls.
+
+        Args:
+        - dates (pd.Series): Raw 'date_of_job_post' strings.
+
+        Returns:
+        - str or None: The format, or None if it could not be inferred.
+        """
+        if self.date_format is None:
+            first_valid = dates.first_valid_index()
+            if first_valid is not None:
+                self.date_format = guess_datetime_format(str(dates[first_valid]))
+                logger.info(f"Inferred 'date_of_job_post' format: {self.date_format}")
+        return self.date_format
+
     def validate_date_of_job_post(self):
         """
         Validate that 'date_of_job_post' contains valid date-time strings.
         Logs any discrepancies.
+
+        The column is parsed once with an explicit (or inferred) format and
+        replaced by the parsed UTC datetimes, which are persisted with the
+        validated data so later stages do not parse it again. Values that do
+        not match the format are retried individually; the ones that still
+        fail become NaT.
         """
-        try:
-            self.df['date_of_job_post_temp'] = pd.to_datetime(self.df['date_of_job_post'], errors='raise')
+        dates = self.df['date_of_job_post']
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            logger.info("'date_of_job_post' is already parsed.")
+            return
+
+        date_format = self._date_format(dates)
+        parsed = pd.to_datetime(dates, format=date_format, errors='coerce', utc=True)
+
+        # Only the values that do not match the format pay for a second, per-value parse
+        mismatched = parsed.isna() & dates.notna()
+        if mismatched.any():
+            parsed[mismatched] = pd.to_datetime(dates[mismatched], format='mixed', errors='coerce', utc=True)
+
+        invalid = parsed.isna() & dates.notna()
+        if invalid.any():
+            logger.warning(f"Found {invalid.sum()} rows with invalid date-time strings:")
+            self._report_violations('invalid_date_of_job_post', self.df.loc[invalid, ['date_of_job_post']],
+                                    'date_of_job_post')
+        else:
             logger.info("All values in 'date_of_job_post' are valid date-time strings.")
-        except Exception as e:
-            logger.warning(f"Error encountered: {e}")
-            self.df['date_of_job_post_temp'] = pd.to_datetime(self.df['date_of_job_post'], errors='coerce')
-            invalid_rows = self.df[self.df['date_of_job_post_temp'].isna()]
-            logger.warning("\nRows with invalid date-time strings:")
-            logger.warning(invalid_rows[['date_of_job_post']])
+
+        self.df['date_of_job_post'] = parsed
 
     
     def validate_text_fields(self, columns):
@@ -111,7 +183,7 @@ class DataValidation:
             non_text_rows = self.df[self.df[column].apply(lambda x: not isinstance(x, str))]
             if not non_text_rows.empty:
                 logger.warning(f"Column '{column}' has non-text values:")
-                logger.warning(non_text_rows[[column]])
+                self._report_violations(f'non_text_{column}', non_text_rows, column)
             else:
                 logger.info(f"Column '{column}' contains only text values.")
 
@@ -124,7 +196,7 @@ class DataValidation:
         invalid_urls = self.df[~self.df['job_link'].str.startswith("http")]
         if not invalid_urls.empty:
             logger.warning(f"Found {len(invalid_urls)} rows with URLs not starting with 'http':")
-            logger.warning(invalid_urls[['job_link']])
+            self._report_violations('invalid_job_link', invalid_urls, 'job_link')
         else:
             logger.info("All URLs in 'job_link' start with 'http'.")
 
@@ -138,7 +210,7 @@ class DataValidation:
         non_text_job_types = non_null_job_types[~non_null_job_types['job_type'].apply(lambda x: isinstance(x, str))]
         if not non_text_job_types.empty:
             logger.warning(f"Found {len(non_text_job_types)} rows in 'job_type' with non-text values:")
-            logger.warning(non_text_job_types[['job_type']])
+            self._report_violations('non_text_job_type', non_text_job_types, 'job_type')
         else:
             logger.info("All non-null values in 'job_type' are of text type.")
 
@@ -158,11 +230,23 @@ class DataValidation:
         invalid_qualifications = self.df[~self.df['job_qualifications'].apply(is_valid_list)]
         if not invalid_qualifications.empty:
             logger.warning(f"Found {len(invalid_qualifications)} rows in 'job_qualifications' with invalid format:")
-            logger.warning(invalid_qualifications[['job_qualifications']])
+            self._report_violations('invalid_job_qualifications', invalid_qualifications, 'job_qualifications')
         else:
             logger.info("All values in 'job_qualifications' are valid lists of text values.")
 
 
+    def add_content_hashes(self):
+        """
+        Record a stable hash of each row's schema columns in 'content_hash'.
+
+        The transformation stage compares these hashes with the ones it has
+        already processed to transform only new or changed postings.
+        """
+        columns = list(self.config.all_schema.keys())
+        self.df['content_hash'] = row_content_hash(self.df, columns)
+        logger.info(f"Computed content hashes for {len(self.df)} rows.")
+
+
     def handle_duplicates(self):
         """
         Handle duplicate rows based on the 'job_link' column.
@@ -172,10 +256,52 @@ class DataValidation:
         if num_duplicates > 0:
             self.df.drop_duplicates(subset='job_link', inplace=True)
             logger.info(f"Dropped {num_duplicates} duplicate rows based on the 'job_link' column.")
-            self._save_dataframe()
         else:
             logger.info("No duplicates found based on the 'job_link' column.")
 
+
+    def handle_near_duplicates(self):
+        """
+        Drop postings whose text nearly duplicates another posting's.
+
+        The same job reposted under a different link, or copied by an
+        aggregator, gets a different 'job_link' but (nearly) the same summary
+        and description. Clusters are found with MinHash/LSH over the
+        configured text columns; the first posting of each cluster is kept.
+        Every clustered posting is written to the near-duplicate report.
+        """
+        params = self.config.near_duplicate_params or {}
+        if not params.get('enabled', False):
+            logger.info("Near-duplicate detection is disabled.")
+            return
+
+        columns = params.get('columns', ['job_summary', 'job_description'])
+        texts = self.df[columns[0]].fillna('').astype(str)
+        for column in columns[1:]:
+            texts = texts + ' ' + self.df[column].fillna('').astype(str)
+
+        detector = NearDuplicateDetector.from_params(params)
+        labels, _ = detector.find_clusters(texts.tolist())
+
+        clusters = pd.DataFrame({'cluster_id': labels, 'job_link': self.df['job_link'].to_numpy()})
+        cluster_sizes = clusters['cluster_id'].map(clusters['cluster_id'].value_counts())
+        report = clusters[cluster_sizes.to_numpy() > 1].copy()
+        report['kept'] = ~report['cluster_id'].duplicated()
+        report.sort_values(['cluster_id', 'kept'], ascending=[True, False]).to_csv(
+            self.config.near_duplicate_report_file, index=False)
+
+        is_near_duplicate = pd.Series(labels).duplicated().to_numpy()
+        self.df = self.df[~is_near_duplicate]
+        logger.info(f"Dropped {is_near_duplicate.sum()} near-duplicate postings in "
+                    f"{report['cluster_id'].nunique()} clusters; report saved to {self.config.near_duplicate_report_file}")
+
+
+    def save_validated_data(self):
+        """
+        Save the validated data for the transformation stage.
+        """
+        self._save_dataframe()
+
     
     def _save_dataframe(self):
         """
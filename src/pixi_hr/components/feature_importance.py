@@ -0,0 +1,215 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from pixi_hr import logger
+from pixi_hr.entity.config_entity import FeatureImportanceConfig
+from pixi_hr.components.model_trainer import ModelTrainer
+from pixi_hr.components.model_evaluation import ModelEvaluation
+from pixi_hr.utils.common import load_bin, save_json, save_matrix, load_matrix
+
+# Test matrix, predictions and model loaded once per worker process by _init_worker
+_worker = {}
+
+
+def _init_worker(features_dir, model_path):
+    """Memory-maps the test matrix, target and baseline predictions, and the model, into a worker process."""
+    _worker['x'] = load_matrix(features_dir, 'x')
+    _worker['y'] = load_matrix(features_dir, 'y')
+    _worker['baseline'] = load_matrix(features_dir, 'baseline')
+    _worker['model'] = load_bin(Path(model_path), mmap_mode='r')
+    _worker['baseline_rmse'] = ModelEvaluation.eval_metrics(_worker['y'], _worker['baseline'])[0]
+
+
+def _rows_with_column(x, rows, column, values):
+    """Copy of the `rows` of `x` in which `column` holds `values`."""
+    if sparse.issparse(x):
+        subset = x[rows]
+        current = subset[:, [column]].toarray().ravel()
+        delta = sparse.csr_matrix((values - current, (np.arange(len(rows)), np.full(len(rows), column))),
+                                  shape=subset.shape, dtype=subset.dtype)
+        return subset + delta
+    subset = np.array(x[rows])
+    subset[:, column] = values
+    return subset
+
+
+def _permute_columns(columns, n_repeats, seed, deadline):
+    """
+    Permutation importance of a batch of columns: the mean RMSE increase when a column is shuffled.
+
+    Only the rows whose value a shuffle changes can get a different
+    prediction, so only those rows are predicted again; the other rows keep
+    their baseline prediction. Each column's shuffles are seeded from `seed`
+    and the column, so results do not depend on the batching.
+
+    Runs in a worker process set up by _init_worker.
+
+    Args:
+    - columns (list): Columns of the test matrix to permute, in order.
+    - n_repeats (int): Shuffles per column.
+    - seed (int): Seed of the shuffles.
+    - deadline (float): time.time() after which no further column is started, None for no limit.
+
+    Returns:
+    - list: One dict per permuted column; columns not reached before the deadline are left out.
+    """
+    x, y, baseline, model = _worker['x'], _worker['y'], _worker['baseline'], _worker['model']
+    results = []
+    for column in columns:
+        if deadline is not None and time.time() > deadline:
+            break
+        values = x[:, [column]].toarray().ravel() if sparse.issparse(x) else np.asarray(x[:, column])
+        rng = np.random.default_rng([seed, column])
+        increases, changed_rows = [], []
+        for _ in range(n_repeats):
+            shuffled = values[rng.permutation(len(values))]
+            changed = np.flatnonzero(shuffled != values)
+            predictions = np.array(baseline)
+            if len(changed):
+                predictions[changed] = model.predict(_rows_with_column(x, changed, column, shuffled[changed]))
+            increases.append(ModelEvaluation.eval_metrics(y, predictions)[0] - _worker['baseline_rmse'])
+            changed_rows.append(len(changed))
+        results.append({'column': column, 'importance': float(np.mean(increases)),
+                        'importance_std': float(np.std(increases)), 'rows_changed': float(np.mean(changed_rows))})
+    return results
+
+
+class FeatureImportance:
+    """
+    Permutation importance of the qual_* features of the trained model on the test split.
+
+    The test matrix (with the text features the model was trained with),
+    its target and the baseline predictions are saved once as .npy files,
+    which every worker of a process pool memory-maps. Columns are permuted
+    in batches of `batch_size` per task, and a shuffle only re-predicts the
+    rows whose value it changes. Columns holding a single value (e.g. a
+    skill absent from every test posting) are not permuted: shuffling them
+    changes nothing, so their importance is 0.
+
+    Columns are permuted in decreasing order of the model's native
+    importance, so when `time_budget_s` runs out, the columns left out are
+    the least likely to matter. The ranked importances, with the native
+    importance of every column, are written to a CSV.
+
+    Attributes:
+    - config (FeatureImportanceConfig): Feature importance configuration.
+    """
+
+    def __init__(self, config: FeatureImportanceConfig):
+        """
+        Initializes the FeatureImportance component.
+
+        Args:
+        - config (FeatureImportanceConfig): Feature importance configuration.
+        """
+        self.config = config
+
+    @staticmethod
+    def native_importances(model, n_columns):
+        """Impurity importances of a forest, or absolute coefficients of a linear model, of the first `n_columns` features."""
+        if hasattr(model, 'feature_importances_'):
+            return np.asarray(model.feature_importances_)[:n_columns]
+        if hasattr(model, 'coef_'):
+            return np.abs(np.ravel(model.coef_))[:n_columns]
+        return None
+
+    def prepare(self):
+        """
+        Saves the test matrix, target and baseline predictions for the workers.
+
+        Returns:
+        - tuple: qual_* column names, mask of the single-valued ones, the model and its baseline metrics.
+        """
+        test_data = pd.read_csv(self.config.test_data_path)
+        columns = [col for col in test_data.columns if col.startswith('qual_')]
+        qualifications = test_data[columns]
+        x = (ModelTrainer.stack_text_features(qualifications, self.config.test_text_features_path)
+             if self.config.test_text_features_path else qualifications.to_numpy(dtype=np.float32))
+        y = test_data[self.config.target_column].to_numpy(dtype=np.float64)
+
+        model = load_bin(Path(self.config.model_path), mmap_mode='r')
+        baseline = model.predict(x)
+        rmse, mae, r2 = ModelEvaluation.eval_metrics(y, baseline)
+
+        for stale in Path(self.config.features_dir).glob('*.npy'):
+            stale.unlink()
+        save_matrix(x, self.config.features_dir, 'x')
+        save_matrix(y, self.config.features_dir, 'y')
+        save_matrix(baseline, self.config.features_dir, 'baseline')
+
+        values = qualifications.to_numpy()
+        single_valued = (values == values[:1]).all(axis=0) if len(values) else np.ones(len(columns), dtype=bool)
+        return columns, single_valued, model, {'rmse': float(rmse), 'mae': float(mae), 'r2': float(r2)}
+
+    def main(self):
+        """
+        Computes the permutation importances and writes the ranked importances and the report.
+
+        Returns:
+        - pd.DataFrame: Importance of every qual_* column, ranked.
+        """
+        start = time.time()
+        deadline = start + self.config.time_budget_s if self.config.time_budget_s else None
+        columns, single_valued, model, baseline = self.prepare()
+        native = self.native_importances(model, len(columns))
+
+        candidates = np.flatnonzero(~single_valued)
+        if native is not None:
+            candidates = candidates[np.argsort(-native[candidates], kind='stable')]
+        batches = [candidates[i:i + self.config.batch_size].tolist()
+                   for i in range(0, len(candidates), self.config.batch_size)]
+        logger.info(f"Permuting {len(candidates)} of {len(columns)} qual_* columns in {len(batches)} batches "
+                    f"({len(columns) - len(candidates)} single-valued columns skipped)")
+
+        n_jobs = min(self.config.n_jobs or os.cpu_count() or 1, max(len(batches), 1))
+        args = (self.config.n_repeats, self.config.seed, deadline)
+        initargs = (self.config.features_dir, self.config.model_path)
+        results = []
+        if n_jobs == 1:
+            _init_worker(*initargs)
+            try:
+                for batch in batches:
+                    results.extend(_permute_columns(batch, *args))
+            finally:
+                _worker.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=initargs) as pool:
+                for future in as_completed([pool.submit(_permute_columns, batch, *args) for batch in batches]):
+                    results.extend(future.result())
+
+        importances = pd.DataFrame({'feature': columns,
+                                    'importance': np.where(single_valued, 0.0, np.nan),
+                                    'importance_std': np.where(single_valued, 0.0, np.nan),
+                                    'rows_changed': np.where(single_valued, 0.0, np.nan),
+                                    'native_importance': native if native is not None else np.nan,
+                                    'status': np.where(single_valued, 'single_valued', 'over_budget')})
+        if results:
+            permuted = pd.DataFrame(results).set_index('column')
+            for field in ('importance', 'importance_std', 'rows_changed'):
+                importances.loc[permuted.index, field] = permuted[field]
+            importances.loc[permuted.index, 'status'] = 'permuted'
+        importances = importances.sort_values(['importance', 'native_importance'], ascending=False,
+                                              na_position='last', kind='stable').reset_index(drop=True)
+        importances.insert(0, 'rank', np.arange(1, len(importances) + 1))
+        importances.to_csv(self.config.importance_file, index=False)
+
+        counts = importances['status'].value_counts()
+        report = {'baseline': baseline, 'metric': 'rmse_increase', 'n_columns': len(columns),
+                  'permuted': int(counts.get('permuted', 0)), 'single_valued': int(counts.get('single_valued', 0)),
+                  'over_budget': int(counts.get('over_budget', 0)), 'n_repeats': self.config.n_repeats,
+                  'batch_size': self.config.batch_size, 'n_jobs': n_jobs, 'time_budget_s': self.config.time_budget_s,
+                  'wall_s': round(time.time() - start, 4),
+                  'top': importances.head(20)[['feature', 'importance', 'native_importance']].to_dict('records')}
+        save_json(path=Path(self.config.report_file), data=report)
+        if report['over_budget']:
+            logger.warning(f"Time budget of {self.config.time_budget_s}s reached: {report['over_budget']} columns "
+                           f"were not permuted")
+        logger.info(f"Permutation importance of {report['permuted']} columns saved at {self.config.importance_file}; "
+                    f"top: " + ", ".join(f"{row['feature']} ({row['importance']:+.4g})" for row in report['top'][:5]))
+        return importances
@@ -0,0 +1,188 @@
+import json
+import sqlite3
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr import logger
+
+
+class FeatureStore:
+    """
+    Local SQLite store of transformed feature vectors keyed by `job_link`.
+
+    Each posting is stored as one row holding its train/test split and its
+    numeric features packed as a float32 blob. `job_link` is the primary key,
+    so point lookups go through the table's key index instead of scanning the
+    transformed CSVs. Recently read vectors are kept in an in-process LRU cache.
+
+    Attributes:
+    - db_path (str): Path of the SQLite database.
+    - cache_size (int): Maximum number of vectors kept in the LRU cache.
+    - feature_columns (list): Names of the stored features, in vector order.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    BATCH_SIZE = 900
+
+    def __init__(self, db_path, cache_size=4096):
+        """
+        Opens (and if needed creates) the feature store.
+
+        Args:
+        - db_path (str): Path of the SQLite database.
+        - cache_size (int): Maximum number of vectors kept in the LRU cache.
+        """
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS features (job_link TEXT PRIMARY KEY, split TEXT, vector BLOB) WITHOUT ROWID")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'feature_columns'").fetchone()
+        self.feature_columns = json.loads(row[0]) if row else []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Closes the database connection."""
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+
+    def clear(self):
+        """Removes every stored vector and the feature column list."""
+        with self.connection:
+            self.connection.execute("DELETE FROM features")
+            self.connection.execute("DELETE FROM meta")
+        self.feature_columns = []
+        self._cache.clear()
+
+    def write(self, df, is_test=None):
+        """
+        Bulk-writes the numeric columns of `df`, replacing existing vectors of the same postings.
+
+        Args:
+        - df (pd.DataFrame): Transformed postings, including 'job_link'.
+        - is_test (array-like, optional): Boolean mask, True for test set rows.
+        """
+        columns = df.select_dtypes(include='number').columns.tolist()
+        if not self.feature_columns:
+            with self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('feature_columns', ?)",
+                                        (json.dumps(columns),))
+            self.feature_columns = columns
+        elif columns != self.feature_columns:
+            raise ValueError("Feature columns differ from the ones already in the store; clear it first")
+
+        vectors = np.ascontiguousarray(df[columns].to_numpy(dtype=np.float32))
+        splits = (np.where(np.asarray(is_test, dtype=bool), 'test', 'train') if is_test is not None
+                  else np.full(len(df), None))
+        links = df['job_link'].tolist()
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO features VALUES (?, ?, ?)",
+                zip(links, splits.tolist(), (vector.tobytes() for vector in vectors)))
+
+        for link in links:
+            self._cache.pop(link, None)
+        logger.info(f"Wrote {len(links)} feature vectors to {self.db_path}")
+
+    def delete(self, job_links):
+        """
+        Removes the vectors of the given postings.
+
+        Args:
+        - job_links (list): Postings to remove.
+        """
+        job_links = list(job_links)
+        with self.connection:
+            self.connection.executemany("DELETE FROM features WHERE job_link = ?", ((link,) for link in job_links))
+        for link in job_links:
+            self._cache.pop(link, None)
+
+    def _remember(self, link, vector):
+        self._cache[link] = vector
+        self._cache.move_to_end(link)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get(self, job_link):
+        """
+        Looks up the feature vector of a single posting.
+
+        Args:
+        - job_link (str): Posting to look up.
+
+        Returns:
+        - np.ndarray or None: The float32 vector, or None if the posting is not stored.
+        """
+        if job_link in self._cache:
+            self._cache.move_to_end(job_link)
+            return self._cache[job_link]
+
+        row = self.connection.execute("SELECT vector FROM features WHERE job_link = ?", (job_link,)).fetchone()
+        if row is None:
+            return None
+        vector = np.frombuffer(row[0], dtype=np.float32)
+        self._remember(job_link, vector)
+        return vector
+
+    def get_many(self, job_links):
+        """
+        Looks up the feature vectors of several postings in batched queries.
+
+        Args:
+        - job_links (list): Postings to look up.
+
+        Returns:
+        - pd.DataFrame: One row per found posting, indexed by job_link, in request order.
+        """
+        job_links = list(job_links)
+        found = {}
+        for link in job_links:
+            if link in self._cache:
+                self._cache.move_to_end(link)
+                found[link] = self._cache[link]
+        missing = [link for link in dict.fromkeys(job_links) if link not in found]
+
+        for start in range(0, len(missing), self.BATCH_SIZE):
+            batch = missing[start:start + self.BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            query = f"SELECT job_link, vector FROM features WHERE job_link IN ({placeholders})"
+            for link, blob in self.connection.execute(query, batch):
+                vector = np.frombuffer(blob, dtype=np.float32)
+                found[link] = vector
+                self._remember(link, vector)
+
+        links = [link for link in job_links if link in found]
+        vectors = np.vstack([found[link] for link in links]) if links else np.empty((0, len(self.feature_columns)))
+        return pd.DataFrame(vectors, columns=self.feature_columns, index=pd.Index(links, name='job_link'))
+
+    def get_split(self, split):
+        """
+        Reads every vector of the 'train' or 'test' split.
+
+        Args:
+        - split (str): 'train' or 'test'.
+
+        Returns:
+        - pd.DataFrame: Feature vectors indexed by job_link.
+        """
+        rows = self.connection.execute("SELECT job_link, vector FROM features WHERE split = ?", (split,)).fetchall()
+        vectors = (np.frombuffer(b"".join(blob for _, blob in rows), dtype=np.float32)
+                   .reshape(len(rows), len(self.feature_columns)))
+        return pd.DataFrame(vectors, columns=self.feature_columns,
+                            index=pd.Index([link for link, _ in rows], name='job_link'))
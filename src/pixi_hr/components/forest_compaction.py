@@ -0,0 +1,107 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr import logger
+from pixi_hr.entity.config_entity import ForestCompactionConfig
+from pixi_hr.components.compact_forest import CompactForest
+from pixi_hr.components.model_trainer import ModelTrainer
+from pixi_hr.components.model_evaluation import ModelEvaluation
+from pixi_hr.utils.common import load_bin, save_bin, save_json, model_nbytes, get_size
+
+
+class ForestCompaction:
+    """
+    Compacts the trained RandomForest into a CompactForest for serving.
+
+    Optionally keeps only the `top_k_trees` trees with the lowest out-of-bag
+    error, then quantizes and deduplicates them (see CompactForest). Both
+    models are scored on the test set with ModelEvaluation.eval_metrics and
+    timed, and the accuracy, size and latency of each are written to a report.
+
+    Attributes:
+    - config (ForestCompactionConfig): Forest compaction configuration.
+    """
+
+    def __init__(self, config: ForestCompactionConfig):
+        """
+        Initializes the ForestCompaction component.
+
+        Args:
+        - config (ForestCompactionConfig): Forest compaction configuration.
+        """
+        self.config = config
+
+    def _features(self, data_path, text_features_path):
+        """Model features and target of a transformed dataset, as ModelTrainer builds them."""
+        data = pd.read_csv(data_path)
+        x = data[[col for col in data.columns if col.startswith('qual_')]]
+        if text_features_path:
+            x = ModelTrainer.stack_text_features(x, text_features_path)
+        return x, data[self.config.target_column].to_numpy()
+
+    @staticmethod
+    def _timed_predict(model, x, repeat=3):
+        """Predictions of `model` and the best of `repeat` latencies in milliseconds."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            predictions = model.predict(x)
+            timings.append(time.perf_counter() - start)
+        return predictions, min(timings) * 1000
+
+    @staticmethod
+    def _timed_load(path):
+        """The model at `path`, memory-mapped when possible, and its load time in milliseconds."""
+        start = time.perf_counter()
+        model = load_bin(Path(path), mmap_mode='r')
+        return model, (time.perf_counter() - start) * 1000
+
+    def main(self):
+        """Compacts the model, saves it and writes the comparison report. Models other than forests are skipped."""
+        model, model_load_ms = self._timed_load(self.config.model_path)
+        if not hasattr(model, 'estimators_'):
+            logger.info(f"Skipping forest compaction: {type(model).__name__} is not a tree ensemble.")
+            return
+        original_nodes = sum(estimator.tree_.node_count for estimator in model.estimators_)
+
+        trees = None
+        if self.config.top_k_trees and self.config.top_k_trees < len(model.estimators_):
+            train_x, train_y = self._features(self.config.train_data_path, self.config.train_text_features_path)
+            errors = CompactForest.oob_tree_errors(model, train_x, train_y)
+            trees = np.sort(np.argsort(errors, kind='stable')[:self.config.top_k_trees]).tolist()
+            logger.info(f"Keeping the {len(trees)} of {len(model.estimators_)} trees with the lowest OOB error")
+
+        start = time.perf_counter()
+        compact = CompactForest.from_forest(model, trees=trees, threshold_dtype=self.config.threshold_dtype,
+                                            value_dtype=self.config.value_dtype)
+        logger.info(f"Compacted {original_nodes} nodes into {compact.n_nodes} in {time.perf_counter() - start:.1f}s")
+
+        # Uncompressed, so that serving processes memory-map the arrays
+        save_bin(compact, Path(self.config.compact_model_path))
+        compact, compact_load_ms = self._timed_load(self.config.compact_model_path)
+
+        test_x, test_y = self._features(self.config.test_data_path, self.config.test_text_features_path)
+        report = {'threshold_dtype': self.config.threshold_dtype, 'value_dtype': self.config.value_dtype,
+                  'top_k_trees': self.config.top_k_trees}
+        for name, forest, trees_count, nodes, nbytes, path, load_ms in (
+                ('original', model, len(model.estimators_), original_nodes, model_nbytes(model),
+                 self.config.model_path, model_load_ms),
+                ('compact', compact, int(compact.weights.sum()), compact.n_nodes, compact.nbytes,
+                 self.config.compact_model_path, compact_load_ms)):
+            predictions, latency_ms = self._timed_predict(forest, test_x)
+            rmse, mae, r2 = ModelEvaluation.eval_metrics(test_y, predictions)
+            report[name] = {'rmse': rmse, 'mae': mae, 'r2': r2, 'trees': trees_count, 'nodes': int(nodes),
+                            'array_mb': round(nbytes / 1024 / 1024, 3), 'file_size': get_size(Path(path)),
+                            'load_ms': round(load_ms, 2), 'predict_ms': round(latency_ms, 2)}
+
+        original, compacted = report['original'], report['compact']
+        report['delta'] = {metric: compacted[metric] - original[metric] for metric in ('rmse', 'mae', 'r2')}
+        report['size_ratio'] = round(original['array_mb'] / max(compacted['array_mb'], 1e-9), 2)
+        report['predict_speedup'] = round(original['predict_ms'] / max(compacted['predict_ms'], 1e-9), 2)
+
+        save_json(path=Path(self.config.report_file), data=report)
+        logger.info(f"Compact model: {report['size_ratio']}x smaller arrays, {report['predict_speedup']}x "
+                    f"prediction speed, RMSE {original['rmse']:.4f} -> {compacted['rmse']:.4f}")
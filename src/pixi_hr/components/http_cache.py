@@ -0,0 +1,175 @@
+import csv
+import os
+import sqlite3
+import time
+import zlib
+
+from pixi_hr import logger
+
+
+class HttpCache:
+    """
+    Disk-backed HTTP response cache for the ingestion fetchers.
+
+    Stores compressed response bodies together with their ETag and
+    Last-Modified validators in SQLite. Cached entries are revalidated with a
+    conditional GET; a 304 response means the cached body can be reused.
+
+    Attributes:
+    - db_path (str): Path of the SQLite database.
+    """
+
+    def __init__(self, db_path, check_same_thread=True):
+        """
+        Opens (and if needed creates) the cache.
+
+        Args:
+        - db_path (str): Path of the SQLite database.
+        - check_same_thread (bool): False lets another thread than the creating one use the
+          connection; the caller must then keep the calls from running concurrently.
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, fetched_at REAL) WITHOUT ROWID")
+
+    def close(self):
+        """Closes the database connection."""
+        self.connection.commit()
+        self.connection.close()
+
+    def get(self, url):
+        """
+        Looks up a cached response.
+
+        Args:
+        - url (str): Requested URL.
+
+        Returns:
+        - dict or None: 'etag', 'last_modified' and 'body' of the cached response.
+        """
+        row = self.connection.execute(
+            "SELECT etag, last_modified, body FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'body': zlib.decompress(row[2]).decode('utf-8')}
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Builds the revalidation headers for a cached response.
+
+        Args:
+        - entry (dict or None): Cached response returned by `get`.
+
+        Returns:
+        - dict: If-None-Match / If-Modified-Since headers, empty without validators.
+        """
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, body, etag=None, last_modified=None):
+        """
+        Caches a response body. Responses without validators are not cached.
+
+        Args:
+        - url (str): Requested URL.
+        - body (str): Response body.
+        - etag (str, optional): ETag response header.
+        - last_modified (str, optional): Last-Modified response header.
+        """
+        if not etag and not last_modified:
+            return
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, zlib.compress(body.encode('utf-8')), time.time()))
+
+
+class JobLinkIndex:
+    """
+    Persistent index of the job links that have already been scraped.
+
+    Membership checks go through the primary key of a SQLite table, so they
+    stay fast as the corpus grows and survive between runs.
+
+    Attributes:
+    - db_path (str): Path of the SQLite database.
+    """
+
+    def __init__(self, db_path, check_same_thread=True):
+        """
+        Opens (and if needed creates) the index.
+
+        Args:
+        - db_path (str): Path of the SQLite database.
+        - check_same_thread (bool): False lets another thread than the creating one use the
+          connection; the caller must then keep the calls from running concurrently.
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS job_links (job_link TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def close(self):
+        """Closes the database connection."""
+        self.connection.commit()
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM job_links").fetchone()[0]
+
+    def __contains__(self, job_link):
+        return self.connection.execute(
+            "SELECT 1 FROM job_links WHERE job_link = ?", (job_link,)).fetchone() is not None
+
+    def add_many(self, job_links):
+        """
+        Adds job links to the index.
+
+        Args:
+        - job_links (iterable): Links to add; links already present are ignored.
+        """
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO job_links VALUES (?)",
+                                        ((link,) for link in job_links))
+
+    def missing(self, job_links):
+        """
+        Finds the job links that are not in the index.
+
+        Args:
+        - job_links (iterable): Links to look up.
+
+        Returns:
+        - list: The links that are not in the index, in the given order.
+        """
+        return [link for link in job_links if link not in self]
+
+    def add(self, job_link):
+        """Adds a single job link to the index."""
+        self.add_many([job_link])
+
+    def seed_from_csv(self, csv_path):
+        """
+        Fills an empty index from the 'job_link' column of an existing CSV.
+
+        Args:
+        - csv_path (str): CSV with a 'job_link' column.
+        """
+        if len(self) or not os.path.exists(csv_path):
+            return
+
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            self.add_many(row['job_link'] for row in csv.DictReader(f))
+        logger.info(f"Seeded job link index with {len(self)} links from {csv_path}")
@@ -1,14 +1,14 @@
 import os
+import time
 import pandas as pd
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from urllib.parse import urlparse
-import mlflow
-import mlflow.sklearn
 import numpy as np
-import joblib
 from pathlib import Path
 
-from pixi_hr.utils.common import save_json
+from pixi_hr import logger
+from pixi_hr.utils.common import save_json, load_json, load_bin
+from pixi_hr.components.model_trainer import ModelTrainer
 from pixi_hr.config.configuration import ModelEvaluationConfig
 
 
@@ -27,7 +27,8 @@ class ModelEvaluation:
         """
         self.config = config
 
-    def eval_metrics(self, actual, predicted):
+    @staticmethod
+    def eval_metrics(actual, predicted):
         """
         Computes evaluation metrics for the model's predictions.
 
@@ -45,10 +46,10 @@ class ModelEvaluation:
     
     def load_data(self):
         """
-        Load the test data and the trained model.
+        Load the test data and the trained model (memory-mapped when saved uncompressed).
         """
         self.test_data = pd.read_csv(self.config.test_data_path)
-        self.model = joblib.load(self.config.model_path)
+        self.model = load_bin(Path(self.config.model_path), mmap_mode='r')
 
     def preprocess_data(self):
         """
@@ -61,29 +62,109 @@ class ModelEvaluation:
         self.test_x = self.test_data[qualification_columns]
         self.test_y = self.test_data[self.config.target_column]
 
+        # Stack the hashed text features the model was trained with
+        if self.config.test_text_features_path:
+            self.test_x = ModelTrainer.stack_text_features(self.test_x, self.config.test_text_features_path)
 
-    def log_into_mlflow(self):
+
+    def score(self):
         """
-        Logs model evaluation metrics and parameters into MLflow.
+        Computes the evaluation metrics, from the out-of-bag metrics saved by the
+        model trainer when `use_oob` is set, else by scoring the test split.
+
+        Returns:
+        - tuple: Metrics (dict of rmse, mae, r2), their source ('oob' or 'test'), and the seconds spent.
         """
+        start = time.perf_counter()
+        if self.config.use_oob and self.config.oob_metrics_file and os.path.exists(self.config.oob_metrics_file):
+            oob = load_json(Path(self.config.oob_metrics_file))
+            # The model is still logged to MLflow, but neither the test split nor a prediction is needed
+            self.model = load_bin(Path(self.config.model_path), mmap_mode='r')
+            scores = {metric: oob[metric] for metric in ("rmse", "mae", "r2")}
+            return scores, 'oob', time.perf_counter() - start
+
+        if self.config.use_oob:
+            logger.warning(f"No out-of-bag metrics at {self.config.oob_metrics_file}; scoring the test split")
         self.load_data()
         self.preprocess_data()
+        rmse, mae, r2 = self.eval_metrics(self.test_y, self.model.predict(self.test_x))
+        return {"rmse": rmse, "mae": mae, "r2": r2}, 'test', time.perf_counter() - start
+
+    def compare_with_oob(self, scores, source, seconds):
+        """
+        Writes the out-of-bag against held-out comparison, and the scoring time saved by out-of-bag metrics.
+
+        Held-out metrics and scoring time are carried over from the last run that
+        scored the test split, so a run using out-of-bag metrics is compared with it.
+
+        Args:
+        - scores (dict): Metrics of this run.
+        - source (str): 'oob' or 'test'.
+        - seconds (float): Time spent computing the metrics.
+
+        Returns:
+        - dict: The report, or None without out-of-bag metrics.
+        """
+        if not (self.config.oob_report_file and self.config.oob_metrics_file
+                and os.path.exists(self.config.oob_metrics_file)):
+            return None
+
+        previous = load_json(Path(self.config.oob_report_file)) if os.path.exists(self.config.oob_report_file) else {}
+        if source == 'test':
+            oob = {metric: value for metric, value in load_json(Path(self.config.oob_metrics_file)).items()
+                   if metric in scores}
+            held_out, held_out_seconds = scores, seconds
+        else:
+            oob = scores
+            held_out, held_out_seconds = previous.get('held_out'), previous.get('held_out_scoring_seconds')
+
+        report = {
+            'source': source,
+            'scoring_seconds': round(seconds, 4),
+            'oob': {metric: float(value) for metric, value in oob.items()},
+            'held_out': {metric: float(value) for metric, value in held_out.items()} if held_out else None,
+            'held_out_from_previous_run': source == 'oob' and bool(held_out),
+            'held_out_scoring_seconds': round(held_out_seconds, 4) if held_out_seconds is not None else None,
+            'time_saved_seconds': (round(held_out_seconds - seconds, 4)
+                                   if source == 'oob' and held_out_seconds is not None else None),
+            'oob_minus_held_out': ({metric: float(oob[metric] - held_out[metric]) for metric in oob}
+                                   if held_out else None),
+        }
+        save_json(path=Path(self.config.oob_report_file), data=report)
+        if report['oob_minus_held_out']:
+            logger.info("Out-of-bag minus held-out: " + ", ".join(
+                f"{metric} {value:+.4g}" for metric, value in report['oob_minus_held_out'].items())
+                + (f"; {report['time_saved_seconds']:.3f}s of test scoring saved"
+                   if report['time_saved_seconds'] is not None else ""))
+        return report
+
+    def log_into_mlflow(self):
+        """
+        Logs model evaluation metrics and parameters into MLflow.
+        """
+        # Imported here: mlflow is slow to import and only this method needs it
+        import mlflow
+        import mlflow.sklearn
+
+        scores, source, seconds = self.score()
+        self.compare_with_oob(scores, source, seconds)
+        rmse, mae, r2 = scores["rmse"], scores["mae"], scores["r2"]
 
         # Set MLflow registry URI
         mlflow.set_registry_uri(self.config.mlflow_uri)
         tracking_url_type_score = urlparse(mlflow.get_tracking_uri()).scheme
 
         with mlflow.start_run():
-            predicted_qualities = self.model.predict(self.test_x)
-
-            (rmse, mae, r2) = self.eval_metrics(self.test_y, predicted_qualities)
-            scores = {"rmse": rmse, "mae": mae, "r2": r2}
-
-            # Save evaluation metrics to JSON file using the utility function
-            save_json(path=Path(self.config.metric_file_name), data=scores)
+            # Save evaluation metrics to JSON file using the utility function. Out-of-bag metrics go to
+            # their own file, so metric_file_name keeps the held-out metrics of the last test scoring.
+            if source == 'test':
+                save_json(path=Path(self.config.metric_file_name), data=scores)
+            elif self.config.oob_metric_file_name:
+                save_json(path=Path(self.config.oob_metric_file_name), data=scores)
 
             # Log parameters and metrics into MLflow
             mlflow.log_params(self.config.all_params)
+            mlflow.set_tag("metrics_source", source)
             mlflow.log_metric("rmse", rmse)
             mlflow.log_metric("mae", mae)
             mlflow.log_metric("r2", r2)
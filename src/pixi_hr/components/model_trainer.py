@@ -1,9 +1,12 @@
 from sklearn.linear_model import ElasticNet
 from sklearn.preprocessing import StandardScaler
-import joblib
 import pandas as pd
-import os
+import numpy as np
+import time
+from pathlib import Path
+from scipy import sparse
 from pixi_hr import logger
+from pixi_hr.utils.common import save_bin, save_json, model_nbytes, get_size
 from sklearn.ensemble import RandomForestRegressor
 
 
@@ -20,7 +23,9 @@ class ModelTrainer:
         load_data: Load the training and testing datasets.
         preprocess_data: Preprocesses the data by dropping specific columns and splitting into features and target.
         scale_features: Scales the features using StandardScaler.
+        build_model: Initializes the configured model.
         train_model: Trains the model using the training data.
+        save_oob_metrics: Saves the out-of-bag metrics of a RandomForest trained with oob_score.
         save_model: Saves the trained model to a specified directory.
         main: Orchestrates the model training process.
     """
@@ -59,6 +64,43 @@ class ModelTrainer:
         self.test_x = self.test_data[qualification_columns]
         self.test_y = self.test_data[self.config.target_column]
 
+        # Stack the hashed text features next to the qualification columns
+        if self.config.train_text_features_path:
+            self.train_x = self.stack_text_features(self.train_x, self.config.train_text_features_path)
+            self.test_x = self.stack_text_features(self.test_x, self.config.test_text_features_path)
+
+    @staticmethod
+    def stack_text_features(qualifications, text_features_path):
+        """
+        Horizontally stack the qualification columns with a saved text feature matrix.
+
+        Args:
+            qualifications (pd.DataFrame): qual_* columns, row-aligned with the text features.
+            text_features_path (Path): .npz matrix saved by the data transformation stage.
+
+        Returns:
+            scipy.sparse.csr_matrix: Qualification columns followed by the text features.
+        """
+        text_features = sparse.load_npz(text_features_path)
+        if text_features.shape[0] != len(qualifications):
+            raise ValueError(f"{text_features_path} has {text_features.shape[0]} rows, expected {len(qualifications)}")
+        return ModelTrainer.stack_features(qualifications, text_features)
+
+    @staticmethod
+    def stack_features(qualifications, text_features):
+        """
+        Horizontally stack the qualification columns with a text feature matrix, in the model's feature order.
+
+        Args:
+            qualifications (pd.DataFrame): qual_* columns.
+            text_features (scipy.sparse.spmatrix): Text features of the same rows.
+
+        Returns:
+            scipy.sparse.csr_matrix: Qualification columns followed by the text features.
+        """
+        return sparse.hstack([sparse.csr_matrix(qualifications.to_numpy(dtype=np.float32)), text_features],
+                             format='csr')
+
 
     def scale_features(self):
         """Scale the features using StandardScaler."""
@@ -66,29 +108,98 @@ class ModelTrainer:
         self.train_x = scaler.fit_transform(self.train_x)
         self.test_x = scaler.transform(self.test_x)
 
+    def build_model(self):
+        """
+        Initialize the model configured by model_type and model_params.
+
+        Returns:
+            model (model instance): Unfitted machine learning model.
+        """
+        if self.config.model_type == "ElasticNet":
+            return ElasticNet(
+                alpha=self.config.model_params["alpha"], 
+                l1_ratio=self.config.model_params["l1_ratio"], 
+                random_state=44
+            )
+        elif self.config.model_type == "RandomForest":
+            return RandomForestRegressor(
+                n_estimators=self.config.model_params["n_estimators"],
+                max_depth=self.config.model_params["max_depth"],
+                min_samples_split=self.config.model_params["min_samples_split"],
+                min_samples_leaf=self.config.model_params["min_samples_leaf"],
+                max_features=self.config.model_params["max_features"],
+                random_state=self.config.model_params["random_state"],
+                oob_score=self.config.oob_metrics_file is not None
+            )
+        else:
+            raise ValueError(f"Unsupported model type: {self.config.model_type}")
+
     def train_model(self, model):
         """
         Train the model using the training data.
 
+        When out-of-bag metrics are configured, the RandomForest scores every
+        training row with the trees that did not sample it, and the metrics
+        are saved next to the model.
+
         Args:
             model (model instance): Machine learning model to be trained.
         
         Returns:
             model (model instance): Trained machine learning model.
         """
+        start = time.perf_counter()
         model.fit(self.train_x, self.train_y)
+        if getattr(model, 'oob_score', False):
+            self.save_oob_metrics(model, fit_seconds=time.perf_counter() - start)
         return model
 
+    def save_oob_metrics(self, model, fit_seconds=None):
+        """
+        Save the out-of-bag RMSE, MAE and R2 of a RandomForest fitted with oob_score.
+
+        The metrics are computed from the forest's oob_prediction_ over every
+        training row, as scikit-learn computes oob_score_ (the saved R2 equals
+        it). Rows that every tree sampled get a prediction of 0, and
+        scikit-learn warns when there are any.
+
+        Args:
+            model (RandomForestRegressor): Forest fitted with oob_score=True.
+            fit_seconds (float): Training time, out-of-bag scoring included.
+
+        Returns:
+            dict: The saved metrics.
+        """
+        # Imported here: model_evaluation imports this module
+        from pixi_hr.components.model_evaluation import ModelEvaluation
+
+        predictions = np.asarray(model.oob_prediction_).reshape(len(self.train_y), -1)[:, 0]
+        rmse, mae, r2 = ModelEvaluation.eval_metrics(self.train_y, predictions)
+        metrics = {"rmse": float(rmse), "mae": float(mae), "r2": float(r2), "train_rows": len(self.train_y),
+                   "fit_seconds": round(fit_seconds, 4) if fit_seconds is not None else None}
+        save_json(path=Path(self.config.oob_metrics_file), data=metrics)
+        logger.info(f"Out-of-bag metrics on {metrics['train_rows']} training rows: "
+                    f"rmse {rmse:.4g}, mae {mae:.4g}, r2 {r2:.4g}")
+        return metrics
+
     def save_model(self, model):
         """
         Save the trained model to a specified directory.
 
+        Models whose tree arrays reach `mmap_threshold_mb` are stored uncompressed, so that
+        loaders can memory-map them instead of decompressing them into each process;
+        smaller models are compressed with `compress_level` (0 disables compression).
+
         Args:
             model (model instance): Trained machine learning model to save.
         """
+        model_path = Path(self.config.root_dir, self.config.model_name)
+        nbytes = model_nbytes(model)
+        compress = self.config.compress_level if nbytes < self.config.mmap_threshold_mb * 1024 * 1024 else 0
         try:
-            joblib.dump(model, os.path.join(self.config.root_dir, self.config.model_name))
-            logger.info(f"Model saved successfully at {os.path.join(self.config.root_dir, self.config.model_name)}")
+            save_bin(model, model_path, compress=compress)
+            logger.info(f"Model saved successfully at {model_path} "
+                        f"({nbytes / 1024 / 1024:.1f} MB of tree arrays, {get_size(model_path)} on disk)")
         except Exception as e:
             logger.error(f"Error saving the model: {e}")
             raise e
@@ -103,25 +214,7 @@ class ModelTrainer:
         logger.info("Preprocessing data...")
         self.preprocess_data()
 
-        # Depending on the model type from the configuration, initialize the appropriate model
-        if self.config.model_type == "ElasticNet":
-            model = ElasticNet(
-                alpha=self.config.model_params["alpha"], 
-                l1_ratio=self.config.model_params["l1_ratio"], 
-                random_state=44
-            )
-        elif self.config.model_type == "RandomForest":
-            model = RandomForestRegressor(
-                n_estimators=self.config.model_params["n_estimators"],
-                max_depth=self.config.model_params["max_depth"],
-                min_samples_split=self.config.model_params["min_samples_split"],
-                min_samples_leaf=self.config.model_params["min_samples_leaf"],
-                max_features=self.config.model_params["max_features"],
-                random_state=self.config.model_params["random_state"]
-            )
-        else:
-            raise ValueError(f"Unsupported model type: {self.config.model_type}")
-        
+        model = self.build_model()
         trained_model = self.train_model(model)
         
         logger.info("Saving the trained model...")
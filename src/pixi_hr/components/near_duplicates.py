@@ -0,0 +1,218 @@
+import re
+import zlib
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from pixi_hr import logger
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+
+
+class NearDuplicateDetector:
+    """
+    Finds near-duplicate postings with MinHash signatures and LSH banding.
+
+    Each text is split into word shingles of `shingle_size` words. MinHash
+    signatures of `num_perm` values are computed with vectorized
+    multiply-shift hashing, then split into `bands` bands; postings that share
+    any band become candidates. Candidates are linked when their estimated
+    Jaccard similarity reaches `threshold`, and linked postings form clusters.
+
+    Within a bucket each member is only compared with the bucket's first
+    member, so candidate generation stays linear in the number of postings
+    even for large buckets.
+
+    Attributes:
+    - shingle_size (int): Number of words per shingle.
+    - num_perm (int): Length of the MinHash signatures.
+    - bands (int): Number of LSH bands; must divide num_perm.
+    - threshold (float): Minimum estimated Jaccard similarity of near duplicates.
+    """
+
+    # Upper bound on shingles x permutations hashed in one vectorized step
+    MAX_BLOCK_ELEMENTS = 8_000_000
+
+    def __init__(self, shingle_size=3, num_perm=128, bands=32, threshold=0.8, seed=44, chunk_size=10_000):
+        """
+        Initializes the NearDuplicateDetector.
+
+        Args:
+        - shingle_size (int): Number of words per shingle.
+        - num_perm (int): Length of the MinHash signatures.
+        - bands (int): Number of LSH bands; must divide num_perm.
+        - threshold (float): Minimum estimated Jaccard similarity of near duplicates.
+        - seed (int): Seed of the hash functions.
+        - chunk_size (int): Number of postings hashed per vectorized chunk.
+        """
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+
+        rng = np.random.default_rng(seed)
+        # Odd multipliers make multiply-shift a universal hash family
+        self._a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self._word_hashes = {}
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Builds a detector from the `near_duplicates` section of the data validation config.
+
+        Args:
+        - params (dict): Detector parameters.
+
+        Returns:
+        - NearDuplicateDetector: The detector.
+        """
+        return cls(shingle_size=params.get('shingle_size', 3),
+                   num_perm=params.get('num_perm', 128),
+                   bands=params.get('bands', 32),
+                   threshold=params.get('threshold', 0.8))
+
+    def _word_hash(self, word):
+        """Stable uint32 hash of a word, cached across chunks."""
+        value = self._word_hashes.get(word)
+        if value is None:
+            value = self._word_hashes[word] = zlib.crc32(word.encode("utf-8"))
+        return value
+
+    def _shingles(self, texts):
+        """
+        Hashes the word shingles of a batch of texts.
+
+        Works on the flattened tokens of the whole batch: every distinct word
+        is hashed once, and shingles are combined from consecutive word hashes
+        with vectorized arithmetic. Texts shorter than `shingle_size` words
+        form a single shingle. Repeated shingles within a text are kept, since
+        they do not change its MinHash.
+
+        Args:
+        - texts (list): Text of each posting.
+
+        Returns:
+        - tuple: (uint64 shingle hashes of all texts, number of shingles per text)
+        """
+        token_lists = [_TOKEN_PATTERN.findall(text.lower()) if isinstance(text, str) else [] for text in texts]
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.uint64), np.zeros(len(texts), dtype=np.int64)
+
+        tokens = np.fromiter(chain.from_iterable(token_lists), dtype=object, count=total)
+        codes, words = pd.factorize(tokens)
+        hashes = np.fromiter((self._word_hash(word) for word in words), dtype=np.uint64, count=len(words))[codes]
+
+        doc_length = np.repeat(lengths, lengths)
+        position = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        span = np.minimum(self.shingle_size, doc_length)
+
+        shingles = np.zeros(total, dtype=np.uint64)
+        for offset in range(self.shingle_size):
+            following = hashes[np.minimum(np.arange(offset, total + offset), total - 1)]
+            shingles = np.where(offset < span, shingles * np.uint64(1_000_003) + following, shingles)
+
+        valid = position <= doc_length - span
+        counts = np.where(lengths > 0, lengths - np.minimum(self.shingle_size, lengths) + 1, 0)
+        return shingles[valid] & np.uint64(0xFFFFFFFF), counts
+
+    def signatures(self, texts):
+        """
+        Computes MinHash signatures.
+
+        Args:
+        - texts (list): Text of each posting.
+
+        Returns:
+        - np.ndarray: uint32 array of shape (len(texts), num_perm). Postings
+          without any words get a signature of all maxima.
+        """
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+
+        for start in range(0, len(texts), self.chunk_size):
+            shingles, counts = self._shingles(texts[start:start + self.chunk_size])
+            chunk = np.full((len(counts), self.num_perm), _MAX_HASH, dtype=np.uint32)
+
+            non_empty = counts > 0
+            if non_empty.any():
+                offsets = (np.cumsum(counts) - counts)[non_empty]
+                # Hash every shingle under a block of permutations at once, keeping the block within ~64 MB
+                block = max(1, min(self.num_perm, self.MAX_BLOCK_ELEMENTS // len(shingles)))
+                buffer = np.empty((len(shingles), block), dtype=np.uint64)
+                for first in range(0, self.num_perm, block):
+                    a, b = self._a[first:first + block], self._b[first:first + block]
+                    hashed = buffer[:, :len(a)]
+                    # (a * x + b) mod 2**64, keeping the high 32 bits, computed in place
+                    np.multiply(shingles[:, None], a, out=hashed)
+                    hashed += b
+                    hashed >>= np.uint64(32)
+                    chunk[non_empty, first:first + len(a)] = np.minimum.reduceat(hashed, offsets, axis=0)
+
+            signatures[start:start + len(counts)] = chunk
+
+        return signatures
+
+    def candidate_pairs(self, signatures):
+        """
+        Generates candidate pairs with LSH banding.
+
+        Args:
+        - signatures (np.ndarray): MinHash signatures.
+
+        Returns:
+        - np.ndarray: int64 array of shape (n_pairs, 2), each pair (representative, member).
+        """
+        rows_per_band = self.num_perm // self.bands
+        pairs = []
+        for band in range(self.bands):
+            band_values = np.ascontiguousarray(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+            keys = band_values.view(np.dtype((np.void, band_values.dtype.itemsize * rows_per_band))).ravel()
+
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            starts = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+            representative = order[np.flatnonzero(starts)[np.cumsum(starts) - 1]]
+
+            is_member = ~starts
+            pairs.append(np.column_stack((representative[is_member], order[is_member])))
+
+        return np.unique(np.concatenate(pairs), axis=0) if pairs else np.empty((0, 2), dtype=np.int64)
+
+    def find_clusters(self, texts):
+        """
+        Clusters near-duplicate postings.
+
+        Args:
+        - texts (list): Text of each posting.
+
+        Returns:
+        - tuple: (cluster label per posting, estimated similarity of each linked pair as an (n, 3) array)
+        """
+        signatures = self.signatures(texts)
+        pairs = self.candidate_pairs(signatures)
+
+        # Postings without text share the all-maxima signature but are not duplicates of each other
+        has_text = signatures[:, 0] != _MAX_HASH
+        pairs = pairs[has_text[pairs[:, 0]] & has_text[pairs[:, 1]]]
+
+        similarity = np.empty(len(pairs))
+        for start in range(0, len(pairs), self.chunk_size):
+            batch = pairs[start:start + self.chunk_size]
+            similarity[start:start + len(batch)] = (signatures[batch[:, 0]] == signatures[batch[:, 1]]).mean(axis=1)
+
+        linked = pairs[similarity >= self.threshold]
+        logger.info(f"{len(pairs)} LSH candidate pairs, {len(linked)} above similarity {self.threshold}.")
+
+        graph = coo_matrix((np.ones(len(linked)), (linked[:, 0], linked[:, 1])), shape=(len(texts), len(texts)))
+        _, labels = connected_components(graph, directed=False)
+        return labels, np.column_stack((linked, similarity[similarity >= self.threshold]))
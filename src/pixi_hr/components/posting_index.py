@@ -0,0 +1,254 @@
+import numpy as np
+import pandas as pd
+
+from pixi_hr import logger
+from pixi_hr.components.qualification_vocabulary import QualificationVocabulary
+
+
+class PostingIndex:
+    """
+    Inverted index from skills, locations and job types to postings.
+
+    Every posting gets an integer ID (its position in `job_links`). For each
+    `qual_*` column, location and job type the index keeps the sorted array of
+    IDs of the postings that have it, stored back to back with an offsets
+    array like a CSR matrix. Keys held by at least 1 / DENSE_RATIO of the
+    postings also get a packed bitmap, which is smaller than their ID array.
+
+    Queries start from their most selective clause: when it is sparse, its
+    IDs are filtered by binary search in the other clauses' arrays or by bit
+    tests in their bitmaps; when every clause is dense, the query is evaluated
+    with bitwise AND / OR / AND NOT over the bitmaps. Either way "skills X and
+    Y in location Z" never scans the `qual_*` columns.
+
+    Skill lookups go through the same cleaning and vocabulary as the
+    transformation stage. With a hashing vocabulary a skill resolves to its
+    bucket, so results may include postings with a colliding skill.
+
+    Attributes:
+    - job_links (np.ndarray): job_link of each posting ID.
+    - skill_buckets (int): Number of hash buckets of a hashing vocabulary, 0 for one-hot.
+    """
+
+    FIELDS = ("skill", "job_location", "job_type")
+    ARRAY_NAMES = ("keys", "offsets", "postings", "bitmap_rows", "bitmaps")
+
+    # Keys held by at least len(index) / DENSE_RATIO postings get a bitmap
+    DENSE_RATIO = 32
+
+    def __init__(self, job_links, fields, skill_buckets=0):
+        """
+        Initializes the PostingIndex. Use `build` or `load` to create one.
+
+        Args:
+        - job_links (np.ndarray): job_link of each posting ID.
+        - fields (dict): Field name to (keys, offsets, postings, bitmap_rows, bitmaps) arrays.
+        - skill_buckets (int): Number of hash buckets of a hashing vocabulary, 0 for one-hot.
+        """
+        self.job_links = job_links
+        self.skill_buckets = int(skill_buckets)
+        self._fields = fields
+        self._positions = {field: {key: i for i, key in enumerate(arrays[0].tolist())}
+                           for field, arrays in fields.items()}
+
+    def __len__(self):
+        return len(self.job_links)
+
+    @classmethod
+    def _with_bitmaps(cls, keys, offsets, postings, n_postings):
+        """Adds the bitmap row of each key (-1 for sparse keys) and the packed bitmaps of the dense keys."""
+        counts = np.diff(offsets)
+        dense = np.flatnonzero(counts * cls.DENSE_RATIO >= n_postings)
+        bitmap_rows = np.full(len(keys), -1, dtype=np.int32)
+        bitmap_rows[dense] = np.arange(len(dense), dtype=np.int32)
+
+        bitmaps = np.zeros((len(dense), (n_postings + 7) // 8), dtype=np.uint8)
+        for row, position in enumerate(dense):
+            table = np.zeros(n_postings, dtype=bool)
+            table[postings[offsets[position]:offsets[position + 1]]] = True
+            bitmaps[row] = np.packbits(table)
+        return keys, offsets, postings, bitmap_rows, bitmaps
+
+    @classmethod
+    def _invert_columns(cls, matrix, keys):
+        """Builds the arrays of a field from a binary posting x key matrix."""
+        # nonzero over the transpose yields (key, posting) pairs sorted by key, then posting
+        key_ids, postings = np.nonzero(matrix.T)
+        offsets = np.searchsorted(key_ids, np.arange(len(keys) + 1)).astype(np.int64)
+        return cls._with_bitmaps(np.asarray(keys, dtype=str), offsets, postings.astype(np.int32), len(matrix))
+
+    @classmethod
+    def _invert_values(cls, values):
+        """Builds the arrays of a field from one categorical value per posting; missing values are skipped."""
+        codes, keys = pd.factorize(pd.Series(values, dtype=object), sort=True)
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(codes[order], minlength=len(keys))))).astype(np.int64)
+        return cls._with_bitmaps(np.asarray(keys, dtype=str), offsets, order.astype(np.int32), len(codes))
+
+    @classmethod
+    def build(cls, df, skill_buckets=0):
+        """
+        Builds the index from postings with their `qual_*` columns.
+
+        Args:
+        - df (pd.DataFrame): Postings with 'job_link', 'job_location', 'job_type'
+          (as category strings) and the `qual_*` columns.
+        - skill_buckets (int): Number of hash buckets of a hashing vocabulary, 0 for one-hot.
+
+        Returns:
+        - PostingIndex: The index.
+        """
+        qualification_columns = [col for col in df.columns if col.startswith(QualificationVocabulary.PREFIX)]
+        fields = {
+            'skill': cls._invert_columns(df[qualification_columns].to_numpy(dtype=np.uint8), qualification_columns),
+            'job_location': cls._invert_values(df['job_location']),
+            'job_type': cls._invert_values(df['job_type']),
+        }
+        return cls(df['job_link'].to_numpy(dtype=str), fields, skill_buckets)
+
+    def save(self, path):
+        """
+        Persists the index as a single .npz file.
+
+        Args:
+        - path (Path): Destination file.
+        """
+        arrays = {'job_links': self.job_links, 'skill_buckets': np.int64(self.skill_buckets)}
+        for field, field_arrays in self._fields.items():
+            for name, array in zip(self.ARRAY_NAMES, field_arrays):
+                arrays[f'{field}_{name}'] = array
+        np.savez(path, **arrays)
+        logger.info(f"Posting index of {len(self)} postings saved at {path}")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index saved with `save`.
+
+        Args:
+        - path (Path): Index file.
+
+        Returns:
+        - PostingIndex: The index.
+        """
+        with np.load(path) as arrays:
+            fields = {field: tuple(arrays[f'{field}_{name}'] for name in cls.ARRAY_NAMES) for field in cls.FIELDS}
+            return cls(arrays['job_links'], fields, int(arrays['skill_buckets']))
+
+    def _skill_key(self, skill):
+        """Cleans a skill the way the transformation stage does and returns its `qual_*` column."""
+        skill = QualificationVocabulary.clean_skill(skill)
+        if self.skill_buckets:
+            return QualificationVocabulary(mode="hashing", n_buckets=self.skill_buckets).column_name(skill)
+        return f"{QualificationVocabulary.PREFIX}{skill}"
+
+    def _position(self, field, key):
+        if field == 'skill':
+            key = self._skill_key(key)
+        return self._positions[field].get(key)
+
+    def postings(self, field, key):
+        """
+        Sorted IDs of the postings with a given key.
+
+        Args:
+        - field (str): 'skill', 'job_location' or 'job_type'.
+        - key (str): Skill, location or job type.
+
+        Returns:
+        - np.ndarray: Sorted int32 posting IDs, empty if the key is unknown.
+        """
+        position = self._position(field, key)
+        _, offsets, postings, _, _ = self._fields[field]
+        if position is None:
+            return postings[:0]
+        return postings[offsets[position]:offsets[position + 1]]
+
+    def _bitmap(self, field, key):
+        """Packed bitmap of the postings with a key, built on the fly for sparse keys."""
+        position = self._position(field, key)
+        _, _, _, bitmap_rows, bitmaps = self._fields[field]
+        if position is not None and bitmap_rows[position] >= 0:
+            return bitmaps[bitmap_rows[position]]
+        table = np.zeros(len(self), dtype=bool)
+        table[self.postings(field, key)] = True
+        return np.packbits(table)
+
+    def _contains(self, ids, field, key):
+        """Boolean mask of which sorted `ids` have a key, by bit test or binary search."""
+        position = self._position(field, key)
+        if position is None:
+            return np.zeros(len(ids), dtype=bool)
+        _, offsets, postings, bitmap_rows, bitmaps = self._fields[field]
+        if bitmap_rows[position] >= 0:
+            bitmap = bitmaps[bitmap_rows[position]]
+            return (bitmap[ids >> 3] >> (7 - (ids & 7)).astype(np.uint8)) & 1 == 1
+        key_postings = postings[offsets[position]:offsets[position + 1]]
+        if not len(key_postings):
+            return np.zeros(len(ids), dtype=bool)
+        found = np.minimum(np.searchsorted(key_postings, ids), len(key_postings) - 1)
+        return key_postings[found] == ids
+
+    def _count(self, field, key):
+        position = self._position(field, key)
+        return 0 if position is None else int(np.diff(self._fields[field][1][position:position + 2])[0])
+
+    def search(self, all_skills=(), any_skills=(), no_skills=(), job_location=None, job_type=None):
+        """
+        Finds the postings matching a boolean skill query and optional filters.
+
+        Args:
+        - all_skills (list): Skills every result must have (AND).
+        - any_skills (list): Results must have at least one of these skills (OR).
+        - no_skills (list): Skills no result may have (NOT).
+        - job_location (str or list, optional): Location, or list of locations, of the results.
+        - job_type (str or list, optional): Job type, or list of job types, of the results.
+
+        Returns:
+        - np.ndarray: Sorted posting IDs; see `job_links` to map them to postings.
+        """
+        # Each clause is a list of (field, key) terms, OR-ed together; clauses are AND-ed
+        clauses = [[('skill', skill)] for skill in all_skills]
+        if any_skills:
+            clauses.append([('skill', skill) for skill in any_skills])
+        for field, value in (('job_location', job_location), ('job_type', job_type)):
+            if value is not None:
+                clauses.append([(field, item) for item in ([value] if isinstance(value, str) else value)])
+        excluded = [('skill', skill) for skill in no_skills]
+
+        sizes = [sum(self._count(field, key) for field, key in clause) for clause in clauses]
+        if clauses and min(sizes) * self.DENSE_RATIO < len(self):
+            # Sparse: take the IDs of the most selective clause and filter them by the others
+            order = np.argsort(sizes, kind='stable')
+            first = clauses[order[0]]
+            result = (self.postings(*first[0]) if len(first) == 1 else
+                      np.unique(np.concatenate([self.postings(field, key) for field, key in first])))
+            for clause in (clauses[i] for i in order[1:]):
+                keep = np.zeros(len(result), dtype=bool)
+                for field, key in clause:
+                    keep |= self._contains(result, field, key)
+                result = result[keep]
+            for field, key in excluded:
+                result = result[~self._contains(result, field, key)]
+            return result
+
+        # Dense: evaluate the whole query with bitwise operations over the bitmaps
+        bits = np.full((len(self) + 7) // 8, 0xFF, dtype=np.uint8)
+        for clause in clauses:
+            clause_bits = np.zeros_like(bits)
+            for field, key in clause:
+                clause_bits |= self._bitmap(field, key)
+            bits &= clause_bits
+        for field, key in excluded:
+            bits &= ~self._bitmap(field, key)
+        return np.flatnonzero(np.unpackbits(bits, count=len(self)).view(bool)).astype(np.int32)
+
+    def search_links(self, **query):
+        """
+        Same as `search`, returning job links instead of posting IDs.
+
+        Returns:
+        - list: job_link of each matching posting.
+        """
+        return self.job_links[self.search(**query)].tolist()
@@ -0,0 +1,208 @@
+import re
+import zlib
+from collections import Counter
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from pixi_hr import logger
+
+
+class QualificationVocabulary:
+    """
+    Fitted vocabulary for the cleaned job qualification skills.
+
+    Bounds the number of `qual_*` feature columns produced from the
+    `job_qualifications` column. Two modes are supported:
+
+    - 'onehot': one column per retained skill. Skills seen in fewer than
+      `min_df` postings are pruned and, if `top_k` is set, only the `top_k`
+      most frequent skills are kept.
+    - 'hashing': skills are hashed into a fixed number of `n_buckets`
+      columns, so the width never grows with the corpus.
+
+    Attributes:
+    - mode (str): Either 'onehot' or 'hashing'.
+    - min_df (int): Minimum number of postings a skill must appear in.
+    - top_k (int or None): Maximum number of skills retained in 'onehot' mode.
+    - n_buckets (int): Number of hash buckets in 'hashing' mode.
+    - vocabulary_ (dict): Mapping of skill to column index, set by `fit` in 'onehot' mode.
+    - document_frequency_ (dict): Number of postings containing each skill, set by `fit`.
+    """
+
+    MODES = ("onehot", "hashing")
+    PREFIX = "qual_"
+
+    def __init__(self, mode="onehot", min_df=1, top_k=None, n_buckets=1024):
+        """
+        Initializes the QualificationVocabulary.
+
+        Args:
+        - mode (str): Either 'onehot' or 'hashing'.
+        - min_df (int): Minimum document frequency for a skill to be retained.
+        - top_k (int, optional): Keep only the most frequent `top_k` skills. Defaults to no limit.
+        - n_buckets (int): Number of hash buckets used in 'hashing' mode.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported vocabulary mode: {mode}")
+        if n_buckets < 1:
+            raise ValueError("n_buckets must be a positive integer")
+
+        self.mode = mode
+        self.min_df = max(int(min_df), 1)
+        self.top_k = int(top_k) if top_k else None
+        self.n_buckets = int(n_buckets)
+        self.vocabulary_ = None
+        self.document_frequency_ = None
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Builds a QualificationVocabulary from the `QualificationVocabulary` section of params.yaml.
+
+        Args:
+        - params (dict): Vocabulary parameters.
+
+        Returns:
+        - QualificationVocabulary: An unfitted vocabulary.
+        """
+        return cls(
+            mode=params.get("mode", "onehot"),
+            min_df=params.get("min_df", 1),
+            top_k=params.get("top_k"),
+            n_buckets=params.get("n_buckets", 1024)
+        )
+
+    @property
+    def feature_names(self):
+        """List of the `qual_*` column names produced by `transform`."""
+        if self.mode == "hashing":
+            return [f"{self.PREFIX}hash_{i}" for i in range(self.n_buckets)]
+        if self.vocabulary_ is None:
+            raise RuntimeError("QualificationVocabulary must be fitted before use")
+        return [f"{self.PREFIX}{skill}" for skill in self.vocabulary_]
+
+    @staticmethod
+    def clean_skill(skill):
+        """Normalizes a raw skill like the transformation stage: lowercase alphanumerics only."""
+        return re.sub(r'[^a-z0-9]', '', skill.strip().lower())
+
+    def _bucket(self, skill):
+        """Stable hash bucket of a skill, independent of PYTHONHASHSEED."""
+        return zlib.crc32(skill.encode("utf-8")) % self.n_buckets
+
+    def column_name(self, skill):
+        """
+        Name of the `qual_*` column a cleaned skill is encoded in.
+
+        Args:
+        - skill (str): Cleaned skill.
+
+        Returns:
+        - str or None: Column name, or None if the skill is outside the vocabulary.
+        """
+        if self.mode == "hashing":
+            return f"{self.PREFIX}hash_{self._bucket(skill)}"
+        if self.vocabulary_ is None:
+            raise RuntimeError("QualificationVocabulary must be fitted before use")
+        return f"{self.PREFIX}{skill}" if skill in self.vocabulary_ else None
+
+    def fit(self, skill_lists):
+        """
+        Learns the document frequency of each skill and the retained vocabulary.
+
+        Args:
+        - skill_lists (iterable): Lists of cleaned skills, one list per posting.
+
+        Returns:
+        - QualificationVocabulary: The fitted vocabulary.
+        """
+        document_frequency = Counter()
+        for skills in skill_lists:
+            document_frequency.update({skill for skill in skills if skill})
+        self.document_frequency_ = dict(document_frequency)
+
+        if self.mode == "onehot":
+            retained = [(skill, df) for skill, df in document_frequency.items() if df >= self.min_df]
+            if self.top_k is not None:
+                # Ties are broken alphabetically so the selection is deterministic
+                retained = sorted(retained, key=lambda item: (-item[1], item[0]))[:self.top_k]
+            self.vocabulary_ = {skill: i for i, skill in enumerate(sorted(skill for skill, _ in retained))}
+            logger.info(f"Qualification vocabulary retained {len(self.vocabulary_)} "
+                        f"of {len(document_frequency)} distinct skills.")
+        else:
+            logger.info(f"Hashing {len(document_frequency)} distinct skills into {self.n_buckets} buckets.")
+
+        return self
+
+    def transform(self, skill_lists, index=None):
+        """
+        Encodes lists of cleaned skills into the `qual_*` feature columns.
+
+        Skills outside the fitted vocabulary are ignored.
+
+        Args:
+        - skill_lists (iterable): Lists of cleaned skills, one list per posting.
+        - index (pd.Index, optional): Index for the returned DataFrame.
+
+        Returns:
+        - pd.DataFrame: Binary indicator columns named by `feature_names`.
+        """
+        skill_lists = list(skill_lists)
+        columns = self.feature_names
+        rows, cols = [], []
+        for row, skills in enumerate(skill_lists):
+            for skill in skills:
+                if not skill:
+                    continue
+                if self.mode == "hashing":
+                    col = self._bucket(skill)
+                else:
+                    col = self.vocabulary_.get(skill)
+                    if col is None:
+                        continue
+                rows.append(row)
+                cols.append(col)
+
+        encoded = np.zeros((len(skill_lists), len(columns)), dtype=np.uint8)
+        encoded[np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)] = 1
+
+        return pd.DataFrame(encoded, columns=columns, index=index)
+
+    def fit_transform(self, skill_lists, index=None):
+        """
+        Fits the vocabulary and encodes the same skill lists.
+
+        Args:
+        - skill_lists (list): Lists of cleaned skills, one list per posting.
+        - index (pd.Index, optional): Index for the returned DataFrame.
+
+        Returns:
+        - pd.DataFrame: Binary indicator columns named by `feature_names`.
+        """
+        skill_lists = list(skill_lists)
+        return self.fit(skill_lists).transform(skill_lists, index=index)
+
+    def save(self, path):
+        """
+        Persists the fitted vocabulary together with its settings.
+
+        Args:
+        - path (Path): Destination file.
+        """
+        joblib.dump(self, path)
+        logger.info(f"Qualification vocabulary saved at {path}")
+
+    @staticmethod
+    def load(path):
+        """
+        Loads a vocabulary saved with `save`.
+
+        Args:
+        - path (Path): Vocabulary file.
+
+        Returns:
+        - QualificationVocabulary: The fitted vocabulary.
+        """
+        return joblib.load(path)
@@ -0,0 +1,383 @@
+import json
+import os
+
+import numpy as np
+from scipy import sparse
+
+from pixi_hr import logger
+from pixi_hr.components.qualification_vocabulary import QualificationVocabulary
+
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+
+
+class SimilarityIndex:
+    """
+    Approximate nearest-neighbour index of postings by qualification profile.
+
+    Each posting is the set of its `qual_*` columns, and similarity is the
+    Jaccard similarity of those sets. Postings are hashed into MinHash
+    signatures of `num_perm` values that are split into `bands` LSH bands.
+    For every band the index keeps the band keys of all postings sorted,
+    together with the posting IDs in the same order, so the postings sharing
+    a band with a query are found by binary search. Candidates are then
+    ranked by their exact Jaccard similarity.
+
+    The sorted band tables and the skill sets are plain NumPy arrays saved as
+    .npy files, so `load` memory-maps them instead of reading and rebuilding
+    the index. Postings added with `insert` are kept in a small in-memory
+    segment that is searched linearly, and merged into the sorted tables by
+    `save`.
+
+    Attributes:
+    - feature_names (list): `qual_*` columns, in skill ID order.
+    - num_perm (int): Length of the MinHash signatures.
+    - bands (int): Number of LSH bands; must divide num_perm.
+    - skill_buckets (int): Number of hash buckets of a hashing vocabulary, 0 for one-hot.
+    """
+
+    # Number of postings hashed per vectorized step
+    CHUNK_SIZE = 20_000
+
+    def __init__(self, feature_names, num_perm=64, bands=16, seed=44, skill_buckets=0):
+        """
+        Initializes an empty SimilarityIndex.
+
+        Args:
+        - feature_names (list): `qual_*` columns, in skill ID order.
+        - num_perm (int): Length of the MinHash signatures.
+        - bands (int): Number of LSH bands; must divide num_perm.
+        - seed (int): Seed of the hash functions.
+        - skill_buckets (int): Number of hash buckets of a hashing vocabulary, 0 for one-hot.
+        """
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+
+        self.feature_names = list(feature_names)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
+        self.skill_buckets = int(skill_buckets)
+        self._columns = {name: i for i, name in enumerate(self.feature_names)}
+
+        rng = np.random.default_rng(seed)
+        # Odd multipliers make multiply-shift a universal hash family
+        self._a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(0, 2 ** 63, num_perm // bands, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+        # The skill universe is small, so every skill's hash under every permutation is computed once:
+        # (a * x + b) mod 2**64, keeping the high 32 bits
+        skill_ids = np.arange(len(self.feature_names), dtype=np.uint64)[:, None]
+        self._skill_hashes = ((skill_ids * self._a + self._b) >> np.uint64(32)).astype(np.uint32)
+
+        # Sorted segment (memory-mapped after load)
+        self.job_links = np.empty(0, dtype=str)
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int32)
+        self._band_keys = np.empty((bands, 0), dtype=np.uint64)
+        self._band_ids = np.empty((bands, 0), dtype=np.int32)
+
+        # Postings inserted since the last save
+        self._pending_links = []
+        self._pending_sets = []
+        self._pending_keys = []
+
+    @classmethod
+    def from_params(cls, feature_names, params, skill_buckets=0):
+        """
+        Builds an empty index from the SimilarityIndex section of params.yaml.
+
+        Args:
+        - feature_names (list): `qual_*` columns, in skill ID order.
+        - params (dict): Index parameters.
+        - skill_buckets (int): Number of hash buckets of a hashing vocabulary, 0 for one-hot.
+
+        Returns:
+        - SimilarityIndex: The index.
+        """
+        return cls(feature_names,
+                   num_perm=params.get('num_perm', 64),
+                   bands=params.get('bands', 16),
+                   seed=params.get('seed', 44),
+                   skill_buckets=skill_buckets)
+
+    def __len__(self):
+        return len(self.job_links) + len(self._pending_links)
+
+    def _band_keys_of(self, indptr, indices):
+        """
+        LSH band keys of skill sets given in CSR form.
+
+        Returns:
+        - np.ndarray: uint64 array of shape (bands, n_sets). Empty sets get no
+          usable keys and are never returned as candidates.
+        """
+        n_sets = len(indptr) - 1
+        lengths = np.diff(indptr)
+        signatures = np.full((n_sets, self.num_perm), _MAX_HASH, dtype=np.uint32)
+
+        # Skill sets are short, so each chunk is padded to its longest set (with a sentinel
+        # skill hashing to the maximum) and reduced with a running minimum over the columns.
+        # Chunks are taken in order of set size so little work is spent on padding.
+        hashes = np.vstack((self._skill_hashes, np.full((1, self.num_perm), _MAX_HASH, dtype=np.uint32)))
+        sentinel = len(self._skill_hashes)
+        order = np.argsort(lengths, kind='stable')
+        for start in range(0, n_sets, self.CHUNK_SIZE):
+            rows = order[start:start + self.CHUNK_SIZE]
+            row_lengths = lengths[rows]
+            width = int(row_lengths.max()) if len(rows) else 0
+            if width == 0:
+                continue
+
+            total = int(row_lengths.sum())
+            positions = np.arange(total) - np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+            padded = np.full((len(rows), width), sentinel, dtype=np.intp)
+            padded[np.arange(width) < row_lengths[:, None]] = indices[np.repeat(indptr[rows], row_lengths) + positions]
+
+            chunk = hashes[padded[:, 0]]
+            for column in range(1, width):
+                np.minimum(chunk, hashes[padded[:, column]], out=chunk)
+            signatures[rows] = chunk
+
+        rows = self.num_perm // self.bands
+        bands = signatures.reshape(n_sets, self.bands, rows).astype(np.uint64)
+        return (bands * self._band_mix).sum(axis=2, dtype=np.uint64).T.copy()
+
+    @staticmethod
+    def _to_csr(matrix):
+        """CSR (indptr, indices) of a binary posting x skill matrix."""
+        csr = sparse.csr_matrix(matrix)
+        csr.sort_indices()
+        return csr.indptr.astype(np.int64), csr.indices.astype(np.int32)
+
+    def build(self, job_links, matrix):
+        """
+        Replaces the contents of the index with a set of postings.
+
+        Args:
+        - job_links (array-like): job_link of each posting.
+        - matrix (array-like): Binary posting x `qual_*` matrix, columns in feature_names order.
+
+        Returns:
+        - SimilarityIndex: The index.
+        """
+        self._indptr, self._indices = self._to_csr(matrix)
+        self.job_links = np.asarray(job_links, dtype=str)
+        self._band_keys, self._band_ids = self._sorted_tables(self._band_keys_of(self._indptr, self._indices))
+        self._pending_links, self._pending_sets, self._pending_keys = [], [], []
+        return self
+
+    @staticmethod
+    def _sorted_tables(keys):
+        order = np.argsort(keys, axis=1, kind='stable').astype(np.int32)
+        return np.take_along_axis(keys, order, axis=1), order
+
+    def insert(self, job_links, matrix):
+        """
+        Adds postings to the index. They are searchable immediately and merged
+        into the sorted tables by the next `save`.
+
+        Args:
+        - job_links (array-like): job_link of each posting.
+        - matrix (array-like): Binary posting x `qual_*` matrix, columns in feature_names order.
+        """
+        indptr, indices = self._to_csr(matrix)
+        self._pending_links.extend(np.asarray(job_links, dtype=str).tolist())
+        self._pending_sets.extend(indices[indptr[i]:indptr[i + 1]] for i in range(len(indptr) - 1))
+        self._pending_keys.append(self._band_keys_of(indptr, indices))
+
+    def _all_sets(self):
+        """CSR (indptr, indices) of the sorted segment followed by the inserted postings."""
+        if not self._pending_sets:
+            return self._indptr, self._indices
+        lengths = np.array([len(skills) for skills in self._pending_sets], dtype=np.int64)
+        indptr = np.concatenate((self._indptr, self._indptr[-1] + np.cumsum(lengths)))
+        indices = np.concatenate([np.asarray(self._indices)] + self._pending_sets).astype(np.int32)
+        return indptr, indices
+
+    def _merge_pending(self):
+        """Merges the inserted postings into the sorted segment."""
+        if not self._pending_links:
+            return
+        n_sorted = len(self.job_links)
+        self._indptr, self._indices = self._all_sets()
+        self.job_links = np.concatenate((self.job_links, np.asarray(self._pending_links, dtype=str)))
+
+        keys = np.empty((self.bands, len(self.job_links)), dtype=np.uint64)
+        if n_sorted:
+            np.put_along_axis(keys[:, :n_sorted], np.asarray(self._band_ids), self._band_keys, axis=1)
+        keys[:, n_sorted:] = np.concatenate(self._pending_keys, axis=1)
+        self._band_keys, self._band_ids = self._sorted_tables(keys)
+        self._pending_links, self._pending_sets, self._pending_keys = [], [], []
+
+    def save(self, directory):
+        """
+        Persists the index as .npy files in a directory, merging inserted postings first.
+
+        Args:
+        - directory (Path): Destination directory.
+        """
+        self._merge_pending()
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (('job_links', self.job_links), ('indptr', self._indptr), ('indices', self._indices),
+                            ('band_keys', self._band_keys), ('band_ids', self._band_ids)):
+            # Write next to the target and swap it in, so an index memory-mapped from the same directory stays valid
+            path = os.path.join(directory, f'{name}.npy')
+            np.save(f'{path}.tmp.npy', array)
+            os.replace(f'{path}.tmp.npy', path)
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump({'feature_names': self.feature_names, 'num_perm': self.num_perm, 'bands': self.bands,
+                       'seed': self.seed, 'skill_buckets': self.skill_buckets}, f)
+        logger.info(f"Similarity index of {len(self)} postings saved at {directory}")
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Loads an index saved with `save`, memory-mapping its arrays.
+
+        Args:
+        - directory (Path): Index directory.
+        - mmap_mode (str, optional): Passed to np.load; None reads the arrays into memory.
+
+        Returns:
+        - SimilarityIndex: The index.
+        """
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        index = cls(meta['feature_names'], num_perm=meta['num_perm'], bands=meta['bands'],
+                    seed=meta['seed'], skill_buckets=meta['skill_buckets'])
+        for name in ('job_links', 'indptr', 'indices', 'band_keys', 'band_ids'):
+            setattr(index, name if name == 'job_links' else f'_{name}', np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode))
+        return index
+
+    def skills_to_ids(self, skills):
+        """
+        Maps raw skills to skill IDs, cleaning them like the transformation stage.
+
+        Args:
+        - skills (list): Skills of a posting.
+
+        Returns:
+        - np.ndarray: Sorted unique skill IDs; skills outside the vocabulary are ignored.
+        """
+        ids = set()
+        for skill in skills:
+            skill = QualificationVocabulary.clean_skill(skill)
+            if self.skill_buckets:
+                column = QualificationVocabulary(mode="hashing", n_buckets=self.skill_buckets).column_name(skill)
+            else:
+                column = f"{QualificationVocabulary.PREFIX}{skill}"
+            if column in self._columns:
+                ids.add(self._columns[column])
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def _jaccard(self, skill_ids, candidates):
+        """Exact Jaccard similarity between a skill set and candidate postings."""
+        n_sorted = len(self.job_links)
+        similarity = np.empty(len(candidates))
+
+        in_sorted = candidates < n_sorted
+        if in_sorted.any():
+            sorted_candidates = candidates[in_sorted]
+            starts = np.asarray(self._indptr[sorted_candidates])
+            lengths = np.asarray(self._indptr[sorted_candidates + 1]) - starts
+            # Gather the skills of every candidate into one flat array
+            gather = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            is_shared = np.isin(np.asarray(self._indices[gather]), skill_ids)
+            shared = np.bincount(np.repeat(np.arange(len(lengths)), lengths), weights=is_shared,
+                                 minlength=len(lengths))
+            similarity[in_sorted] = shared / np.maximum(lengths + len(skill_ids) - shared, 1)
+
+        for i in np.flatnonzero(~in_sorted):
+            other = self._pending_sets[candidates[i] - n_sorted]
+            shared = len(np.intersect1d(skill_ids, other, assume_unique=True))
+            similarity[i] = shared / max(len(skill_ids) + len(other) - shared, 1)
+        return similarity
+
+    def candidates(self, skill_ids):
+        """
+        Postings sharing at least one LSH band with a skill set.
+
+        Args:
+        - skill_ids (np.ndarray): Sorted skill IDs.
+
+        Returns:
+        - np.ndarray: Posting IDs of the candidates.
+        """
+        if not len(skill_ids):
+            return np.empty(0, dtype=np.int64)
+        keys = self._band_keys_of(np.array([0, len(skill_ids)]), np.asarray(skill_ids))[:, 0]
+
+        found = []
+        for band, key in enumerate(keys):
+            start = np.searchsorted(self._band_keys[band], key, side='left')
+            end = np.searchsorted(self._band_keys[band], key, side='right')
+            found.append(self._band_ids[band, start:end])
+        if self._pending_keys:
+            pending = np.concatenate(self._pending_keys, axis=1)
+            found.append(len(self.job_links) + np.flatnonzero((pending == keys[:, None]).any(axis=0)))
+        return np.unique(np.concatenate(found).astype(np.int64))
+
+    def _top_k(self, skill_ids, candidates, k, exclude):
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        similarity = self._jaccard(skill_ids, candidates)
+        top = np.argsort(-similarity, kind='stable')[:k]
+        return [(self._job_link(candidate), float(score))
+                for candidate, score in zip(candidates[top].tolist(), similarity[top]) if score > 0]
+
+    def _job_link(self, posting_id):
+        n_sorted = len(self.job_links)
+        return str(self.job_links[posting_id]) if posting_id < n_sorted else self._pending_links[posting_id - n_sorted]
+
+    def query(self, skills, k=10):
+        """
+        Finds the postings most similar to a set of skills.
+
+        Args:
+        - skills (list): Raw skills of the posting to match.
+        - k (int): Number of results.
+
+        Returns:
+        - list: Up to k (job_link, jaccard similarity) tuples, most similar first.
+        """
+        skill_ids = self.skills_to_ids(skills)
+        return self._top_k(skill_ids, self.candidates(skill_ids), k, exclude=None)
+
+    def query_ids(self, skill_ids, k=10, exclude=None):
+        """
+        Same as `query`, for skill IDs.
+
+        Args:
+        - skill_ids (np.ndarray): Sorted skill IDs.
+        - k (int): Number of results.
+        - exclude (int, optional): Posting ID left out of the results, e.g. the query posting itself.
+
+        Returns:
+        - list: Up to k (job_link, jaccard similarity) tuples, most similar first.
+        """
+        return self._top_k(np.asarray(skill_ids), self.candidates(skill_ids), k, exclude)
+
+    def brute_force(self, skill_ids, k=10, exclude=None):
+        """
+        Exact top-k by scanning every posting, used to measure recall.
+
+        Args:
+        - skill_ids (np.ndarray): Sorted skill IDs.
+        - k (int): Number of results.
+        - exclude (int, optional): Posting ID left out of the results.
+
+        Returns:
+        - list: Up to k (job_link, jaccard similarity) tuples, most similar first.
+        """
+        indptr, indices = self._all_sets()
+        matrix = sparse.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr),
+                                   shape=(len(indptr) - 1, len(self.feature_names)))
+        query = np.zeros(len(self.feature_names), dtype=np.float32)
+        query[skill_ids] = 1
+        shared = matrix @ query
+        similarity = shared / np.maximum(np.diff(indptr) + len(skill_ids) - shared, 1)
+        if exclude is not None:
+            similarity[exclude] = -1
+        top = np.argsort(-similarity, kind='stable')[:k]
+        return [(self._job_link(i), float(similarity[i])) for i in top.tolist() if similarity[i] > 0]
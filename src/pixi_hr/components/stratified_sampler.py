@@ -0,0 +1,126 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr import logger
+from pixi_hr.entity.config_entity import StratifiedSamplingConfig
+from pixi_hr.utils.common import save_json, load_json
+
+# Metrics written by ModelEvaluation, compared between the sample and the full run
+METRICS = ('rmse', 'mae', 'r2')
+
+
+class StratifiedSampler:
+    """
+    Draws the postings of a sample run (main.py --sample), and compares its metrics with the last full run.
+
+    Postings are grouped by their values of the stratification columns
+    (title and job_location), shuffled within each group with a seeded
+    generator, and every (n / size)-th posting is taken from the groups laid
+    end to end. Each group therefore keeps its share of the postings, to
+    within one posting, and the same data, size and seed give the same
+    sample.
+
+    Attributes:
+    - config (StratifiedSamplingConfig): Sampling configuration.
+    """
+
+    def __init__(self, config: StratifiedSamplingConfig):
+        """
+        Initializes the StratifiedSampler.
+
+        Args:
+        - config (StratifiedSamplingConfig): Sampling configuration.
+        """
+        self.config = config
+
+    def sample_size(self, n_rows):
+        """Number of postings sampled out of `n_rows`: a fraction when size is below 1, else a count."""
+        size = self.config.size
+        if size <= 0:
+            raise ValueError(f"Sample size must be positive, got {size}")
+        count = round(size * n_rows) if size < 1 else int(size)
+        return min(max(count, 1), n_rows)
+
+    def draw(self, df):
+        """
+        Draws the stratified sample.
+
+        Args:
+        - df (pd.DataFrame): Ingested postings.
+
+        Returns:
+        - pd.DataFrame: Sampled postings, in their original order.
+        """
+        missing = [column for column in self.config.strata if column not in df.columns]
+        if missing:
+            raise ValueError(f"Stratification columns missing from the data: {missing}")
+        if df.empty:
+            return df
+
+        rng = np.random.default_rng(self.config.seed)
+        strata = df.groupby(list(self.config.strata), dropna=False, sort=True).ngroup().to_numpy()
+        order = np.lexsort((rng.random(len(df)), strata))
+
+        count = self.sample_size(len(df))
+        step = len(df) / count
+        positions = np.floor(rng.random() * step + np.arange(count) * step).astype(np.int64)
+        return df.iloc[np.sort(order[positions])]
+
+    def main(self):
+        """
+        Samples the ingested postings into the ingestion artifacts of the sample run.
+
+        Returns:
+        - int: Number of sampled postings.
+        """
+        df = pd.read_csv(self.config.source_file)
+        sample = self.draw(df)
+
+        os.makedirs(os.path.dirname(self.config.sample_file), exist_ok=True)
+        sample.to_csv(self.config.sample_file, index=False)
+        n_strata = sample.groupby(list(self.config.strata), dropna=False).ngroups
+        logger.info(f"Sampled {len(sample)} of {len(df)} postings ({n_strata} strata of "
+                    f"{', '.join(self.config.strata)}) into {self.config.sample_file}")
+        return len(sample)
+
+    def compare_metrics(self, sample_rows=None):
+        """
+        Compares the metrics of the sample run with those of the last full run, and writes the report.
+
+        Args:
+        - sample_rows (int): Number of sampled postings, for the report.
+
+        Returns:
+        - dict: Per metric, the full and sampled values and their absolute and relative differences.
+        """
+        if not os.path.exists(self.config.sample_metrics_file):
+            logger.warning(f"No metrics from the sample run at {self.config.sample_metrics_file}")
+            return {}
+
+        sample = load_json(Path(self.config.sample_metrics_file))
+        full = load_json(Path(self.config.full_metrics_file)) if os.path.exists(self.config.full_metrics_file) else None
+        report = {'sample_rows': sample_rows, 'size': self.config.size, 'seed': self.config.seed,
+                  'strata': list(self.config.strata), 'full_metrics_file': str(self.config.full_metrics_file),
+                  'metrics': {}}
+        for metric in METRICS:
+            sampled = float(sample[metric])
+            entry = {'sample': sampled, 'full': None, 'difference': None, 'relative_difference': None}
+            if full is not None and metric in full:
+                entry['full'] = float(full[metric])
+                entry['difference'] = sampled - entry['full']
+                if entry['full']:
+                    entry['relative_difference'] = entry['difference'] / abs(entry['full'])
+            report['metrics'][metric] = entry
+
+        save_json(path=Path(self.config.report_file), data=report)
+        if full is None:
+            logger.info(f"Sample run metrics: {dict(sample)} (no full run to compare with at "
+                        f"{self.config.full_metrics_file})")
+        else:
+            logger.info("Sample run vs last full run: " + ", ".join(
+                f"{metric} {entry['sample']:.4g} vs {entry['full']:.4g} ({entry['difference']:+.4g})"
+                for metric, entry in report['metrics'].items() if entry['full'] is not None))
+        return report
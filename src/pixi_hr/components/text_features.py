@@ -0,0 +1,158 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from pixi_hr import logger
+from pixi_hr.utils.common import peak_rss_mb
+
+
+def _hash_texts(texts, n_features, ngram_range):
+    """
+    Vectorizes a chunk of texts. Runs in a worker process, so it only takes and returns plain data.
+
+    Args:
+    - texts (list): Text of each posting.
+    - n_features (int): Width of the hashed feature space.
+    - ngram_range (tuple): Smallest and largest word n-gram.
+
+    Returns:
+    - scipy.sparse.csr_matrix: float32 matrix of shape (len(texts), n_features).
+    """
+    vectorizer = HashingVectorizer(n_features=n_features, ngram_range=ngram_range,
+                                   alternate_sign=False, norm='l2', dtype=np.float32)
+    return vectorizer.transform(texts)
+
+
+class TextFeatureExtractor:
+    """
+    Hashed bag-of-words / n-gram features of the posting text.
+
+    The text columns of each posting are joined and hashed into a fixed-width
+    sparse space, so no vocabulary has to be fitted or stored and train, test
+    and new postings always share the same columns. The corpus is read and
+    vectorized in chunks on a process pool with a bounded number of chunks in
+    flight, so memory use does not grow with the size of the input.
+
+    Attributes:
+    - columns (list): Text columns that are vectorized.
+    - n_features (int): Width of the hashed feature space.
+    - ngram_range (tuple): Smallest and largest word n-gram.
+    - chunk_size (int): Number of postings per chunk.
+    - n_jobs (int): Number of worker processes; 1 vectorizes in-process.
+    """
+
+    def __init__(self, columns=('job_summary', 'job_description'), n_features=2 ** 12, ngram_range=(1, 2),
+                 chunk_size=5000, n_jobs=None):
+        """
+        Initializes the TextFeatureExtractor.
+
+        Args:
+        - columns (list): Text columns that are vectorized.
+        - n_features (int): Width of the hashed feature space.
+        - ngram_range (tuple): Smallest and largest word n-gram.
+        - chunk_size (int): Number of postings per chunk.
+        - n_jobs (int, optional): Number of worker processes, defaults to the CPU count.
+        """
+        self.columns = list(columns)
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Builds an extractor from the TextFeatures section of params.yaml.
+
+        Args:
+        - params (dict): Extractor parameters.
+
+        Returns:
+        - TextFeatureExtractor: The extractor.
+        """
+        return cls(columns=params.get('columns', ['job_summary', 'job_description']),
+                   n_features=params.get('n_features', 2 ** 12),
+                   ngram_range=params.get('ngram_range', (1, 2)),
+                   chunk_size=params.get('chunk_size', 5000),
+                   n_jobs=params.get('n_jobs'))
+
+    def _texts(self, chunk):
+        """Joins the text columns of a chunk into one string per posting."""
+        texts = chunk[self.columns[0]].fillna('').astype(str)
+        for column in self.columns[1:]:
+            texts = texts + ' ' + chunk[column].fillna('').astype(str)
+        return texts.tolist()
+
+    def transform_chunks(self, chunks):
+        """
+        Vectorizes a stream of DataFrame chunks, keeping the input row order.
+
+        Args:
+        - chunks (iterable): DataFrames holding the text columns.
+
+        Returns:
+        - scipy.sparse.csr_matrix: float32 matrix with one row per posting.
+        """
+        args = (self.n_features, self.ngram_range)
+        matrices = []
+
+        if self.n_jobs == 1:
+            for chunk in chunks:
+                matrices.append(_hash_texts(self._texts(chunk), *args))
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_hash_texts, self._texts(chunk), *args))
+                    # Keep at most two chunks per worker in flight
+                    if len(pending) >= 2 * self.n_jobs:
+                        matrices.append(pending.popleft().result())
+                matrices.extend(future.result() for future in pending)
+
+        if not matrices:
+            return sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+        return sparse.vstack(matrices, format='csr')
+
+    def transform(self, df):
+        """
+        Vectorizes the postings of a DataFrame.
+
+        Args:
+        - df (pd.DataFrame): Postings holding the text columns.
+
+        Returns:
+        - scipy.sparse.csr_matrix: float32 matrix with one row per posting.
+        """
+        return self.transform_chunks(df.iloc[start:start + self.chunk_size]
+                                     for start in range(0, len(df), self.chunk_size))
+
+    def transform_csv(self, csv_path, output_path):
+        """
+        Vectorizes the postings of a CSV file chunk by chunk and saves the matrix as .npz.
+
+        Row i of the saved matrix belongs to row i of the CSV file.
+
+        Args:
+        - csv_path (str): CSV holding the text columns.
+        - output_path (str): Path of the .npz file.
+
+        Returns:
+        - scipy.sparse.csr_matrix: The saved matrix.
+        """
+        start = time.perf_counter()
+        chunks = pd.read_csv(csv_path, usecols=self.columns, dtype=str, chunksize=self.chunk_size)
+        matrix = self.transform_chunks(chunks)
+        sparse.save_npz(output_path, matrix)
+        seconds = time.perf_counter() - start
+
+        logger.info(f"Hashed text features of {matrix.shape[0]} postings into {output_path} "
+                    f"({matrix.shape[0] / max(seconds, 1e-9):.0f} postings/sec, {matrix.nnz} non-zeros, "
+                    f"peak memory {peak_rss_mb():.0f} MB)")
+        return matrix
+
@@ -0,0 +1,186 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from pixi_hr import logger
+
+
+class TransformedStore:
+    """
+    Append-only store of transformed postings.
+
+    Transformed rows are written to immutable CSV shards under `root_dir/shards`.
+    A key index (`root_dir/index.csv`) maps every `job_link` to the content hash
+    it was transformed from, its train/test split and the shard holding its
+    current version. Changed postings are appended to a new shard and the index
+    is repointed; retired postings are tombstoned in the index instead of being
+    deleted from the shards.
+
+    The settings the rows were transformed with (split and qualification
+    vocabulary) and the size and modification time of the fitted vocabulary
+    file are kept in `root_dir/state.json`. A store whose settings differ from
+    the current ones, or whose vocabulary was refitted since, does not `exist`,
+    so the next run transforms every posting.
+
+    Attributes:
+    - root_dir (str): Directory holding the index and the shards.
+    - settings (dict): Settings the stored rows were transformed with.
+    - vocabulary_file (str): Fitted qualification vocabulary the stored rows were encoded with.
+    - index (pd.DataFrame): The key index, indexed by 'job_link'.
+    """
+
+    INDEX_COLUMNS = ['content_hash', 'split', 'shard', 'retired']
+
+    def __init__(self, root_dir, settings=None, vocabulary_file=None):
+        """
+        Initializes the TransformedStore and loads its index if one exists.
+
+        Args:
+        - root_dir (str): Directory holding the index and the shards.
+        - settings (dict, optional): Settings the rows are transformed with; must be JSON serializable.
+        - vocabulary_file (str, optional): Fitted qualification vocabulary the rows are encoded with.
+        """
+        self.root_dir = root_dir
+        self.settings = json.loads(json.dumps(settings or {}, sort_keys=True))
+        self.vocabulary_file = vocabulary_file
+        self.index_path = os.path.join(root_dir, "index.csv")
+        self.state_path = os.path.join(root_dir, "state.json")
+        self.shard_dir = os.path.join(root_dir, "shards")
+
+        if os.path.exists(self.index_path):
+            self.index = pd.read_csv(self.index_path, index_col='job_link', dtype={'content_hash': str})
+        else:
+            self.index = pd.DataFrame(columns=self.INDEX_COLUMNS, index=pd.Index([], name='job_link'))
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Opens the store of a data transformation configuration.
+
+        Args:
+        - config (DataTransformationConfig): Data transformation configuration.
+
+        Returns:
+        - TransformedStore: The store.
+        """
+        settings = {'split_strategy': config.split_strategy, 'test_size': config.test_size,
+                    'vocabulary_params': config.vocabulary_params}
+        return cls(config.store_dir, settings=settings, vocabulary_file=str(config.vocabulary_file))
+
+    def _state(self):
+        """Settings of the store and the size and modification time of the vocabulary file."""
+        vocabulary = None
+        if self.vocabulary_file and os.path.exists(self.vocabulary_file):
+            stat = os.stat(self.vocabulary_file)
+            vocabulary = [stat.st_size, stat.st_mtime_ns]
+        return {'settings': self.settings, 'vocabulary': vocabulary}
+
+    def exists(self) -> bool:
+        """Whether the store has been populated by a previous run with the current settings and vocabulary."""
+        if not os.path.exists(self.index_path) or not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path) as f:
+            return json.load(f) == self._state()
+
+    def save_state(self):
+        """Records the settings of the store and the vocabulary its rows were encoded with."""
+        with open(self.state_path, 'w') as f:
+            json.dump(self._state(), f, indent=4)
+
+    def _shard_path(self, shard):
+        return os.path.join(self.shard_dir, f"part-{shard:05d}.csv")
+
+    def diff(self, df):
+        """
+        Compares validated postings against the index.
+
+        Args:
+        - df (pd.DataFrame): Validated postings with 'job_link' and 'content_hash'.
+
+        Returns:
+        - tuple: (boolean mask of new or changed rows in `df`, list of retired job links)
+        """
+        live = self.index[~self.index['retired'].astype(bool)]
+        known_hashes = df['job_link'].map(live['content_hash'])
+        delta = (known_hashes != df['content_hash']).to_numpy()
+
+        retired = live.index.difference(pd.Index(df['job_link'])).tolist()
+        logger.info(f"{delta.sum()} new or changed postings, {len(retired)} retired postings, "
+                    f"{len(df) - delta.sum()} unchanged postings.")
+        return delta, retired
+
+    def rebuild(self, df, is_test):
+        """
+        Discards the existing shards and writes `df` as the first shard, then
+        records the current settings and vocabulary (see save_state).
+
+        Args:
+        - df (pd.DataFrame): Transformed postings.
+        - is_test (array-like): Boolean mask, True for test set rows.
+        """
+        shutil.rmtree(self.shard_dir, ignore_errors=True)
+        self.index = self.index.iloc[0:0]
+        self.append(df, is_test, retired=[])
+        self.save_state()
+
+    def append(self, df, is_test, retired):
+        """
+        Appends transformed postings as a new shard and updates the index.
+
+        Args:
+        - df (pd.DataFrame): Transformed new or changed postings.
+        - is_test (array-like): Boolean mask, True for test set rows.
+        - retired (list): Job links that are no longer in the validated data.
+        """
+        os.makedirs(self.shard_dir, exist_ok=True)
+        shard = int(self.index['shard'].max()) + 1 if len(self.index) else 0
+
+        if len(df):
+            df.to_csv(self._shard_path(shard), index=False)
+            entries = pd.DataFrame({
+                'content_hash': df['content_hash'].to_numpy(),
+                'split': pd.Series(is_test).map({True: 'test', False: 'train'}).to_numpy(),
+                'shard': shard,
+                'retired': False
+            }, index=pd.Index(df['job_link'], name='job_link'))
+            # Changed postings replace their previous index entry
+            self.index = pd.concat([self.index.drop(entries.index, errors='ignore'), entries])
+
+        if retired:
+            self.index.loc[retired, 'retired'] = True
+
+        self.index.to_csv(self.index_path)
+        logger.info(f"Store updated: shard {shard} with {len(df)} rows, {len(retired)} tombstoned.")
+
+    def materialize(self, train_path, test_path):
+        """
+        Writes the current version of every live posting to the train and test files.
+
+        Args:
+        - train_path (str): Destination of the training set.
+        - test_path (str): Destination of the test set.
+
+        Returns:
+        - tuple: (train DataFrame, test DataFrame)
+        """
+        live = self.index[~self.index['retired'].astype(bool)]
+        parts = []
+        for shard, entries in live.groupby('shard'):
+            rows = pd.read_csv(self._shard_path(int(shard)))
+            parts.append(rows[rows['job_link'].isin(entries.index)])
+
+        if parts:
+            data = pd.concat(parts, ignore_index=True)
+        else:
+            # Every posting is retired: write the columns of the latest shard and no rows
+            shards = sorted(os.listdir(self.shard_dir)) if os.path.isdir(self.shard_dir) else []
+            data = (pd.read_csv(os.path.join(self.shard_dir, shards[-1]), nrows=0) if shards
+                    else pd.DataFrame(columns=['job_link']))
+        is_test = (data['job_link'].map(live['split']) == 'test').to_numpy()
+        train, test = data[~is_test], data[is_test]
+
+        train.to_csv(train_path, index=False)
+        test.to_csv(test_path, index=False)
+        return train, test
@@ -1,34 +1,49 @@
-from src.pixi_hr.constants import *
-from src.pixi_hr.utils.common import read_yaml, create_directories
+import os
+import dataclasses
+
+from pixi_hr.constants import *
+from pixi_hr.utils import common
+from pixi_hr.config.snapshot import get_snapshot, reroot
 
 from pixi_hr.entity.config_entity import (DataIngestionConfig, 
+                                          DataSourcingConfig,
                                           DataValidationConfig, 
                                           DataTransformationConfig, 
                                           ModelTrainerConfig,
-                                          ModelEvaluationConfig)
+                                          ModelEvaluationConfig,
+                                          ForestCompactionConfig,
+                                          BatchScoringConfig,
+                                          InstrumentationConfig,
+                                          StratifiedSamplingConfig,
+                                          CrossValidationConfig,
+                                          FeatureImportanceConfig)
+
+
+def create_directories(path_to_directories):
+    """Creates the directories that do not exist yet (most calls find them all there)."""
+    missing = [path for path in path_to_directories if not os.path.isdir(path)]
+    if missing:
+        common.create_directories(missing)
 
 class ConfigurationManager:
+    """
+    Builds the configuration entity of each component.
+
+    The YAML files are read and validated once per process (see
+    pixi_hr.config.snapshot); every ConfigurationManager shares that frozen
+    snapshot, so creating one per stage is cheap.
+    """
+
     def __init__(
             self,
             config_filepath = CONFIG_FILE_PATH,   # Path to the configuration YAML file
             params_filepath = PARAMS_FILE_PATH,   # Path to the parameters YAML file
             schema_filepath = SCHEMA_FILE_PATH):  # Path to the schema YAML file
-        
-        # Load the configuration details from the YAML file
-
-        # print(type(config_filepath), config_filepath)
-        
-        self.config = read_yaml(config_filepath)
-        # Load the parameters details from the YAML file
-        self.params = read_yaml(params_filepath)
-        # Load the schema details from the YAML file
-        self.schema = read_yaml(schema_filepath)
-
-        # Convert 'None' string to Python None object for specific parameters
-        for param, value in self.params['RandomForest'].items():
-            if value == 'None':
-                self.params['RandomForest'][param] = None
 
+        snapshot = get_snapshot(config_filepath, params_filepath, schema_filepath)
+        self.config = snapshot.config
+        self.params = snapshot.params
+        self.schema = snapshot.schema
 
         # Create directories as specified in the configuration (e.g., for storing artifacts)
         create_directories([self.config.artifacts_root])
@@ -45,10 +60,40 @@ class ConfigurationManager:
             root_dir=config.root_dir,               # Directory for data ingestion artifacts
             source_URL=config.source_URL,           # URL from which data will be downloaded
             local_data_file=config.local_data_file, # Local path where downloaded data will be saved
-            unzip_dir=config.unzip_dir              # Directory where the zipped data will be extracted
+            unzip_dir=config.unzip_dir,             # Directory where the zipped data will be extracted
+            source_type=config.get('source_type', 'zip')  # 'zip' download or 'scraper'
         )
 
         return data_ingestion_config
+
+
+    def get_data_sourcing_config(self) -> DataSourcingConfig:
+        """
+        Extracts the scraping configuration used by the 'scraper' ingestion source.
+
+        Returns:
+        - DataSourcingConfig: A dataclass object containing the scraping configuration.
+        """
+        config = self.config.data_sourcing
+
+        data_sourcing_config = DataSourcingConfig(
+            base_url=config.base_url,
+            job_searches=list(config.job_searches),
+            locations=list(config.locations),
+            output_file=config.output_file,
+            page_size=config.page_size,
+            max_pages=config.max_pages,
+            max_connections=config.max_connections,
+            max_connections_per_host=config.max_connections_per_host,
+            requests_per_second=config.requests_per_second,
+            parse_workers=config.parse_workers,
+            request_timeout=config.request_timeout,
+            max_retries=config.max_retries,
+            link_index_file=config.link_index_file,
+            cache_file=config.cache_file
+        )
+
+        return data_sourcing_config
     
 
     def get_data_validation_config(self) -> DataValidationConfig:
@@ -66,7 +111,12 @@ class ConfigurationManager:
             unzip_data_dir=config.unzip_data_dir,
             STATUS_FILE=config.STATUS_FILE,
             validated_data_file=config.validated_data_file,
-            all_schema=schema
+            all_schema=schema,
+            date_format=config.get('date_format'),
+            near_duplicate_params=config.get('near_duplicates'),
+            near_duplicate_report_file=config.get('near_duplicate_report_file'),
+            violations_file=config.get('violations_file'),
+            max_logged_rows=config.get('max_logged_rows', 5)
         )
 
         return data_validation_config
@@ -94,7 +144,21 @@ class ConfigurationManager:
         # Create an instance of the DataTransformationConfig dataclass using the extracted configuration
         data_transformation_config = DataTransformationConfig(
             root_dir=config.root_dir,
-            data_path=config.data_path
+            data_path=config.data_path,
+            vocabulary_file=config.vocabulary_file,
+            vocabulary_params=self.params.QualificationVocabulary,
+            category_mappings_file=config.category_mappings_file,
+            split_strategy=config.split_strategy,
+            test_size=config.test_size,
+            incremental=config.incremental,
+            store_dir=config.store_dir,
+            feature_store_file=config.feature_store_file,
+            text_feature_params=self.params.get('TextFeatures'),
+            train_text_features_file=config.get('train_text_features_file'),
+            test_text_features_file=config.get('test_text_features_file'),
+            posting_index_file=config.get('posting_index_file'),
+            similarity_index_dir=config.get('similarity_index_dir'),
+            similarity_index_params=self.params.get('SimilarityIndex', {})
         )
 
         return data_transformation_config
@@ -124,6 +188,12 @@ class ConfigurationManager:
         
         schema = self.schema.TARGET_COLUMN
 
+        # Text features are stacked next to the qual_* columns only when enabled
+        use_text_features = self.params.get('TextFeatures', {}).get('enabled', False)
+
+        # Out-of-bag predictions only exist for bagged models
+        use_oob = chosen_model_type == "RandomForest" and self.params.get('OutOfBag', {}).get('enabled', False)
+
         # Create the directory where model training artifacts will be stored
         create_directories([config.root_dir])
 
@@ -135,7 +205,12 @@ class ConfigurationManager:
             model_name=config.model_name,
             target_column=schema.name,
             model_type=chosen_model_type,
-            model_params=params
+            model_params=params,
+            train_text_features_path=config.get('train_text_features_path') if use_text_features else None,
+            test_text_features_path=config.get('test_text_features_path') if use_text_features else None,
+            compress_level=config.get('compress_level', 3),
+            mmap_threshold_mb=config.get('mmap_threshold_mb', 32),
+            oob_metrics_file=config.get('oob_metrics_file') if use_oob else None
         )
 
         return model_trainer_config
@@ -162,6 +237,9 @@ class ConfigurationManager:
                 raise ValueError(f"Unsupported model type: {chosen_model_type}")
                 
             schema = self.schema.TARGET_COLUMN
+            use_text_features = self.params.get('TextFeatures', {}).get('enabled', False)
+            oob_params = self.params.get('OutOfBag', {})
+            use_oob = chosen_model_type == "RandomForest" and oob_params.get('enabled', False)
 
             # Ensure the directory for model evaluation artifacts exists
             create_directories([config.root_dir])
@@ -174,7 +252,200 @@ class ConfigurationManager:
                 metric_file_name=config.metric_file_name,
                 all_params=params,
                 target_column=schema.name,
-                mlflow_uri=config.mlflow_uri
+                mlflow_uri=config.mlflow_uri,
+                test_text_features_path=config.get('test_text_features_path') if use_text_features else None,
+                oob_metrics_file=config.get('oob_metrics_file') if use_oob else None,
+                use_oob=use_oob and oob_params.get('use_for_evaluation', False),
+                oob_report_file=config.get('oob_report_file'),
+                oob_metric_file_name=config.get('oob_metric_file_name')
             )
 
             return model_evaluation_config
+
+
+    def get_forest_compaction_config(self) -> ForestCompactionConfig:
+        """
+        Fetches the configuration of the compaction of the trained RandomForest.
+
+        Returns:
+        - ForestCompactionConfig: Dataclass containing the forest compaction configuration.
+        """
+        config = self.config.forest_compaction
+        params = self.params.get('ForestCompaction', {})
+        use_text_features = self.params.get('TextFeatures', {}).get('enabled', False)
+
+        create_directories([config.root_dir])
+
+        forest_compaction_config = ForestCompactionConfig(
+            root_dir=config.root_dir,
+            model_path=config.model_path,
+            compact_model_path=config.compact_model_path,
+            report_file=config.report_file,
+            train_data_path=config.train_data_path,
+            test_data_path=config.test_data_path,
+            target_column=self.schema.TARGET_COLUMN.name,
+            threshold_dtype=params.get('threshold_dtype', 'float32'),
+            value_dtype=params.get('value_dtype', 'float32'),
+            top_k_trees=params.get('top_k_trees'),
+            train_text_features_path=config.get('train_text_features_path') if use_text_features else None,
+            test_text_features_path=config.get('test_text_features_path') if use_text_features else None
+        )
+
+        return forest_compaction_config
+
+
+    def get_batch_scoring_config(self) -> BatchScoringConfig:
+        """
+        Fetches the configuration of batch scoring of raw posting files.
+
+        Returns:
+        - BatchScoringConfig: Dataclass containing the batch scoring configuration.
+        """
+        config = self.config.batch_scoring
+        text_feature_params = self.params.get('TextFeatures', {})
+
+        create_directories([config.root_dir])
+
+        batch_scoring_config = BatchScoringConfig(
+            root_dir=config.root_dir,
+            input_file=config.input_file,
+            output_file=config.output_file,
+            checkpoint_file=config.checkpoint_file,
+            model_path=config.model_path,
+            vocabulary_file=config.vocabulary_file,
+            category_mappings_file=config.category_mappings_file,
+            target_column=self.schema.TARGET_COLUMN.name,
+            chunk_size=config.chunk_size,
+            workers=config.workers,
+            max_pending_chunks=config.max_pending_chunks,
+            text_feature_params=text_feature_params if text_feature_params.get('enabled', False) else None
+        )
+
+        return batch_scoring_config
+
+
+    def get_instrumentation_config(self) -> InstrumentationConfig:
+        """
+        Fetches the configuration of the instrumentation of pipeline runs.
+
+        The PIXI_HR_PROFILE and PIXI_HR_PROFILER environment variables override
+        the profiled span and the profiler of params.yaml.
+
+        Returns:
+        - InstrumentationConfig: Dataclass containing the instrumentation configuration.
+        """
+        config = self.config.instrumentation
+        params = self.params.get('Instrumentation', {})
+        profiler = os.environ.get('PIXI_HR_PROFILER') or params.get('profiler', 'cprofile')
+        if profiler not in ('cprofile', 'sampling'):
+            raise ValueError(f"Unknown profiler '{profiler}', expected 'cprofile' or 'sampling'")
+
+        create_directories([config.root_dir])
+
+        instrumentation_config = InstrumentationConfig(
+            root_dir=config.root_dir,
+            summary_file=config.summary_file,
+            enabled=params.get('enabled', True),
+            profile=os.environ.get('PIXI_HR_PROFILE') or params.get('profile'),
+            profiler=profiler,
+            sample_interval=params.get('sample_interval', 0.001)
+        )
+
+        return instrumentation_config
+
+
+    def get_sampling_config(self, size=None) -> StratifiedSamplingConfig:
+        """
+        Fetches the configuration of sample runs of the pipeline.
+
+        The sample is written where the ingestion stage of a sample run leaves
+        its data, and the metrics are read from the evaluation artifacts of
+        the full and of the sample run.
+
+        Args:
+        - size (float): Fraction or number of postings, overriding config.yaml.
+
+        Returns:
+        - StratifiedSamplingConfig: Dataclass containing the sampling configuration.
+        """
+        config = self.config.sampling
+        source_file = self.config.data_validation.unzip_data_dir
+        full_metrics_file = self.config.model_evaluation.metric_file_name
+
+        create_directories([config.root_dir])
+
+        sampling_config = StratifiedSamplingConfig(
+            root_dir=config.root_dir,
+            source_file=source_file,
+            sample_file=reroot(source_file, self.config.artifacts_root, config.root_dir),
+            full_metrics_file=full_metrics_file,
+            sample_metrics_file=reroot(full_metrics_file, self.config.artifacts_root, config.root_dir),
+            report_file=os.path.join(config.root_dir, 'sample_report.json'),
+            strata=tuple(config.get('strata', ('title', 'job_location'))),
+            size=size if size is not None else config.get('size', 0.05),
+            seed=config.get('seed', 42)
+        )
+
+        return sampling_config
+
+
+    def get_cross_validation_config(self, chosen_model_type="RandomForest") -> CrossValidationConfig:
+        """
+        Fetches the configuration of the k-fold cross-validation of the chosen model.
+
+        Args:
+        - chosen_model_type (str): The desired model type (either "ElasticNet" or "RandomForest").
+
+        Returns:
+        - CrossValidationConfig: Dataclass containing the cross-validation configuration.
+        """
+        config = self.config.cross_validation
+        params = self.params.get('CrossValidation', {})
+
+        create_directories([config.root_dir, config.features_dir])
+
+        cross_validation_config = CrossValidationConfig(
+            root_dir=config.root_dir,
+            folds_file=config.folds_file,
+            features_dir=config.features_dir,
+            report_file=config.report_file,
+            # Fold models are scored on their held-out fold, so out-of-bag predictions would be wasted work
+            model_trainer=dataclasses.replace(self.get_model_trainer_config(chosen_model_type), oob_metrics_file=None),
+            n_splits=params.get('n_splits', 5),
+            seed=params.get('seed', 44),
+            n_jobs=params.get('n_jobs')
+        )
+
+        return cross_validation_config
+
+
+    def get_feature_importance_config(self) -> FeatureImportanceConfig:
+        """
+        Fetches the configuration of the permutation importance of the qual_* features.
+
+        Returns:
+        - FeatureImportanceConfig: Dataclass containing the feature importance configuration.
+        """
+        config = self.config.feature_importance
+        params = self.params.get('FeatureImportance', {})
+        use_text_features = self.params.get('TextFeatures', {}).get('enabled', False)
+
+        create_directories([config.root_dir, config.features_dir])
+
+        feature_importance_config = FeatureImportanceConfig(
+            root_dir=config.root_dir,
+            model_path=config.model_path,
+            test_data_path=config.test_data_path,
+            features_dir=config.features_dir,
+            importance_file=config.importance_file,
+            report_file=config.report_file,
+            target_column=self.schema.TARGET_COLUMN.name,
+            test_text_features_path=config.get('test_text_features_path') if use_text_features else None,
+            n_repeats=params.get('n_repeats', 3),
+            batch_size=params.get('batch_size', 64),
+            n_jobs=params.get('n_jobs'),
+            seed=params.get('seed', 44),
+            time_budget_s=params.get('time_budget_s')
+        )
+
+        return feature_importance_config
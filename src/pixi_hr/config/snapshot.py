@@ -0,0 +1,245 @@
+"""
+snapshot.py
+
+Purpose:
+    Process-wide, read-only snapshot of config.yaml, params.yaml and
+    schema.yaml. The files are parsed and validated once per process, and
+    every ConfigurationManager (one per pipeline stage) shares the result
+    instead of reading them again. The contents are frozen ConfigBoxes, so a
+    stage cannot change the configuration another stage sees.
+
+    Long-running processes call `reload_if_changed()` to pick up edited
+    files: the snapshot is rebuilt only when a file's modification time has
+    changed, and ConfigurationManagers created afterwards see the new one.
+
+    `set_artifacts_root()` moves every artifact path of config.yaml under
+    another root for the rest of the process, so a sample run (main.py
+    --sample) cannot overwrite the artifacts of full runs.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+from box import ConfigBox
+
+from pixi_hr import logger
+from pixi_hr.constants import CONFIG_FILE_PATH, PARAMS_FILE_PATH, SCHEMA_FILE_PATH
+from pixi_hr.utils.common import read_yaml
+
+# Keys every file must define, and their types. Nested dicts are sections, frozensets (see
+# `choices`) list the accepted values; optional keys (read with .get() and a default) are not listed.
+PATH = str
+NUMBER = (int, float)
+OPTIONAL_INT = (int, type(None))
+
+
+def choices(*values):
+    """Schema entry accepting only the given values."""
+    return frozenset(values)
+
+
+CONFIG_SCHEMA = {
+    'artifacts_root': PATH,
+    'data_ingestion': {'root_dir': PATH, 'source_URL': str, 'local_data_file': PATH, 'unzip_dir': PATH},
+    'data_sourcing': {'base_url': str, 'job_searches': list, 'locations': list, 'output_file': PATH,
+                      'page_size': int, 'max_pages': OPTIONAL_INT, 'max_connections': int,
+                      'max_connections_per_host': int, 'requests_per_second': NUMBER, 'parse_workers': int,
+                      'request_timeout': NUMBER, 'max_retries': int, 'link_index_file': PATH, 'cache_file': PATH},
+    'data_validation': {'root_dir': PATH, 'validated_data_file': PATH, 'unzip_data_dir': PATH, 'STATUS_FILE': PATH},
+    'data_transformation': {'root_dir': PATH, 'data_path': PATH, 'vocabulary_file': PATH,
+                            'category_mappings_file': PATH, 'split_strategy': choices('random', 'hash'),
+                            'test_size': float, 'incremental': bool, 'store_dir': PATH,
+                            'feature_store_file': PATH},
+    'model_trainer': {'root_dir': PATH, 'train_data_path': PATH, 'test_data_path': PATH, 'model_name': str},
+    'model_evaluation': {'root_dir': PATH, 'test_data_path': PATH, 'model_path': PATH, 'metric_file_name': PATH,
+                         'mlflow_uri': str},
+    'forest_compaction': {'root_dir': PATH, 'model_path': PATH, 'compact_model_path': PATH, 'report_file': PATH,
+                          'train_data_path': PATH, 'test_data_path': PATH},
+    'batch_scoring': {'root_dir': PATH, 'input_file': PATH, 'output_file': PATH, 'checkpoint_file': PATH,
+                      'model_path': PATH, 'vocabulary_file': PATH, 'category_mappings_file': PATH,
+                      'chunk_size': int, 'workers': OPTIONAL_INT, 'max_pending_chunks': int},
+    'instrumentation': {'root_dir': PATH, 'summary_file': PATH},
+    'sampling': {'root_dir': PATH},
+    'cross_validation': {'root_dir': PATH, 'folds_file': PATH, 'features_dir': PATH, 'report_file': PATH},
+    'feature_importance': {'root_dir': PATH, 'model_path': PATH, 'test_data_path': PATH, 'features_dir': PATH,
+                           'importance_file': PATH, 'report_file': PATH},
+}
+PARAMS_SCHEMA = {
+    'ElasticNet': {'alpha': NUMBER, 'l1_ratio': NUMBER},
+    'RandomForest': {'n_estimators': int, 'max_depth': OPTIONAL_INT, 'min_samples_split': int,
+                     'min_samples_leaf': int, 'random_state': OPTIONAL_INT},
+    'QualificationVocabulary': dict,
+}
+SCHEMA_SCHEMA = {
+    'COLUMNS': dict,
+    'TARGET_COLUMN': {'name': str},
+}
+
+
+def reroot(path, old_root, new_root):
+    """`path` moved from under `old_root` to under `new_root`; other paths are returned unchanged."""
+    path, old_root = str(path), str(old_root).rstrip('/')
+    if path == old_root or path.startswith(old_root + '/'):
+        return str(new_root).rstrip('/') + path[len(old_root):]
+    return path
+
+
+def _reroot_values(content, old_root, new_root):
+    """Copy of parsed YAML with every path under `old_root` moved under `new_root`."""
+    if isinstance(content, dict):
+        return {key: _reroot_values(value, old_root, new_root) for key, value in content.items()}
+    if isinstance(content, list):
+        return [_reroot_values(value, old_root, new_root) for value in content]
+    if isinstance(content, str):
+        return reroot(content, old_root, new_root)
+    return content
+
+
+def validate(content, schema, where):
+    """
+    Checks `content` against `schema`.
+
+    Args:
+    - content (dict): Parsed YAML.
+    - schema (dict): Expected keys, mapped to a type, a tuple of types, the accepted values, or a nested schema.
+    - where (str): Location of `content`, for the error messages.
+
+    Returns:
+    - list: One message per missing key, value of the wrong type or value that is not accepted.
+    """
+    errors = []
+    for key, expected in schema.items():
+        if key not in content:
+            errors.append(f"{where}: missing '{key}'")
+        elif isinstance(expected, dict):
+            if isinstance(content[key], dict):
+                errors.extend(validate(content[key], expected, f"{where}.{key}"))
+            else:
+                errors.append(f"{where}.{key}: expected a section, got {type(content[key]).__name__}")
+        elif isinstance(expected, frozenset):
+            accepted = sorted(expected)
+            if content[key] not in accepted:
+                errors.append(f"{where}.{key}: expected one of {', '.join(map(repr, accepted))}, got {content[key]!r}")
+        else:
+            types = expected if isinstance(expected, tuple) else (expected,)
+            value = content[key]
+            # bool is a subclass of int, but true/false is never a valid count
+            if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                names = ' or '.join(t.__name__ for t in types)
+                errors.append(f"{where}.{key}: expected {names}, got {value!r}")
+    return errors
+
+
+class ConfigSnapshot:
+    """
+    Parsed, validated and frozen contents of the configuration files.
+
+    Attributes:
+    - paths (tuple): Resolved paths of config.yaml, params.yaml and schema.yaml.
+    - config, params, schema (ConfigBox): Frozen contents of each file.
+    """
+
+    def __init__(self, config_filepath, params_filepath, schema_filepath, artifacts_root=None):
+        """
+        Reads and validates the configuration files.
+
+        Args:
+        - artifacts_root (str): Root the artifact paths of config.yaml are moved under, None keeps them.
+
+        Raises:
+        - ValueError: If a file lacks a required key or holds a value of the wrong type or not accepted.
+        """
+        self.paths = tuple(Path(path) for path in (config_filepath, params_filepath, schema_filepath))
+        self.mtimes = self._mtimes()
+        config, params, schema = (read_yaml(path).to_dict() for path in self.paths)
+
+        # Convert 'None' string to Python None object for specific parameters
+        for param, value in params.get('RandomForest', {}).items():
+            if value == 'None':
+                params['RandomForest'][param] = None
+
+        errors = (validate(config, CONFIG_SCHEMA, self.paths[0].name)
+                  + validate(params, PARAMS_SCHEMA, self.paths[1].name)
+                  + validate(schema, SCHEMA_SCHEMA, self.paths[2].name))
+        if errors:
+            raise ValueError("Invalid configuration:\n- " + "\n- ".join(errors))
+        if artifacts_root:
+            config = _reroot_values(config, config['artifacts_root'], artifacts_root)
+
+        self.config = ConfigBox(config, frozen_box=True)
+        self.params = ConfigBox(params, frozen_box=True)
+        self.schema = ConfigBox(schema, frozen_box=True)
+
+    def _mtimes(self):
+        return tuple(os.stat(path).st_mtime_ns for path in self.paths)
+
+    def is_stale(self):
+        """Whether a file changed since the snapshot was taken."""
+        try:
+            return self._mtimes() != self.mtimes
+        except FileNotFoundError:
+            return True
+
+    def section(self, name):
+        """A config.yaml section, e.g. 'data_validation'."""
+        return self.config[name]
+
+
+_snapshots = {}
+_lock = threading.Lock()
+_artifacts_root = None
+
+
+def set_artifacts_root(root):
+    """
+    Moves the artifact paths of the configuration under `root` for the rest of the process.
+
+    ConfigurationManagers created afterwards read and write their artifacts
+    under `root`; None restores the paths of config.yaml.
+    """
+    global _artifacts_root
+    _artifacts_root = str(root) if root else None
+
+
+def _key(config_filepath, params_filepath, schema_filepath):
+    return tuple(Path(path).resolve() for path in (config_filepath, params_filepath, schema_filepath)) + (
+        _artifacts_root,)
+
+
+def get_snapshot(config_filepath=CONFIG_FILE_PATH, params_filepath=PARAMS_FILE_PATH,
+                 schema_filepath=SCHEMA_FILE_PATH):
+    """
+    The snapshot of the given files, read on the first call of the process.
+
+    Returns:
+    - ConfigSnapshot: Shared snapshot.
+    """
+    key = _key(config_filepath, params_filepath, schema_filepath)
+    snapshot = _snapshots.get(key)
+    if snapshot is None:
+        with _lock:
+            snapshot = _snapshots.get(key)
+            if snapshot is None:
+                snapshot = _snapshots[key] = ConfigSnapshot(*key)
+    return snapshot
+
+
+def reload_if_changed(config_filepath=CONFIG_FILE_PATH, params_filepath=PARAMS_FILE_PATH,
+                      schema_filepath=SCHEMA_FILE_PATH):
+    """
+    Rebuilds the snapshot of the given files if one of them changed since it was read.
+
+    Returns:
+    - bool: True if an earlier snapshot was replaced.
+    """
+    key = _key(config_filepath, params_filepath, schema_filepath)
+    with _lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and not snapshot.is_stale():
+            return False
+        # Validated before replacing, so an invalid edit keeps the last good snapshot
+        _snapshots[key] = ConfigSnapshot(*key)
+    if snapshot is not None:
+        logger.info("Configuration files changed; reloaded the configuration.")
+    return snapshot is not None
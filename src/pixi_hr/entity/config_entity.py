@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 @dataclass(frozen=True)
 class DataIngestionConfig:
@@ -11,6 +12,39 @@ class DataIngestionConfig:
     local_data_file: Path
     # Directory where the zipped data will be extracted
     unzip_dir: Path
+    # Where the postings come from: 'zip' or 'scraper'
+    source_type: str = "zip"
+
+
+@dataclass(frozen=True)
+class DataSourcingConfig:
+    # Base URL of the job board
+    base_url: str
+    # Job titles to search for
+    job_searches: list
+    # Locations to search within
+    locations: list
+    # Ingestion artifact the scraped postings are appended to
+    output_file: Path
+    # Number of postings per search result page
+    page_size: int
+    # Upper bound on result pages per search, None for no limit
+    max_pages: Optional[int]
+    # Connection pool size, overall and per host
+    max_connections: int
+    max_connections_per_host: int
+    # Maximum requests per second sent to a single host
+    requests_per_second: float
+    # Number of processes parsing HTML
+    parse_workers: int
+    # Seconds before a request is abandoned
+    request_timeout: float
+    # Number of retries after a failed request
+    max_retries: int
+    # Persistent index of the job links already scraped
+    link_index_file: Path
+    # On-disk HTTP cache, None disables caching
+    cache_file: Optional[Path] = None
 
 
 @dataclass(frozen=True)
@@ -30,6 +64,21 @@ class DataValidationConfig:
     # Store all schema configuration
     all_schema: dict
 
+    # strftime format of 'date_of_job_post'; inferred from the data when None.
+    date_format: Optional[str] = None
+
+    # Near-duplicate detection settings (enabled, columns, shingle_size, num_perm, bands, threshold)
+    near_duplicate_params: Optional[dict] = None
+
+    # Report of the near-duplicate clusters
+    near_duplicate_report_file: Optional[Path] = None
+
+    # Every row failing a check (check, row, column, value); None writes no file
+    violations_file: Optional[Path] = None
+
+    # Failing rows of each check shown in the log
+    max_logged_rows: int = 5
+
 
 @dataclass(frozen=True)
 class DataTransformationConfig:
@@ -42,6 +91,20 @@ class DataTransformationConfig:
     Attributes:
     - root_dir (Path): The root directory where data transformation artifacts are stored.
     - data_path (Path): The path to the dataset (typically CSV) that needs to be transformed.
+    - vocabulary_file (Path): Where the fitted qualification vocabulary is stored.
+    - vocabulary_params (dict): Pruning/hashing settings for the qualification vocabulary.
+    - category_mappings_file (Path): Where the versioned category dictionaries are stored.
+    - split_strategy (str): 'random' or 'hash' train/test assignment.
+    - test_size (float): Fraction of rows assigned to the test set.
+    - incremental (bool): Only transform new or changed postings when a store exists.
+    - store_dir (Path): Directory of the append-only transformed store.
+    - feature_store_file (Path): SQLite feature store keyed by job_link.
+    - text_feature_params (dict): Hashed text feature settings; None or disabled skips them.
+    - train_text_features_file (Path): Text features of the training set (.npz).
+    - test_text_features_file (Path): Text features of the test set (.npz).
+    - posting_index_file (Path): Inverted index of skills, locations and job types (.npz).
+    - similarity_index_dir (Path): Directory of the similar-postings (MinHash LSH) index.
+    - similarity_index_params (dict): MinHash / LSH settings of the similarity index.
     """
 
     # Root directory for storing transformation-related artifacts
@@ -50,6 +113,44 @@ class DataTransformationConfig:
     # Path to the validated dataset for transformation
     data_path: Path
 
+    # Path to the fitted qualification vocabulary
+    vocabulary_file: Path
+
+    # Settings for the qualification vocabulary (mode, min_df, top_k, n_buckets)
+    vocabulary_params: dict
+
+    # Path to the versioned category dictionaries used for categorical encoding
+    category_mappings_file: Path
+
+    # Train/test assignment strategy ('random' or 'hash' on job_link)
+    split_strategy: str = "random"
+
+    # Fraction of rows assigned to the test set
+    test_size: float = 0.2
+
+    # Only transform new or changed postings (requires the 'hash' split strategy)
+    incremental: bool = False
+
+    # Directory of the append-only transformed store
+    store_dir: Path = None
+
+    # SQLite feature store of transformed vectors keyed by job_link
+    feature_store_file: Path = None
+
+    # Hashed text feature settings (enabled, columns, n_features, ngram_range, chunk_size, n_jobs)
+    text_feature_params: Optional[dict] = None
+
+    # Text feature matrices, row-aligned with the train and test CSVs
+    train_text_features_file: Path = None
+    test_text_features_file: Path = None
+
+    # Inverted index of skills, locations and job types over the train and test sets
+    posting_index_file: Path = None
+
+    # Similar-postings index over the qualification profiles, and its MinHash / LSH settings
+    similarity_index_dir: Path = None
+    similarity_index_params: Optional[dict] = None
+
 
 @dataclass(frozen=True)
 class ModelTrainerConfig:
@@ -66,6 +167,11 @@ class ModelTrainerConfig:
     - l1_ratio: The mix between L1 and L2 regularization. 
                 0 <= l1_ratio <= 1. 0 corresponds to L2 (Ridge) and 1 to L1 (Lasso).
     - target_column: Name of the column in the dataset that represents the target variable.
+    - train_text_features_path: Text features stacked with the training features, None to train on qual_* only.
+    - test_text_features_path: Text features stacked with the test features, None to use qual_* only.
+    - compress_level: zlib level of saved models below mmap_threshold_mb, 0 to never compress.
+    - mmap_threshold_mb: Tree array size from which the model is saved uncompressed for memory-mapped loading.
+    - oob_metrics_file: Out-of-bag metrics of a RandomForest, computed while training; None skips them.
     """
 
     root_dir: Path
@@ -75,6 +181,11 @@ class ModelTrainerConfig:
     model_type: str
     model_params: dict
     target_column: str
+    train_text_features_path: Optional[Path] = None
+    test_text_features_path: Optional[Path] = None
+    compress_level: int = 3
+    mmap_threshold_mb: int = 32
+    oob_metrics_file: Optional[Path] = None
 
     
 
@@ -107,3 +218,191 @@ class ModelEvaluationConfig:
     # URI for the MLFlow server or database
     mlflow_uri: str
 
+    # Text features of the test dataset, None when the model uses qual_* only
+    test_text_features_path: Optional[Path] = None
+
+    # Out-of-bag metrics saved by the model trainer, None when they are not computed
+    oob_metrics_file: Optional[Path] = None
+
+    # Report the out-of-bag metrics instead of scoring the test split (quick iterations)
+    use_oob: bool = False
+
+    # Out-of-bag against held-out metrics, and the scoring time saved
+    oob_report_file: Optional[Path] = None
+
+    # Metrics of runs evaluated with the out-of-bag metrics, kept apart from metric_file_name
+    oob_metric_file_name: Optional[Path] = None
+
+
+
+
+@dataclass(frozen=True)
+class ForestCompactionConfig:
+    """Configuration parameters for compacting the trained RandomForest for serving."""
+
+    # Directory of forest compaction artifacts
+    root_dir: Path
+
+    # Trained model, and where the compacted model and the comparison report are saved
+    model_path: Path
+    compact_model_path: Path
+    report_file: Path
+
+    # Transformed datasets (training rows are used for the OOB ranking, test rows for the report)
+    train_data_path: Path
+    test_data_path: Path
+    target_column: str
+
+    # Float types of the split thresholds and leaf values
+    threshold_dtype: str = 'float32'
+    value_dtype: str = 'float32'
+
+    # Keep only this many trees, those with the lowest out-of-bag error (None keeps all)
+    top_k_trees: Optional[int] = None
+
+    # Text features stacked next to the qual_* columns, None when the model uses qual_* only
+    train_text_features_path: Optional[Path] = None
+    test_text_features_path: Optional[Path] = None
+
+
+
+
+@dataclass(frozen=True)
+class BatchScoringConfig:
+    """Configuration parameters for batch scoring of raw posting files."""
+
+    # Directory of batch scoring artifacts
+    root_dir: Path
+
+    # Raw postings to score: .csv, .parquet, or .zip holding a CSV
+    input_file: Path
+
+    # Predictions CSV, written in input order
+    output_file: Path
+
+    # Progress of the current run, used to resume after an interruption
+    checkpoint_file: Path
+
+    # Trained model and the preprocessing artifacts it was trained with
+    model_path: Path
+    vocabulary_file: Path
+    category_mappings_file: Path
+
+    # Name of the predicted column
+    target_column: str
+
+    # Postings per chunk, worker processes, and chunks in flight before reading pauses
+    chunk_size: int = 10000
+    workers: Optional[int] = None
+    max_pending_chunks: int = 8
+
+    # Hashed text feature settings when the model was trained with text features, else None
+    text_feature_params: Optional[dict] = None
+
+
+@dataclass(frozen=True)
+class InstrumentationConfig:
+    """Configuration parameters for the per-stage instrumentation of pipeline runs."""
+
+    # Directory of the run summary and profiles
+    root_dir: Path
+
+    # JSON summary of the last run
+    summary_file: Path
+
+    # Record stages and component methods
+    enabled: bool = True
+
+    # Span to profile: a stage name or "Class.method" (None profiles nothing), and the
+    # profiler: 'cprofile' (deterministic) or 'sampling' (low overhead, folded stacks)
+    profile: Optional[str] = None
+    profiler: str = 'cprofile'
+
+    # Seconds between samples of the sampling profiler and of resident memory
+    sample_interval: float = 0.001
+    memory_interval: float = 0.005
+
+
+@dataclass(frozen=True)
+class StratifiedSamplingConfig:
+    """Configuration parameters for sample runs of the pipeline (main.py --sample)."""
+
+    # Root of the artifacts of sample runs; every stage writes under it instead of artifacts/
+    root_dir: Path
+
+    # Ingested postings the sample is drawn from, and the sample, at the ingestion path of sample runs
+    source_file: Path
+    sample_file: Path
+
+    # Evaluation metrics of the last full run and of the sample run
+    full_metrics_file: Path
+    sample_metrics_file: Path
+
+    # Sampled and full metrics side by side
+    report_file: Path
+
+    # Columns whose value combinations are sampled in proportion to their size
+    strata: tuple = ('title', 'job_location')
+
+    # Fraction of the postings (below 1) or number of postings, and the seed of the draw
+    size: float = 0.05
+    seed: int = 42
+
+
+@dataclass(frozen=True)
+class CrossValidationConfig:
+    """Configuration parameters for the k-fold cross-validation of the configured model."""
+
+    # Directory of cross-validation artifacts
+    root_dir: Path
+
+    # Fold of each training row, reused while the training rows, n_splits and seed are unchanged
+    folds_file: Path
+
+    # Memory-mapped feature matrix and target shared by the fold workers
+    features_dir: Path
+
+    # Metrics and fit time of every fold, with their mean and spread
+    report_file: Path
+
+    # Model, training data and text feature settings of the model trainer stage
+    model_trainer: ModelTrainerConfig
+
+    # Number of folds, seed of the fold assignment, and worker processes (None: one per fold, up to the CPUs)
+    n_splits: int = 5
+    seed: int = 44
+    n_jobs: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class FeatureImportanceConfig:
+    """Configuration parameters for the permutation importance of the qual_* features."""
+
+    # Directory of feature importance artifacts
+    root_dir: Path
+
+    # Trained model, and the test dataset it is scored on
+    model_path: Path
+    test_data_path: Path
+
+    # Memory-mapped test matrix, target and baseline predictions shared by the workers
+    features_dir: Path
+
+    # Ranked importance of every qual_* column (CSV), and the run summary (JSON)
+    importance_file: Path
+    report_file: Path
+
+    # Name of the target column
+    target_column: str
+
+    # Text features of the test dataset, None when the model uses qual_* only
+    test_text_features_path: Optional[Path] = None
+
+    # Shuffles per column, columns per task, worker processes (None uses every CPU) and seed
+    n_repeats: int = 3
+    batch_size: int = 64
+    n_jobs: Optional[int] = None
+    seed: int = 44
+
+    # Seconds after which no further column is permuted (None: no limit)
+    time_budget_s: Optional[float] = None
@@ -0,0 +1,63 @@
+"""
+batch_scoring.py
+
+Purpose:
+    Scores a large file of raw postings with the trained model.
+
+Usage:
+    python -m pixi_hr.pipeline.batch_scoring [--input postings.csv|.parquet|.zip] [--output predictions.csv]
+        [--chunk-size 10000] [--workers 4] [--restart]
+
+    Options default to the batch_scoring section of config/config.yaml. Rerunning
+    an interrupted command resumes after its last completed chunk.
+"""
+
+import argparse
+from dataclasses import replace
+
+from pixi_hr import logger
+from pixi_hr.config.configuration import ConfigurationManager
+from pixi_hr.components.batch_scoring import BatchScorer
+
+
+class BatchScoringPipeline:
+    """
+    Pipeline applying the trained model to a file of raw postings.
+
+    Attributes:
+    - STAGE_NAME (str): Name of the stage (used for logging purposes).
+    """
+
+    STAGE_NAME = "Batch Scoring Stage"
+
+    def main(self, restart=False, **overrides):
+        """
+        Executes batch scoring.
+
+        Args:
+        - restart (bool): Ignore the checkpoint of an earlier run and score the whole input again.
+        - overrides: BatchScoringConfig fields replacing the configured values (None values are ignored).
+        """
+        config = ConfigurationManager().get_batch_scoring_config()
+        config = replace(config, **{key: value for key, value in overrides.items() if value is not None})
+
+        BatchScorer(config=config).main(restart=restart)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", dest="input_file", help="Raw postings (.csv, .parquet or .zip).")
+    parser.add_argument("--output", dest="output_file", help="Predictions CSV.")
+    parser.add_argument("--chunk-size", type=int, help="Postings per chunk.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over.")
+    args = parser.parse_args()
+
+    try:
+        logger.info(f">>>>>> Stage: {BatchScoringPipeline.STAGE_NAME} started <<<<<<")
+        BatchScoringPipeline().main(restart=args.restart, input_file=args.input_file, output_file=args.output_file,
+                                    chunk_size=args.chunk_size, workers=args.workers)
+        logger.info(f">>>>>> Stage {BatchScoringPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+    except Exception as e:
+        logger.exception(f"Error encountered during the {BatchScoringPipeline.STAGE_NAME}: {e}")
+        raise
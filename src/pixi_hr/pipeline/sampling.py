@@ -0,0 +1,60 @@
+import os
+from pathlib import Path
+
+from pixi_hr import logger
+from pixi_hr.config.configuration import ConfigurationManager
+from pixi_hr.config.snapshot import set_artifacts_root
+from pixi_hr.components.stratified_sampler import StratifiedSampler
+
+
+class StratifiedSamplingPipeline:
+    """
+    Pipeline class of the sampling stage of sample runs (main.py --sample).
+
+    This pipeline performs the following steps:
+    1. Initializes the configuration manager.
+    2. Fetches the sampling configuration.
+    3. Draws a stratified sample of the ingested postings into the ingestion artifacts of the sample run.
+    4. Moves the artifacts of the following stages under the sample root, and MLflow runs into a local store.
+
+    After the remaining stages, `report()` compares the sampled metrics with the last full run.
+
+    Attributes:
+    - STAGE_NAME (str): Name of the stage (used for logging purposes).
+    - config (StratifiedSamplingConfig): Sampling configuration.
+    """
+
+    STAGE_NAME = "Stratified Sampling Stage"
+
+    def __init__(self, size=None):
+        """
+        Initializes the StratifiedSamplingPipeline.
+
+        Args:
+        - size (float): Fraction or number of postings, overriding config.yaml.
+        """
+        # Step 1 and 2: read with the paths of full runs, before the artifacts are moved
+        self.config = ConfigurationManager().get_sampling_config(size=size)
+        self.sampler = StratifiedSampler(config=self.config)
+        self.sample_rows = None
+
+    def main(self):
+        """
+        Executes the main functionality of the StratifiedSamplingPipeline.
+        """
+        # Step 3: Draw the sample
+        self.sample_rows = self.sampler.main()
+
+        # Step 4: Isolate the artifacts and the MLflow runs of the sample run
+        set_artifacts_root(self.config.root_dir)
+        os.environ['MLFLOW_TRACKING_URI'] = Path(self.config.root_dir, 'mlruns').resolve().as_uri()
+        logger.info(f"Artifacts of this sample run are written under {self.config.root_dir}")
+
+    def report(self):
+        """
+        Compares the metrics of the sample run with those of the last full run.
+
+        Returns:
+        - dict: Comparison report (see StratifiedSampler.compare_metrics).
+        """
+        return self.sampler.compare_metrics(self.sample_rows)
@@ -23,6 +23,16 @@ class DataIngestionTrainingPipeline:
             # Fetch the data ingestion-specific configuration
             data_ingestion_config = config.get_data_ingestion_config()
             
+            if data_ingestion_config.source_type == "scraper":
+                logger.info("Scraping new job postings...")
+                # Imported here so the zip source does not load the HTTP client
+                from pixi_hr.components.data_sourcing import DataSourcing
+
+                # Scrape postings straight into the ingestion artifact
+                data_sourcing = DataSourcing(config=config.get_data_sourcing_config())
+                data_sourcing.main()
+                return
+
             logger.info("Initializing data ingestion process...")
             # Initialize the data ingestion process with the fetched configuration
             data_ingestion = DataIngestion(config=data_ingestion_config)
@@ -51,7 +51,10 @@ class DataValidationTrainingPipeline:
             ("Job Link Validation", data_validation.validate_job_link),
             ("Job Type Validation", data_validation.validate_job_type),
             ("Job Qualifications Validation", data_validation.validate_job_qualifications),
-            ("Duplicate Entries Handling", data_validation.handle_duplicates)
+            ("Content Hashing", data_validation.add_content_hashes),
+            ("Duplicate Entries Handling", data_validation.handle_duplicates),
+            ("Near-Duplicate Entries Handling", data_validation.handle_near_duplicates),
+            ("Saving Validated Data", data_validation.save_validated_data)
         ]
 
         for validation_name, validation_function in validations:
@@ -0,0 +1,56 @@
+from pixi_hr import logger
+from pixi_hr.config.configuration import ConfigurationManager
+from pixi_hr.components.forest_compaction import ForestCompaction
+
+
+class ForestCompactionPipeline:
+    """
+    Pipeline class for the forest compaction phase.
+
+    This pipeline performs the following steps:
+    1. Initializes the configuration manager.
+    2. Fetches the forest compaction configuration.
+    3. Initializes the ForestCompaction component.
+    4. Compacts the trained model and reports accuracy, size and latency against the original.
+
+    Attributes:
+    - STAGE_NAME (str): Name of the stage (used for logging purposes).
+    - config_manager (ConfigurationManager): Instance of the configuration manager.
+
+    Methods:
+    - main(): Executes the main functionality of the ForestCompactionPipeline.
+    """
+
+    STAGE_NAME = "Forest Compaction Stage"
+
+    def __init__(self):
+        """
+        Initializes the ForestCompactionPipeline.
+        Sets up the configuration manager.
+        """
+        # Step 1: Initialize Configuration Manager
+        self.config_manager = ConfigurationManager()
+
+    def main(self):
+        """
+        Executes the main functionality of the ForestCompactionPipeline.
+        """
+        # Step 2: Fetch Forest Compaction Configuration
+        forest_compaction_config = self.config_manager.get_forest_compaction_config()
+
+        # Step 3: Initialize Forest Compaction Component
+        forest_compaction = ForestCompaction(config=forest_compaction_config)
+
+        # Step 4: Compact the model and write the report
+        forest_compaction.main()
+
+
+if __name__ == '__main__':
+    try:
+        logger.info(f">>>>>> Stage: {ForestCompactionPipeline.STAGE_NAME} started <<<<<<")
+        forest_compaction_pipeline = ForestCompactionPipeline()
+        forest_compaction_pipeline.main()
+        logger.info(f">>>>>> Stage {ForestCompactionPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+    except Exception as e:
+        logger.exception(f"Error encountered during the {ForestCompactionPipeline.STAGE_NAME}: {e}")
+        raise
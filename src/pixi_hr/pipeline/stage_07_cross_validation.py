@@ -0,0 +1,56 @@
+from pixi_hr import logger
+from pixi_hr.config.configuration import ConfigurationManager
+from pixi_hr.components.cross_validation import CrossValidation
+
+
+class CrossValidationPipeline:
+    """
+    Pipeline class for the cross-validation phase.
+
+    This pipeline performs the following steps:
+    1. Initializes the configuration manager.
+    2. Fetches the cross-validation configuration.
+    3. Initializes the CrossValidation component.
+    4. Fits the folds in parallel and reports the mean and spread of their metrics.
+
+    Attributes:
+    - STAGE_NAME (str): Name of the stage (used for logging purposes).
+    - config_manager (ConfigurationManager): Instance of the configuration manager.
+
+    Methods:
+    - main(): Executes the main functionality of the CrossValidationPipeline.
+    """
+
+    STAGE_NAME = "Cross Validation Stage"
+
+    def __init__(self):
+        """
+        Initializes the CrossValidationPipeline.
+        Sets up the configuration manager.
+        """
+        # Step 1: Initialize Configuration Manager
+        self.config_manager = ConfigurationManager()
+
+    def main(self):
+        """
+        Executes the main functionality of the CrossValidationPipeline.
+        """
+        # Step 2: Fetch Cross-Validation Configuration
+        cross_validation_config = self.config_manager.get_cross_validation_config()
+
+        # Step 3: Initialize Cross-Validation Component
+        cross_validation = CrossValidation(config=cross_validation_config)
+
+        # Step 4: Cross-validate the model and write the report
+        cross_validation.main()
+
+
+if __name__ == '__main__':
+    try:
+        logger.info(f">>>>>> Stage: {CrossValidationPipeline.STAGE_NAME} started <<<<<<")
+        cross_validation_pipeline = CrossValidationPipeline()
+        cross_validation_pipeline.main()
+        logger.info(f">>>>>> Stage {CrossValidationPipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+    except Exception as e:
+        logger.exception(f"Error encountered during the {CrossValidationPipeline.STAGE_NAME}: {e}")
+        raise
@@ -0,0 +1,56 @@
+from pixi_hr import logger
+from pixi_hr.config.configuration import ConfigurationManager
+from pixi_hr.components.feature_importance import FeatureImportance
+
+
+class FeatureImportancePipeline:
+    """
+    Pipeline class for the feature importance phase.
+
+    This pipeline performs the following steps:
+    1. Initializes the configuration manager.
+    2. Fetches the feature importance configuration.
+    3. Initializes the FeatureImportance component.
+    4. Ranks the qual_* columns by permutation importance, next to the native importances.
+
+    Attributes:
+    - STAGE_NAME (str): Name of the stage (used for logging purposes).
+    - config_manager (ConfigurationManager): Instance of the configuration manager.
+
+    Methods:
+    - main(): Executes the main functionality of the FeatureImportancePipeline.
+    """
+
+    STAGE_NAME = "Feature Importance Stage"
+
+    def __init__(self):
+        """
+        Initializes the FeatureImportancePipeline.
+        Sets up the configuration manager.
+        """
+        # Step 1: Initialize Configuration Manager
+        self.config_manager = ConfigurationManager()
+
+    def main(self):
+        """
+        Executes the main functionality of the FeatureImportancePipeline.
+        """
+        # Step 2: Fetch Feature Importance Configuration
+        feature_importance_config = self.config_manager.get_feature_importance_config()
+
+        # Step 3: Initialize Feature Importance Component
+        feature_importance = FeatureImportance(config=feature_importance_config)
+
+        # Step 4: Permute the qual_* columns and write the ranked importances
+        feature_importance.main()
+
+
+if __name__ == '__main__':
+    try:
+        logger.info(f">>>>>> Stage: {FeatureImportancePipeline.STAGE_NAME} started <<<<<<")
+        feature_importance_pipeline = FeatureImportancePipeline()
+        feature_importance_pipeline.main()
+        logger.info(f">>>>>> Stage {FeatureImportancePipeline.STAGE_NAME} completed <<<<<< \n\nx==========x")
+    except Exception as e:
+        logger.exception(f"Error encountered during the {FeatureImportancePipeline.STAGE_NAME}: {e}")
+        raise
@@ -6,21 +6,21 @@ Purpose:
 """
 
 from pathlib import Path
-from typing import Any, List
+from typing import Any, List, Optional
 import os
+import sys
 import yaml
 import json
-import joblib
 
 from box import ConfigBox
 from box.exceptions import BoxValueError
-from ensure import ensure_annotations
 from typing import Union
 
 from pixi_hr import logger
 
+# joblib and numpy are imported by the helpers using them, so reading the configuration stays cheap
+
 
-@ensure_annotations
 def read_yaml(path_to_yaml: Path) -> ConfigBox:
     """
     Reads a yaml file, and returns a ConfigBox object.
@@ -48,7 +48,6 @@ def read_yaml(path_to_yaml: Path) -> ConfigBox:
         raise e
 
 
-@ensure_annotations
 def create_directories(path_to_directories: list, verbose=True):
     """
     Create a list of directories.
@@ -70,7 +69,6 @@ def create_directories(path_to_directories: list, verbose=True):
             raise
 
 
-@ensure_annotations
 def save_json(path: Path, data: dict):
     """
     Save json data
@@ -91,7 +89,6 @@ def save_json(path: Path, data: dict):
         raise
 
 
-@ensure_annotations
 def load_json(path: Path) -> ConfigBox:
     """
     Load json files data
@@ -121,18 +118,21 @@ def load_json(path: Path) -> ConfigBox:
         raise
 
 
-@ensure_annotations
-def save_bin(data: Any, path: Path):
+def save_bin(data: Any, path: Path, compress: int = 0):
     """
     Save binary file
 
     Args:
         data (Any): data to be saved as binary
         path (Path): path to binary file
+        compress (int, optional): zlib level from 1 to 9, 0 keeps the file uncompressed
+            so that load_bin can memory-map its arrays. Defaults to 0.
     """
+    import joblib
+
     try:
-        joblib.dump(value=data, filename=path)
-        logger.info(f"binary file saved at: {path}")
+        joblib.dump(value=data, filename=path, compress=compress)
+        logger.info(f"binary file saved at: {path}" + (f" (compressed, level {compress})" if compress else ""))
     except PermissionError:
         logger.error(f"Permission denied to write to {path}")
         raise
@@ -141,20 +141,41 @@ def save_bin(data: Any, path: Path):
         raise
 
 
-@ensure_annotations
-def load_bin(path: Path) -> Any:
+def is_compressed_bin(path: Path) -> bool:
+    """
+    Check whether a joblib file was saved with compression
+
+    Args:
+        path (Path): path to binary file
+
+    Returns:
+        bool: False for a plain pickle, whose arrays can be memory-mapped
+    """
+    with open(path, "rb") as f:
+        # Uncompressed pickles start with the PROTO opcode
+        return f.read(1) != b"\x80"
+
+
+def load_bin(path: Path, mmap_mode=None) -> Any:
     """
     Load binary data
 
     Args:
         path (Path): path to binary file
+        mmap_mode (str, optional): 'r' or 'c' to memory-map the NumPy arrays of an
+            uncompressed file instead of reading them onto the heap. Ignored for
+            compressed files. Defaults to None.
 
     Returns:
         Any: object stored in the file
     """
+    import joblib
+
     try:
-        data = joblib.load(path)
-        logger.info(f"binary file loaded from: {path}")
+        if mmap_mode and is_compressed_bin(path):
+            mmap_mode = None
+        data = joblib.load(path, mmap_mode=mmap_mode)
+        logger.info(f"binary file loaded from: {path}" + (f" (mmap_mode={mmap_mode})" if mmap_mode else ""))
         return data
     except FileNotFoundError:
         logger.error(f"File not found at {path}")
@@ -167,7 +188,77 @@ def load_bin(path: Path) -> Any:
         raise
 
 
-@ensure_annotations
+def save_matrix(matrix: Any, directory: Path, name: str):
+    """
+    Save a dense or CSR matrix as .npy files that load_matrix can memory-map
+
+    Args:
+        matrix (Any): NumPy array, or scipy.sparse matrix (saved as CSR)
+        directory (Path): directory of the .npy files
+        name (str): name of the matrix; a dense matrix is saved as <name>.npy, a sparse
+            one as <name>_data.npy, <name>_indices.npy, <name>_indptr.npy and <name>_shape.npy
+    """
+    import numpy as np
+    from scipy import sparse
+
+    if sparse.issparse(matrix):
+        matrix = sparse.csr_matrix(matrix)
+        arrays = {f"{name}_data": matrix.data, f"{name}_indices": matrix.indices,
+                  f"{name}_indptr": matrix.indptr, f"{name}_shape": np.array(matrix.shape)}
+    else:
+        arrays = {name: np.asarray(matrix)}
+    for array_name, array in arrays.items():
+        np.save(Path(directory, f"{array_name}.npy"), array)
+
+
+def load_matrix(directory: Path, name: str, mmap_mode: str = "r") -> Any:
+    """
+    Load a matrix saved by save_matrix
+
+    Args:
+        directory (Path): directory of the .npy files
+        name (str): name of the matrix
+        mmap_mode (str, optional): memory-map the arrays instead of reading them
+            onto the heap, None reads them. Defaults to 'r'.
+
+    Returns:
+        Any: NumPy array, or scipy.sparse.csr_matrix over the memory-mapped arrays
+    """
+    import numpy as np
+    from scipy import sparse
+
+    dense = Path(directory, f"{name}.npy")
+    if dense.exists():
+        return np.load(dense, mmap_mode=mmap_mode)
+    load = lambda part: np.load(Path(directory, f"{name}_{part}.npy"), mmap_mode=mmap_mode)
+    return sparse.csr_matrix((load("data"), load("indices"), load("indptr")),
+                             shape=tuple(np.load(Path(directory, f"{name}_shape.npy"))), copy=False)
+
+
+def model_nbytes(model: Any) -> int:
+    """
+    Get the size of the tree arrays of a fitted tree or tree ensemble
+
+    Args:
+        model (Any): fitted scikit-learn model
+
+    Returns:
+        int: bytes held by the node and value arrays, 0 for models without trees
+    """
+    import numpy as np
+
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        estimators = [model]
+    nbytes = 0
+    for estimator in np.ravel(estimators):
+        tree = getattr(estimator, "tree_", None)
+        if tree is not None:
+            state = tree.__getstate__()
+            nbytes += state["nodes"].nbytes + state["values"].nbytes
+    return nbytes
+
+
 def get_size(path: Path) -> str:
     """
     Get size in KB
@@ -189,4 +280,49 @@ def get_size(path: Path) -> str:
         raise
     except OSError as e:
         logger.error(f"Failed to get size for {path}. Error: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def memory_mb(*fields: str) -> tuple:
+    """
+    Read memory counters of this process from /proc/self/status
+
+    Args:
+        fields (str): counters to read, e.g. "VmRSS" (resident), "RssAnon" (resident anonymous memory)
+
+    Returns:
+        tuple: each counter in MB, or Nones where /proc is not available
+    """
+    try:
+        with open("/proc/self/status") as f:
+            status = dict(line.split(":", 1) for line in f)
+        return tuple(int(status[field].split()[0]) / 1024 for field in fields)
+    except (OSError, KeyError, ValueError):
+        return (None,) * len(fields)
+
+
+def rss_mb() -> Optional[float]:
+    """
+    Get the current resident set size of this process
+
+    Returns:
+        float: RSS in MB, or None where /proc is not available
+    """
+    return memory_mb("VmRSS")[0]
+
+
+def peak_rss_mb() -> float:
+    """
+    Get the peak resident set size of this process and its finished children
+
+    Returns:
+        float: peak RSS in MB, or 0.0 where the platform does not report it
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is reported in bytes on macOS and in KB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,72 @@
+"""
+hashing.py
+
+Purpose:
+    Stable hashing helpers for the PixiHR project. Unlike Python's built-in
+    `hash`, these digests do not depend on PYTHONHASHSEED or the pandas
+    version, so they can be persisted and compared across runs.
+"""
+
+import hashlib
+
+import numpy as np
+
+# Resolution of the hash split: test_size is honoured to 1/SPLIT_BUCKETS
+SPLIT_BUCKETS = 10_000
+
+
+def stable_hash(values) -> np.ndarray:
+    """
+    Computes a 64-bit BLAKE2b digest of each value's string form.
+
+    Args:
+        values (iterable): Values to hash, e.g. a column of job links.
+
+    Returns:
+        np.ndarray: uint64 digests, one per value.
+    """
+    digests = [hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest() for value in values]
+    return np.frombuffer(b"".join(digests), dtype="<u8")
+
+
+def hash_split_mask(keys, test_size: float) -> np.ndarray:
+    """
+    Assigns each key to the test set based only on its own hash.
+
+    A key goes to the test set when its 64-bit digest modulo SPLIT_BUCKETS is
+    below round(test_size * SPLIT_BUCKETS).
+
+    A key's assignment never changes when other keys are added or removed,
+    so rows can be appended to existing train/test shards.
+
+    Args:
+        keys (iterable): Stable row identifiers, e.g. 'job_link'.
+        test_size (float): Fraction of keys assigned to the test set.
+
+    Returns:
+        np.ndarray: Boolean mask, True where the key belongs to the test set.
+    """
+    if not 0 < test_size < 1:
+        raise ValueError("test_size must be between 0 and 1")
+    return stable_hash(keys) % SPLIT_BUCKETS < round(test_size * SPLIT_BUCKETS)
+
+
+def row_content_hash(df, columns) -> list:
+    """
+    Computes a stable content hash of each row over the given columns.
+
+    Missing values hash like empty strings; columns are joined with a unit
+    separator so that values cannot run into each other.
+
+    Args:
+        df (pd.DataFrame): Data to hash.
+        columns (list): Columns that make up a row's content.
+
+    Returns:
+        list: 16 character hexadecimal digests, one per row.
+    """
+    joined = None
+    for col in columns:
+        text = df[col].astype(str).where(df[col].notna(), "")
+        joined = text if joined is None else joined + "\x1f" + text
+    return [f"{digest:016x}" for digest in stable_hash(joined)]
@@ -0,0 +1,295 @@
+"""
+instrumentation.py
+
+Purpose:
+    Records where a pipeline run spends its time and resources. Every
+    pipeline stage, and every public method of the instrumented component
+    classes, is recorded as a span with its wall and CPU time, peak resident
+    memory, rows in and out, and bytes read and written. The run summary is
+    written as JSON under artifacts/ when the run ends, including when it
+    fails.
+
+    A span (a stage name, or a "Class.method") can also be profiled, with
+    cProfile (a .prof file, plus the top functions as text) or with a
+    sampling profiler (stacks in the folded format read by flamegraph.pl and
+    speedscope), selected in params.yaml or with the PIXI_HR_PROFILE and
+    PIXI_HR_PROFILER environment variables.
+
+    Memory and I/O are read from /proc and reported as None elsewhere. CPU
+    time includes finished child processes (e.g. worker pools); bytes count
+    read and write calls, so memory-mapped reads are not included.
+"""
+
+import cProfile
+import datetime
+import functools
+import inspect
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from pixi_hr import logger
+from pixi_hr.entity.config_entity import InstrumentationConfig
+from pixi_hr.utils.common import save_json, rss_mb
+
+# Component attributes holding the rows a method works on, in order of preference
+ROW_ATTRIBUTES = ('df', 'train_data', 'test_data')
+
+
+def io_bytes():
+    """Bytes read and written by this process so far, or (None, None) without /proc."""
+    try:
+        with open('/proc/self/io') as f:
+            counters = dict(line.split(':', 1) for line in f)
+        return int(counters['rchar']), int(counters['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def cpu_seconds():
+    """CPU time of this process and its finished children."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def row_count(value):
+    """Rows of a DataFrame or array, or None for anything else."""
+    shape = getattr(value, 'shape', None)
+    return int(shape[0]) if shape else None
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread at a fixed interval.
+
+    Attributes:
+    - interval (float): Seconds between samples.
+    - stacks (Counter): Samples per stack, as "outer;...;inner" frames.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[';'.join(reversed(frames))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        """Writes the samples in the folded stack format."""
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Instrumentation:
+    """
+    Records spans (stages and component methods) of a pipeline run.
+
+    Usage:
+        with instrumentation.run(component_classes):
+            with instrumentation.stage(pipeline.STAGE_NAME):
+                pipeline.main()
+
+    Attributes:
+    - config (InstrumentationConfig): Instrumentation configuration.
+    - spans (list): Recorded spans, in the order they started.
+    """
+
+    def __init__(self, config: InstrumentationConfig):
+        """
+        Initializes the Instrumentation.
+
+        Args:
+        - config (InstrumentationConfig): Instrumentation configuration.
+        """
+        self.config = config
+        self.spans = []
+        self._open = []
+        self._patched = []
+        self._profiling = False
+
+    def _sample_memory(self, stop):
+        """Raises the peak memory of every open span until `stop` is set."""
+        while not stop.wait(self.config.memory_interval):
+            current = rss_mb()
+            if current is None:
+                return
+            for span in list(self._open):
+                span['peak_rss_mb'] = max(span['peak_rss_mb'], current)
+
+    def _profile_path(self, name, suffix):
+        """Profile file of a span, named after it."""
+        return Path(self.config.root_dir, re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') + suffix)
+
+    @contextmanager
+    def _profile(self, name, span):
+        """Profiles the span when it is the configured target."""
+        if self._profiling or name != self.config.profile:
+            yield
+            return
+
+        self._profiling = True
+        if self.config.profiler == 'sampling':
+            profiler = SamplingProfiler(self.config.sample_interval)
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiling = False
+            if self.config.profiler == 'sampling':
+                profiler.stop()
+                path = self._profile_path(name, '.folded')
+                profiler.dump(path)
+            else:
+                profiler.disable()
+                path = self._profile_path(name, '.prof')
+                profiler.dump_stats(path)
+                report = io.StringIO()
+                pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+                path.with_suffix('.txt').write_text(report.getvalue())
+            span['profile'] = str(path)
+            logger.info(f"Profile of {name} written to {path}")
+
+    @contextmanager
+    def span(self, name, kind, rows_in=None):
+        """
+        Records the enclosed block as a span.
+
+        Args:
+        - name (str): Stage name or "Class.method".
+        - kind (str): 'stage' or 'method'.
+        - rows_in (int): Rows the span starts with, if known.
+
+        Yields:
+        - dict: The span, whose 'rows_out' the caller may set.
+        """
+        if not self.config.enabled:
+            yield {}
+            return
+
+        start_rss = rss_mb()
+        span = {'name': name, 'kind': kind, 'parent': self._open[-1]['name'] if self._open else None,
+                'depth': len(self._open), 'status': 'ok', 'rows_in': rows_in, 'rows_out': None,
+                'peak_rss_mb': start_rss}
+        self.spans.append(span)
+        self._open.append(span)
+        read, written = io_bytes()
+        wall, cpu = time.perf_counter(), cpu_seconds()
+        try:
+            with self._profile(name, span):
+                yield span
+        except BaseException:
+            span['status'] = 'error'
+            raise
+        finally:
+            span['wall_s'] = round(time.perf_counter() - wall, 4)
+            span['cpu_s'] = round(cpu_seconds() - cpu, 4)
+            end_rss = rss_mb()
+            if start_rss is not None:
+                span['peak_rss_mb'] = round(max(span['peak_rss_mb'], end_rss), 1)
+                span['rss_delta_mb'] = round(end_rss - start_rss, 1)
+            end_read, end_written = io_bytes()
+            if read is not None:
+                span['bytes_read'], span['bytes_written'] = end_read - read, end_written - written
+            self._open = [other for other in self._open if other is not span]
+
+    def stage(self, name):
+        """Records a pipeline stage."""
+        return self.span(name, 'stage')
+
+    def _wrap(self, owner, func):
+        """Wraps a component method so that every call is recorded."""
+        name = f"{owner}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(component, *args, **kwargs):
+            rows_in = next((row_count(getattr(component, attr)) for attr in ROW_ATTRIBUTES
+                            if hasattr(component, attr)), None)
+            with self.span(name, 'method', rows_in=rows_in) as span:
+                result = func(component, *args, **kwargs)
+                rows_out = row_count(result)
+                if rows_out is None:
+                    rows_out = next((row_count(getattr(component, attr)) for attr in ROW_ATTRIBUTES
+                                     if hasattr(component, attr)), None)
+                span['rows_out'] = rows_out
+                return result
+
+        return wrapper
+
+    def instrument(self, cls):
+        """Records calls of `cls.__init__` and of its public methods, until the run ends."""
+        if not self.config.enabled or any(patched is cls for patched, _, _ in self._patched):
+            return
+        for name, attr in list(vars(cls).items()):
+            if inspect.isfunction(attr) and (name == '__init__' or not name.startswith('_')):
+                setattr(cls, name, self._wrap(cls.__name__, attr))
+                self._patched.append((cls, name, attr))
+
+    def summary(self, started):
+        """The run summary: totals of the top-level spans, and every span."""
+        top = [span for span in self.spans if span['depth'] == 0]
+        peaks = [span['peak_rss_mb'] for span in top if span.get('peak_rss_mb') is not None]
+        return {'started': started, 'finished': datetime.datetime.now().isoformat(timespec='seconds'),
+                'status': 'error' if any(span['status'] == 'error' for span in top) else 'ok',
+                'wall_s': round(sum(span.get('wall_s', 0) for span in top), 4),
+                'cpu_s': round(sum(span.get('cpu_s', 0) for span in top), 4),
+                'peak_rss_mb': max(peaks) if peaks else None,
+                'profile': self.config.profile, 'spans': self.spans}
+
+    @contextmanager
+    def run(self, component_classes=()):
+        """
+        Instruments the component classes for the enclosed run, and writes the summary when it ends.
+
+        Args:
+        - component_classes (iterable): Classes whose methods are recorded.
+        """
+        if not self.config.enabled:
+            yield self
+            return
+
+        os.makedirs(self.config.root_dir, exist_ok=True)
+        for cls in component_classes:
+            self.instrument(cls)
+        started = datetime.datetime.now().isoformat(timespec='seconds')
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample_memory, args=(stop,), daemon=True)
+        sampler.start()
+        try:
+            yield self
+        finally:
+            stop.set()
+            sampler.join()
+            for cls, name, attr in reversed(self._patched):
+                setattr(cls, name, attr)
+            self._patched.clear()
+            save_json(path=Path(self.config.summary_file), data=self.summary(started))
+            logger.info(f"Run summary written to {self.config.summary_file}")
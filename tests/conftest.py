@@ -0,0 +1,13 @@
+"""
+Test configuration: makes the pixi_hr package (src/) and the benchmarks importable
+without installing the project.
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+for path in (PROJECT_ROOT / "src", PROJECT_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,28 @@
+import inspect
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import _forest
+
+from pixi_hr.components.compact_forest import CompactForest
+
+
+def sklearn_unsampled_indices(estimator, n_samples, max_samples):
+    """Out-of-bag rows of a tree as sklearn computes them for oob_score, for either helper signature."""
+    if 'sample_weight' in inspect.signature(_forest._get_n_samples_bootstrap).parameters:
+        n_bootstrap = _forest._get_n_samples_bootstrap(n_samples, max_samples, None)
+        return _forest._generate_unsampled_indices(estimator.random_state, n_samples, n_bootstrap, None)
+    n_bootstrap = _forest._get_n_samples_bootstrap(n_samples, max_samples)
+    return _forest._generate_unsampled_indices(estimator.random_state, n_samples, n_bootstrap)
+
+
+@pytest.mark.parametrize("max_samples", [None, 0.5, 0.999, 150])
+def test_oob_masks_match_sklearn(max_samples):
+    # 0.5 * 203 = 101.5 and 0.999 * 203 = 202.8: rounding would draw one row more than sklearn
+    rng = np.random.default_rng(0)
+    x, y = rng.random((203, 4)), rng.random(203)
+    model = RandomForestRegressor(n_estimators=5, max_samples=max_samples, random_state=3).fit(x, y)
+
+    for estimator, mask in zip(model.estimators_, CompactForest.oob_masks(model, len(x))):
+        assert np.array_equal(np.flatnonzero(mask), sklearn_unsampled_indices(estimator, len(x), max_samples))
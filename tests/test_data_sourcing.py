@@ -0,0 +1,130 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pandas as pd
+import pytest
+
+from pixi_hr.components.data_sourcing import DataSourcing
+from pixi_hr.components.http_cache import JobLinkIndex
+from pixi_hr.entity.config_entity import DataSourcingConfig
+
+# Search result and posting pages recorded from SimplyHired
+PAGES_DIR = Path(__file__).parent / "data" / "simplyhired"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the recorded pages, with ETags, and the failures set in `server.behaviour`."""
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        self.server.requests.append((path, dict(self.headers)))
+        if path == '/search':
+            return self._send(200, (PAGES_DIR / "search.html").read_bytes())
+
+        key = path.rsplit('/', 1)[-1]
+        behaviour = self.server.behaviour.pop(key, None) if path.startswith('/job/') else 'missing'
+        if behaviour == 'missing' or not (PAGES_DIR / f"job_{key}.html").exists():
+            return self._send(404)
+        if behaviour == 'error':
+            # Fails every request until the behaviour is cleared
+            self.server.behaviour[key] = behaviour
+            return self._send(500)
+        etag = f'"{key}"'
+        if behaviour == 'not_modified' or self.headers.get('If-None-Match') == etag:
+            return self._send(304)
+        return self._send(200, (PAGES_DIR / f"job_{key}.html").read_bytes(), {'ETag': etag})
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.behaviour, server.requests = {}, []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def sourcing_config(server, tmp_path):
+    return DataSourcingConfig(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}", job_searches=["Data Scientist"],
+        locations=["Toronto"], output_file=tmp_path / "jobs.csv", page_size=20, max_pages=None,
+        max_connections=4, max_connections_per_host=4, requests_per_second=1000, parse_workers=1,
+        request_timeout=5, max_retries=1, link_index_file=tmp_path / "job_links.sqlite",
+        cache_file=tmp_path / "http_cache.sqlite")
+
+
+def indexed_links(config):
+    index = JobLinkIndex(config.link_index_file)
+    try:
+        return {key for key in ('a1b2c3', 'd4e5f6', 'g7h8i9') if f"{config.base_url}/job/{key}" in index}
+    finally:
+        index.close()
+
+
+def test_postings_whose_details_fail_are_scraped_by_the_next_run(server, tmp_path):
+    config = sourcing_config(server, tmp_path)
+    server.behaviour['d4e5f6'] = 'error'
+    DataSourcing(config).main()
+
+    first = pd.read_csv(config.output_file)
+    assert sorted(first['job_link'].str.rsplit('/', n=1).str[-1]) == ['a1b2c3', 'g7h8i9']
+    assert first['job_type'].notna().all()
+    assert indexed_links(config) == {'a1b2c3', 'g7h8i9'}
+
+    server.behaviour.clear()
+    DataSourcing(config).main()
+
+    second = pd.read_csv(config.output_file)
+    assert sorted(second['job_link'].str.rsplit('/', n=1).str[-1]) == ['a1b2c3', 'd4e5f6', 'g7h8i9']
+    assert second.set_index('job_link').loc[f"{config.base_url}/job/d4e5f6", 'job_type'] == 'Contract'
+    assert indexed_links(config) == {'a1b2c3', 'd4e5f6', 'g7h8i9'}
+
+
+def test_not_modified_for_an_uncached_page_is_fetched_again(server, tmp_path):
+    config = sourcing_config(server, tmp_path)
+    server.behaviour['g7h8i9'] = 'not_modified'
+    DataSourcing(config).main()
+
+    postings = pd.read_csv(config.output_file).set_index('job_link')
+    posting = postings.loc[f"{config.base_url}/job/g7h8i9"]
+    assert posting['job_type'] == 'Full-time'
+    assert posting['job_description'] == 'Fine-tune transformers on support tickets.'
+
+    requests = [headers for path, headers in server.requests if path == '/job/g7h8i9']
+    assert len(requests) == 2
+    assert 'If-None-Match' not in requests[1]
+
+
+def test_links_are_indexed_after_their_rows_reach_the_output(server, tmp_path, monkeypatch):
+    config = sourcing_config(server, tmp_path)
+    indexed = []
+
+    def add_many(self, job_links):
+        job_links = list(job_links)
+        written = pd.read_csv(config.output_file)['job_link'].tolist()
+        assert set(job_links) <= set(written)
+        indexed.extend(job_links)
+        add_many.original(self, job_links)
+
+    add_many.original = JobLinkIndex.add_many
+    monkeypatch.setattr(JobLinkIndex, 'add_many', add_many)
+    DataSourcing(config).main()
+
+    assert len(indexed) == 3
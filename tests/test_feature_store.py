@@ -0,0 +1,17 @@
+import pandas as pd
+
+from pixi_hr.components.feature_store import FeatureStore
+
+
+def test_get_many_refreshes_cached_postings(tmp_path):
+    df = pd.DataFrame({'job_link': ['a', 'b', 'c'], 'qual_python': [1, 0, 1]})
+    with FeatureStore(str(tmp_path / "features.sqlite"), cache_size=2) as store:
+        store.write(df)
+        store.get('a')
+        store.get('b')
+
+        # 'a' becomes the most recently used, so loading 'c' evicts 'b'
+        store.get_many(['a'])
+        store.get('c')
+
+        assert list(store._cache) == ['a', 'c']
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from pixi_hr.utils.hashing import SPLIT_BUCKETS, hash_split_mask, stable_hash
+
+
+def job_links(start, stop):
+    return pd.Series([f"https://www.simplyhired.ca/job/{i:08d}" for i in range(start, stop)])
+
+
+def test_existing_rows_keep_their_split_when_rows_are_appended():
+    original = job_links(0, 20_000)
+    appended = pd.concat([original, job_links(20_000, 50_000)], ignore_index=True)
+
+    before = hash_split_mask(original, test_size=0.2)
+    after = hash_split_mask(appended, test_size=0.2)
+
+    assert np.array_equal(after[:len(original)], before)
+
+
+def test_split_does_not_depend_on_row_order_or_neighbours():
+    links = job_links(0, 5_000)
+    mask = hash_split_mask(links, test_size=0.2)
+
+    shuffled = links.sample(frac=1, random_state=0)
+    assert np.array_equal(hash_split_mask(shuffled, test_size=0.2), mask[shuffled.index])
+    assert np.array_equal(hash_split_mask(links[::7], test_size=0.2), mask[::7])
+
+
+def test_split_follows_the_bucket_rule():
+    links = job_links(0, 1_000)
+    buckets = stable_hash(links) % SPLIT_BUCKETS
+
+    assert np.array_equal(hash_split_mask(links, test_size=0.25), buckets < 2_500)
+
+
+def test_test_fraction_is_close_to_test_size():
+    mask = hash_split_mask(job_links(0, 50_000), test_size=0.2)
+
+    assert abs(mask.mean() - 0.2) < 0.01
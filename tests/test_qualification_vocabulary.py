@@ -0,0 +1,12 @@
+import pytest
+
+from pixi_hr.components.qualification_vocabulary import QualificationVocabulary
+
+
+@pytest.mark.parametrize("mode", ["onehot", "hashing"])
+def test_postings_without_skills_keep_their_row(mode):
+    vocabulary = QualificationVocabulary(mode=mode, n_buckets=8).fit([['a'], ['b']])
+
+    assert vocabulary.transform([['a'], ['b'], []]).shape == (3, len(vocabulary.feature_names))
+    assert vocabulary.transform([[], []]).shape == (2, len(vocabulary.feature_names))
+    assert vocabulary.transform(iter([[], ['a']])).iloc[1].sum() == 1
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from pixi_hr.config.snapshot import ConfigSnapshot
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def write_config(tmp_path, **transformation):
+    with open(PROJECT_ROOT / "config" / "config.yaml") as f:
+        config = yaml.safe_load(f)
+    # None removes the key
+    config['data_transformation'].update(transformation)
+    for key, value in transformation.items():
+        if value is None:
+            del config['data_transformation'][key]
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(config))
+    return path
+
+
+def snapshot(config_path):
+    return ConfigSnapshot(config_path, PROJECT_ROOT / "params.yaml", PROJECT_ROOT / "schema.yaml")
+
+
+def test_project_configuration_is_valid(tmp_path):
+    assert snapshot(write_config(tmp_path)).config.data_transformation.split_strategy in ('random', 'hash')
+
+
+def test_keys_read_by_the_configuration_manager_are_validated(tmp_path):
+    with pytest.raises(ValueError) as error:
+        snapshot(write_config(tmp_path, vocabulary_file=None, split_strategy='stratified', incremental='yes'))
+
+    message = str(error.value)
+    assert "config.yaml.data_transformation: missing 'vocabulary_file'" in message
+    assert "data_transformation.split_strategy: expected one of 'hash', 'random', got 'stratified'" in message
+    assert "data_transformation.incremental: expected bool, got 'yes'" in message
@@ -0,0 +1,12 @@
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_main_imports_within_the_startup_budget():
+    # Fails on the budget, on heavy libraries loaded at import, and on files written at import
+    completed = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--repeats", "3"],
+                               cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stdout + completed.stderr
@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from pixi_hr.components.transformed_store import TransformedStore
+
+
+def postings(links, version="v1"):
+    return pd.DataFrame({'job_link': links, 'content_hash': [f"{link}-{version}" for link in links],
+                         'qual_python': np.arange(len(links)) % 2})
+
+
+def test_materialize_writes_the_current_version_of_live_postings(tmp_path):
+    store = TransformedStore(str(tmp_path / "store"))
+    store.rebuild(postings(['a', 'b', 'c', 'd', 'e']), is_test=np.array([False, True, False, False, True]))
+
+    # 'c' changes, 'b' is retired and 'f' is new
+    store.append(postings(['c', 'f'], version="v2"), is_test=np.array([False, True]), retired=['b'])
+    train, test = store.materialize(str(tmp_path / "train.csv"), str(tmp_path / "test.csv"))
+
+    assert train['job_link'].tolist() == ['a', 'd', 'c']
+    assert test['job_link'].tolist() == ['e', 'f']
+    assert train.set_index('job_link').loc['c', 'content_hash'] == 'c-v2'
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "train.csv"), train.reset_index(drop=True))
+
+
+def test_materialize_writes_empty_files_when_every_posting_is_retired(tmp_path):
+    store = TransformedStore(str(tmp_path / "store"))
+    store.rebuild(postings(['a', 'b']), is_test=np.array([False, True]))
+    store.append(postings([]), is_test=np.array([], dtype=bool), retired=['a', 'b'])
+
+    train, test = store.materialize(str(tmp_path / "train.csv"), str(tmp_path / "test.csv"))
+
+    assert train.empty and test.empty
+    assert pd.read_csv(tmp_path / "train.csv").columns.tolist() == ['job_link', 'content_hash', 'qual_python']
+
+
+def test_store_does_not_exist_under_other_settings_or_a_refitted_vocabulary(tmp_path):
+    vocabulary_file = tmp_path / "vocabulary.joblib"
+    vocabulary_file.write_bytes(b"fitted")
+    settings = {'split_strategy': 'hash', 'test_size': 0.2, 'vocabulary_params': {'mode': 'onehot', 'min_df': 1}}
+    open_store = lambda **changes: TransformedStore(str(tmp_path / "store"), settings={**settings, **changes},
+                                                    vocabulary_file=str(vocabulary_file))
+    open_store().rebuild(postings(['a']), is_test=np.array([False]))
+
+    assert open_store().exists()
+    assert not open_store(test_size=0.3).exists()
+    assert not open_store(vocabulary_params={'mode': 'onehot', 'min_df': 2}).exists()
+
+    # A full run without the store refits the vocabulary
+    vocabulary_file.write_bytes(b"refitted")
+    os.utime(vocabulary_file, ns=(0, 0))
+    assert not open_store().exists()